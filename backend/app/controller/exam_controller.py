@@ -1,51 +1,384 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import ValidationError
+import hashlib
+import io
+import json
+import os
+import tempfile
+from itertools import islice
+from typing import Optional
 
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+from backend.app.model.batch_calculation_input import BatchCalculationInput
+from backend.app.model.exam_search_output import ExamSearchOutput
 from backend.app.model.final_exam_result_input import FinalExamResultInput
-from backend.app.service.exam_calculation_service import ExamCalculationService
-from backend.app.service.file_service import FileService
+from backend.app.model.final_exam_result_output import FinalExamResultOutput
+from backend.app.service import json_codec
+from backend.app.service.exam_calculation_service import ExamCalculationService, scores_from_input
+from backend.app.service.exam_solver_service import ExamSolverService
+from backend.app.service.import_export_service import (
+    CONTENT_TYPES,
+    EXPORT_CHUNK_SIZE,
+    ImportExportService,
+    ImportFormatError,
+    format_from_content_type,
+)
+from backend.app.service.metrics_service import metrics
+from backend.app.service.search_index_service import SearchIndexService
+from backend.app.service.stats_service import StatsService
+from backend.app.service.result_cache_service import ResultCacheService, public_entry, result_key, strip_metadata
+from backend.app.service.ruleset_service import CompiledRuleset, rulesets
+from backend.app.service.storage_executor import StorageExecutor
+from backend.app.service.storage_factory import LazyStorage
+from backend.app.service.vectorized_calculation_service import VectorizedExamCalculationService, scores_from_entry
 
 router = APIRouter()
-file_service = FileService("backend/data/storage.json")
+file_service = LazyStorage()
+storage_executor = StorageExecutor(
+    read_workers=int(os.getenv("BACKEND_STORAGE_READ_WORKERS", 4)),
+    max_pending_writes=int(os.getenv("BACKEND_STORAGE_MAX_PENDING_WRITES", 64)),
+)
 exam_calculation_service = ExamCalculationService()
+vectorized_calculation_service = VectorizedExamCalculationService()
+result_cache = ResultCacheService()
+import_export_service = ImportExportService(vectorized_calculation_service)
+stats_service = StatsService(vectorized_calculation_service)
+search_index = SearchIndexService(vectorized_calculation_service)
+exam_solver_service = ExamSolverService(vectorized_calculation_service)
+# speichert das berechnete Ergebnis zusätzlich am Eintrag, damit Listen ohne Neuberechnung Noten anzeigen können
+store_results = os.getenv("BACKEND_STORE_RESULTS") == "1"
+
+def _cache_metrics():
+    samples = [("result_cache", result_cache.stats())]
+    if hasattr(file_service, "cache_stats"):
+        samples.append(("storage", file_service.cache_stats()))
+    yield ("cache_hits_total", "counter", "Cache hits", [({"cache": name}, s["hits"]) for name, s in samples])
+    yield ("cache_misses_total", "counter", "Cache misses", [({"cache": name}, s["misses"]) for name, s in samples])
+    yield ("cache_entries", "gauge", "Cached entries", [({"cache": name}, s["entries"]) for name, s in samples])
+
+metrics.register_collector(_cache_metrics)
+
+RULESET_QUERY = Query(None, description="Grading ruleset id, defaults to the configured ruleset")
+
+# übersetztes Regelwerk, ohne Angabe das konfigurierte; übersetzt wird nur beim ersten Zugriff
+def _ruleset(ruleset_id: Optional[str] = None) -> CompiledRuleset:
+    try:
+        return rulesets.get(ruleset_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Rechendienste (einzeln, vektorisiert) für ein Regelwerk; das konfigurierte nutzt die Dienste oben
+def _calculation_services(ruleset: CompiledRuleset) -> tuple:
+    if ruleset is rulesets.get():
+        return exam_calculation_service, vectorized_calculation_service
+    return ExamCalculationService(ruleset), VectorizedExamCalculationService(ruleset)
+
+# Ergebnis auf einfachen Punktwerten, direkt in der JSON-Struktur von FinalExamResultOutput
+def _calculate_scores(scores: tuple, calculation_service: Optional[ExamCalculationService] = None) -> dict:
+    calculation_service = calculation_service or exam_calculation_service
+    return FinalExamResultOutput.dump_result_dict(calculation_service.calculateResultDict(scores))
+
+# validated und result_key bleiben in der Ablage, result wird nur mit BACKEND_STORE_RESULTS=1 ausgeliefert
+def _public(entry: dict) -> dict:
+    return public_entry(entry, with_result=store_results)
+
+# über die API gespeicherte Einträge sind validiert und werden beim Berechnen nicht erneut geprüft
+def _stored_entry(finalexamresultinput: FinalExamResultInput) -> dict:
+    entry = finalexamresultinput.model_dump()
+    entry["validated"] = True
+    if store_results:
+        entry["result_key"] = result_key(entry, rulesets.get().key)
+        entry["result"] = _calculate_scores(scores_from_input(finalexamresultinput))
+    return entry
+
+def _model_default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+# kodiert Modelle und JSON-Werte mit json_codec direkt zu Bytes, ohne den Umweg über jsonable_encoder
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return json_codec.dumps(content, default=_model_default)
+
+# große Antworten werden im Thread-Pool serialisiert, damit der Event-Loop frei bleibt.
+# plain: der Inhalt besteht bereits nur aus JSON-Werten (gespeicherte Einträge, vorberechnete Strukturen)
+def _render(content, headers: Optional[dict] = None, plain: bool = False) -> JSONResponse:
+    if json_codec.fast:
+        return FastJSONResponse(content, headers=headers)
+    return JSONResponse(content if plain else jsonable_encoder(content), headers=headers)
+
+# starke ETags: gleicher Tag heißt byte-gleiche Antwort. no-cache lässt den Browser vor jeder
+# Verwendung mit If-None-Match nachfragen, unveränderte Daten kommen dann als 304 ohne Inhalt
+def _etag(*parts) -> str:
+    return '"%s"' % hashlib.blake2b("\x1f".join(map(str, parts)).encode("utf-8"), digest_size=16).hexdigest()
+
+def _cache_headers(etag: Optional[str]) -> dict:
+    return {"ETag": etag, "Cache-Control": "no-cache"} if etag else {}
+
+def _not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    header = request.headers.get("if-none-match")
+    if etag is None or header is None:
+        return None
+    # If-None-Match vergleicht schwach, W/ wird also ignoriert
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in tags or etag in tags:
+        return Response(status_code=304, headers=_cache_headers(etag))
+    return None
+
+# Schreibzugriffe laufen im Schreib-Thread und schreiben dort auch Statistik und Suchindex fort;
+# last_write_versions zeigt beiden, ob andere Worker-Prozesse dazwischen geschrieben haben
+def _upsert_derived(entries: list):
+    versions = file_service.last_write_versions
+    stats_service.upsert(entries, versions)
+    search_index.upsert(entries, versions)
+
+def _save_entry(entry: dict) -> dict:
+    saved = file_service.save(entry)
+    _upsert_derived([saved])
+    return saved
+
+def _save_entries(entries: list) -> list:
+    saved = file_service.save_many(entries)
+    _upsert_derived(saved)
+    return saved
+
+def _update_entry(entry_id: str, entry: dict) -> Optional[dict]:
+    updated = file_service.update_by_id(entry_id, entry)
+    if updated:
+        _upsert_derived([updated])
+    return updated
+
+def _delete_entry(entry_id: str) -> bool:
+    deleted = file_service.delete_by_id(entry_id)
+    # ohne Löschung hat die Ablage nichts geschrieben, last_write_versions stammt dann von früher
+    if deleted:
+        stats_service.remove(entry_id, file_service.last_write_versions)
+        search_index.remove(entry_id, file_service.last_write_versions)
+    return deleted
 
 @router.post("/save")
-def save_numbers(finalexamresultinput: FinalExamResultInput):
-    entry = file_service.save(entry=finalexamresultinput.model_dump())
-    return {"message": "Numbers saved successfully!", "data": entry}
+async def save_numbers(finalexamresultinput: FinalExamResultInput):
+    entry = await storage_executor.write(_save_entry, _stored_entry(finalexamresultinput))
+    return _render({"message": "Numbers saved successfully!", "data": _public(entry)}, plain=True)
+
+def _project(entry: dict, fields: Optional[list]) -> dict:
+    entry = _public(entry)
+    if fields is None:
+        return entry
+    return {key: entry[key] for key in ("id", *fields) if key in entry}
+
+NDJSON_CHUNK_SIZE = 500
+
+def _ndjson_chunk(entries, field_list) -> bytes:
+    return b"".join(json_codec.dumps(_project(entry, field_list)) + b"\n"
+                    for _, entry in islice(entries, NDJSON_CHUNK_SIZE))
+
+async def _ndjson(entries, field_list):
+    # der Generator der Ablage wird blockweise im Thread-Pool weitergeschaltet
+    while True:
+        chunk = await storage_executor.run(_ndjson_chunk, entries, field_list)
+        if not chunk:
+            return
+        yield chunk
 
 @router.get("/list")
-def get_all_results():
-    return file_service.load_all()
+async def get_all_results(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of entries per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    name_prefix: Optional[str] = Query(None, description="Only entries whose name starts with this prefix"),
+    fields: Optional[str] = Query(None, description="Comma separated list of fields to return besides id"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json array or streamed NDJSON"),
+):
+    try:
+        file_service.parse_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Stand vor dem Lesen: ändert sich die Ablage währenddessen, passt der Tag nie wieder
+    version = await storage_executor.run(file_service.version)
+    etag = _etag("list", version, request.url.query) if version is not None else None
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    headers = _cache_headers(etag)
+
+    if limit is None and cursor is None and name_prefix is None and fields is None and format == "json":
+        return await storage_executor.run(lambda: _render([_public(entry) for entry in file_service.load_all()], headers=headers, plain=True))
+
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    entries = file_service.iter_entries(name_prefix=name_prefix, cursor=cursor)
+
+    if limit is not None:
+        page = await storage_executor.run(lambda: list(islice(entries, limit + 1)))
+        if len(page) > limit:
+            page = page[:limit]
+            headers["X-Next-Cursor"] = page[-1][0]
+        entries = iter(page)
+
+    if format == "ndjson":
+        # ohne limit wird nichts gepuffert, sondern direkt gestreamt
+        return StreamingResponse(_ndjson(entries, field_list), media_type="application/x-ndjson", headers=headers)
+    return await storage_executor.run(
+        lambda: _render([_project(entry, field_list) for _, entry in entries], headers=headers, plain=True))
+
+# Uploads bis zu dieser Größe bleiben im Speicher, größere werden in eine temporäre Datei ausgelagert
+IMPORT_SPOOL_SIZE = 8 * 1024 * 1024
+
+def _import_entries(inputs) -> list:
+    entries = [{**finalexamresultinput.model_dump(), "validated": True} for finalexamresultinput in inputs]
+    if store_results and inputs:
+        for entry, result in zip(entries, vectorized_calculation_service.calculateBatchResults(inputs)):
+            entry["result_key"] = result_key(entry, rulesets.get().key)
+            entry["result"] = result.model_dump()
+    return entries
+
+@router.post("/import")
+async def import_results(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson|xlsx)$",
+                                  description="File format, detected from the Content-Type if omitted"),
+    atomic: bool = Query(False, description="Import nothing if any row is invalid"),
+):
+    fmt = format or format_from_content_type(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail=f"Unsupported Content-Type, use one of {list(CONTENT_TYPES.values())}")
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+        try:
+            output, inputs = await storage_executor.run(import_export_service.read_file, fmt, upload)
+        except ImportFormatError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ImportError:
+            raise HTTPException(status_code=501, detail="XLSX import requires the openpyxl package")
+
+    if inputs and not (atomic and output.failed):
+        entries = await storage_executor.run(_import_entries, inputs)
+        # alle gültigen Zeilen werden in einem einzigen Schreibvorgang gespeichert
+        await storage_executor.write(_save_entries, entries)
+        output.imported = len(entries)
+    return _render({"message": "Entries imported", "data": output})
+
+# CSV als Text, NDJSON als bereits kodierte Bytes
+def _export_chunk(entries, fmt: str, first: bool):
+    batch = [entry for _, entry in islice(entries, EXPORT_CHUNK_SIZE)]
+    if fmt == "csv":
+        return import_export_service.csv_chunk(batch, header=first) if batch or first else ""
+    return import_export_service.ndjson_chunk(batch)
+
+async def _export(entries, fmt: str):
+    first = True
+    while True:
+        chunk = await storage_executor.run(_export_chunk, entries, fmt, first)
+        if not chunk:
+            return
+        first = False
+        yield chunk
+
+def _export_xlsx(entries) -> bytes:
+    def chunks():
+        while True:
+            batch = [entry for _, entry in islice(entries, EXPORT_CHUNK_SIZE)]
+            if not batch:
+                return
+            yield batch
+
+    buffer = io.BytesIO()
+    import_export_service.xlsx_workbook(chunks(), buffer)
+    return buffer.getvalue()
+
+@router.get("/export")
+async def export_results(
+    format: str = Query("csv", pattern="^(csv|ndjson|xlsx)$", description="Export file format"),
+    name_prefix: Optional[str] = Query(None, description="Only entries whose name starts with this prefix"),
+):
+    entries = file_service.iter_entries(name_prefix=name_prefix)
+    headers = {"Content-Disposition": f'attachment; filename="results.{format}"'}
+    if format == "xlsx":
+        try:
+            content = await storage_executor.run(_export_xlsx, entries)
+        except ImportError:
+            raise HTTPException(status_code=501, detail="XLSX export requires the openpyxl package")
+        return Response(content, media_type=CONTENT_TYPES["xlsx"], headers=headers)
+    # CSV und NDJSON werden blockweise gestreamt, inklusive berechneter Ergebnisse
+    return StreamingResponse(_export(entries, format), media_type=CONTENT_TYPES[format], headers=headers)
+
+def _all_entries():
+    return (entry for _, entry in file_service.iter_entries())
+
+@router.get("/stats")
+async def get_statistics():
+    # der erste Aufruf rechnet einmal über die Ablage, danach werden nur noch die laufenden Aggregate gelesen
+    statistics = await storage_executor.run(
+        lambda: stats_service.statistics(_all_entries, file_service.version(), file_service.score_matrix))
+    return _render({"message": "Statistics calculated successfully", "data": statistics})
+
+def _search(filters: dict) -> ExamSearchOutput:
+    # der erste Aufruf baut die Indizes einmal über die Ablage auf, danach werden sie nur fortgeschrieben
+    total, ids = search_index.search(_all_entries, file_service.version(), **filters)
+    found = file_service.get_by_ids(ids)
+    return ExamSearchOutput(total=total, offset=filters["offset"],
+                            entries=[_public(found[entry_id]) for entry_id in ids if entry_id in found])
+
+@router.get("/search")
+async def search_results(
+    q: Optional[str] = Query(None, min_length=1, description="Case-insensitive part of the name"),
+    name_prefix: Optional[str] = Query(None, description="Case-insensitive start of the name"),
+    passed: Optional[bool] = Query(None, description="Only passed (true) or failed (false) entries"),
+    grade: Optional[int] = Query(None, ge=1, le=6, description="Overall grade"),
+    reason: Optional[str] = Query(None, description="Failure reason, e.g. COMPONENT_BELOW_30_POINTS"),
+    offset: int = Query(0, ge=0, description="Number of matching entries to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of entries to return"),
+):
+    filters = {"query": q, "name_prefix": name_prefix, "passed": passed, "grade": grade, "reason": reason,
+               "offset": offset, "limit": limit}
+    try:
+        result = await storage_executor.run(_search, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _render({"message": "Entries found", "data": result})
+
+@router.get("/rulesets")
+async def get_rulesets():
+    definitions = rulesets.definitions()
+    return _render({"message": "Rulesets loaded successfully", "default": rulesets.default_id,
+                    "data": [definitions[ruleset_id] for ruleset_id in rulesets.ids()]})
+
+def _entry_etag(entry: dict) -> str:
+    return _etag("entry", json.dumps(entry, sort_keys=True, ensure_ascii=False, separators=(",", ":")))
 
 @router.get("/{entry_id}")
-def get_result(entry_id: str):
-    entry = file_service.get_by_id(entry_id)
+async def get_result(entry_id: str, request: Request):
+    entry = await storage_executor.run(file_service.get_by_id, entry_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
-    return entry
+    # Tag aus dem Inhalt: Änderungen an anderen Einträgen lassen ihn gültig
+    etag = _entry_etag(entry)
+    return _not_modified(request, etag) or _render(_public(entry), headers=_cache_headers(etag), plain=True)
 
 @router.delete("/{entry_id}")
-def delete_result(entry_id: str):
-    success = file_service.delete_by_id(entry_id)
+async def delete_result(entry_id: str):
+    success = await storage_executor.write(_delete_entry, entry_id)
+    result_cache.invalidate(entry_id)
     if not success:
         raise HTTPException(status_code=404, detail="Entry not found")
-    return {"message": "Entry deleted successfully"}
+    return _render({"message": "Entry deleted successfully"}, plain=True)
 
 @router.put("/{entry_id}")
-def update_result(entry_id: str, finalexamresultinput: FinalExamResultInput):
-    updated = file_service.update_by_id(entry_id, finalexamresultinput.model_dump())
+async def update_result(entry_id: str, finalexamresultinput: FinalExamResultInput):
+    updated = await storage_executor.write(_update_entry, entry_id, _stored_entry(finalexamresultinput))
+    result_cache.invalidate(entry_id)
     if not updated:
         raise HTTPException(status_code=404, detail="Entry not found")
-    return {"message": "Entry updated successfully", "data": updated}
-
-@router.get("/calculate/{entry_id}")
-def calculate_result(entry_id: str):
-    raw = file_service.get_by_id(entry_id)
-
-    if raw is None:
-        raise HTTPException(status_code=404, detail="Entry not found")
+    return _render({"message": "Entry updated successfully", "data": _public(updated)}, plain=True)
 
+def _to_input(raw) -> FinalExamResultInput:
     if hasattr(raw, "model_dump"):
         data = raw.model_dump()
     elif hasattr(raw, "dict"):
@@ -53,12 +386,134 @@ def calculate_result(entry_id: str):
     else:
         data = dict(raw)
 
-    data.pop("id", None)
+    return FinalExamResultInput.model_validate(strip_metadata(data))
 
-    try:
-        finalexamresultinput = FinalExamResultInput.model_validate(data)
-    except ValidationError as e:
-        raise HTTPException(status_code=400, detail=e.errors())
+# gleiche Struktur wie BatchCalculationOutput(...).model_dump(), aber direkt aus den Ergebnis-Dicts
+# der Berechnung aufgebaut: Ausgabemodelle je Eintrag würden mehr kosten als Berechnung und Kodierung
+def _calculate_batch(items, calculation_service: VectorizedExamCalculationService) -> dict:
+    results = []
+    valid = []
+    for entry_id, raw in items:
+        if raw is None:
+            results.append({"id": entry_id, "result": None, "error": "Entry not found"})
+            continue
+        try:
+            finalexamresultinput = raw if isinstance(raw, FinalExamResultInput) else _to_input(raw)
+        except ValidationError as e:
+            results.append({"id": entry_id, "result": None, "error": str(e)})
+            continue
+        item = {"id": entry_id, "result": None, "error": None}
+        results.append(item)
+        valid.append((item, finalexamresultinput))
+
+    passed = failed = 0
+    for (item, _), result in zip(valid, calculation_service.calculateOutputDicts([inp for _, inp in valid])):
+        item["result"] = result
+        if result["Status"]["passed"]:
+            passed += 1
+        else:
+            failed += 1
+    return {"results": results, "total": len(items), "passed": passed, "failed": failed,
+            "errors": len(items) - passed - failed}
 
-    response = exam_calculation_service.calculateExamResults(finalexamresultinput)
-    return {"message": "Entry calculated successfully", "data": response}
+def _render_batch(items, calculation_service: VectorizedExamCalculationService) -> JSONResponse:
+    return _render({"message": "Entries calculated successfully", "data": _calculate_batch(items, calculation_service)},
+                   plain=True)
+
+# Backends mit Score-Matrix (binary) werden ohne ein Dict pro Eintrag berechnet, solange alle Punkte
+# im gültigen Bereich liegen; sonst wie bisher über load_all, damit ungültige Einträge ihren Fehler bekommen
+def _render_all(calculation_service: VectorizedExamCalculationService) -> JSONResponse:
+    matrix = file_service.score_matrix()
+    if matrix is not None and not (matrix[1] > 100).any():
+        entry_ids, scores = matrix
+        results = calculation_service.calculateMatrixOutputDicts(scores)
+        passed = sum(1 for result in results if result["Status"]["passed"])
+        data = {"results": [{"id": entry_id, "result": result, "error": None}
+                            for entry_id, result in zip(entry_ids, results)],
+                "total": len(results), "passed": passed, "failed": len(results) - passed, "errors": 0}
+        return _render({"message": "Entries calculated successfully", "data": data}, plain=True)
+    return _render_batch([(entry.get("id"), entry) for entry in file_service.load_all()], calculation_service)
+
+@router.get("/calculate/all")
+async def calculate_all_results(ruleset: Optional[str] = RULESET_QUERY):
+    _, calculation_service = _calculation_services(_ruleset(ruleset))
+    return await storage_executor.run(_render_all, calculation_service)
+
+@router.post("/calculate/batch")
+async def calculate_batch_results(batch: BatchCalculationInput, ruleset: Optional[str] = RULESET_QUERY):
+    _, calculation_service = _calculation_services(_ruleset(ruleset))
+    items = []
+    if batch.ids:
+        found = await storage_executor.run(file_service.get_by_ids, batch.ids)
+        items.extend((entry_id, found.get(entry_id)) for entry_id in batch.ids)
+    if batch.entries:
+        items.extend((None, entry) for entry in batch.entries)
+    return await storage_executor.run(_render_batch, items, calculation_service)
+
+def _calculated(response, etag: str) -> JSONResponse:
+    # Ergebnis-Dicts enthalten nur JSON-Werte, jsonable_encoder würde sonst mehr kosten als die Berechnung
+    return _render({"message": "Entry calculated successfully", "data": response}, headers=_cache_headers(etag),
+                   plain=isinstance(response, dict))
+
+@router.get("/calculate/{entry_id}")
+async def calculate_result(entry_id: str, request: Request, ruleset: Optional[str] = RULESET_QUERY):
+    compiled = _ruleset(ruleset)
+    calculation_service, _ = _calculation_services(compiled)
+    raw = await storage_executor.run(file_service.get_by_id, entry_id)
+
+    if raw is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+    # das Ergebnis hängt nur vom Regelwerk und den Punktwerten ab, die result_key abdeckt
+    key = result_key(raw, compiled.key)
+    etag = _etag("calculate", key)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    if raw.get("result") is not None and raw.get("result_key") == key:
+        return _calculated(raw["result"], etag)
+
+    response = result_cache.get(entry_id, key)
+    if response is None and raw.get("validated"):
+        # beim Speichern bereits validiert: ohne FinalExamResultInput und Ausgabemodelle rechnen,
+        # liegen die Werte trotzdem außerhalb des gültigen Bereichs, wird unten regulär geprüft
+        scores = scores_from_entry(raw)
+        if scores is not None:
+            response = _calculate_scores(scores, calculation_service)
+            result_cache.put(entry_id, key, response)
+    if response is None:
+        try:
+            finalexamresultinput = _to_input(raw)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=e.errors())
+
+        response = calculation_service.calculateExamResults(finalexamresultinput)
+        result_cache.put(entry_id, key, response)
+    return _calculated(response, etag)
+
+ASSUMED_QUERY = Query(100, ge=0, le=100, description="Points assumed for the other outstanding components")
+
+def _solved(scores: tuple, assumed: int, ruleset: Optional[str]) -> JSONResponse:
+    compiled = _ruleset(ruleset)
+    solver = exam_solver_service if compiled is rulesets.get() else ExamSolverService(_calculation_services(compiled)[1])
+    return _render({"message": "Required scores calculated successfully", "data": solver.solve(scores, assumed)})
+
+# Mindestpunkte der noch fehlenden Prüfungsteile, um zu bestehen bzw. eine Gesamtnote zu erreichen
+@router.post("/solve")
+async def solve_required_scores(finalexamresultinput: FinalExamResultInput, assumed: int = ASSUMED_QUERY,
+                                ruleset: Optional[str] = RULESET_QUERY):
+    return _solved(scores_from_input(finalexamresultinput), assumed, ruleset)
+
+@router.get("/solve/{entry_id}")
+async def solve_required_scores_for_entry(entry_id: str, assumed: int = ASSUMED_QUERY,
+                                          ruleset: Optional[str] = RULESET_QUERY):
+    raw = await storage_executor.run(file_service.get_by_id, entry_id)
+    if raw is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    scores = scores_from_entry(raw) if raw.get("validated") else None
+    if scores is None:
+        try:
+            scores = scores_from_input(_to_input(raw))
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=e.errors())
+    return _solved(scores, assumed, ruleset)
@@ -1,14 +1,22 @@
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import PlainTextResponse
 import threading
 import os
+import signal
 import time
 
+from backend.app.service.metrics_service import metrics
+
 router = APIRouter()
 
 @router.get("/health")
 def health():
     return {"status": "ok"}
 
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @router.post("/shutdown")
 def shutdown(request: Request):
     # optional: Sicherheitsprüfung (nur lokal erlaubt)
@@ -18,7 +26,11 @@ def shutdown(request: Request):
 
     def stopper():
         time.sleep(0.3)  # kurze Verzögerung, damit Response gesendet wird
-        os._exit(0)      # hartes, aber sauberes Beenden des Prozesses
+        if int(os.getenv("BACKEND_WORKERS", 1)) > 1:
+            # der Supervisor beendet alle Worker; ein einzelner beendeter Worker würde neu gestartet
+            os.kill(os.getppid(), signal.SIGTERM)
+        else:
+            os._exit(0)  # hartes, aber sauberes Beenden des Prozesses
 
     threading.Thread(target=stopper, daemon=True).start()
     return {"message": "Backend shutting down"}
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+
+# Lädt schwere Router (Controller, numpy, Ablage) erst nach dem Start in einem
+# Hintergrund-Thread. Anfragen an ready_paths (z.B. /health) werden sofort
+# beantwortet, alle anderen warten, bis das Laden abgeschlossen ist.
+class DeferredRoutesMiddleware:
+    def __init__(self, app, loader, ready_paths=("/health",)):
+        self.app = app
+        self.loader = loader
+        self.ready_paths = tuple(ready_paths)
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._error = None
+        self._thread = None
+
+    def _load(self):
+        try:
+            self.loader()
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._loaded.set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name="deferred-routes", daemon=True)
+                self._thread.start()
+
+    async def wait(self):
+        self.start()
+        if not self._loaded.is_set():
+            await asyncio.get_running_loop().run_in_executor(None, self._loaded.wait)
+        if self._error is not None:
+            raise self._error
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            self.start()
+        elif scope["type"] in ("http", "websocket") and scope["path"] not in self.ready_paths:
+            await self.wait()
+        await self.app(scope, receive, send)
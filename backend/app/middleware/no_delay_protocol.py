@@ -0,0 +1,13 @@
+import socket
+
+from uvicorn.protocols.http.h11_impl import H11Protocol
+
+
+# Mit mehreren Workern erzeugt uvicorn den Socket selbst (ohne IPPROTO_TCP), asyncio setzt
+# dann kein TCP_NODELAY: Nagle und verzögerte ACKs halten jede Antwort ~40 ms zurück
+class NoDelayH11Protocol(H11Protocol):
+    def connection_made(self, transport):
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().connection_made(transport)
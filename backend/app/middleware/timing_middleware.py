@@ -0,0 +1,51 @@
+import time
+
+from starlette.routing import replace_params
+
+from backend.app.service.metrics_service import HTTP_REQUEST_DURATION
+
+
+# Routen-Template statt konkretem Pfad, sonst entsteht pro id eine eigene Zeitreihe. route.path
+# enthält das Präfix eingebundener Router (include_router(prefix=...)) je nach FastAPI-Version
+# nicht; es ist der Teil des Pfads vor dem Abschnitt, den die Route selbst abdeckt
+def route_template(scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    path = getattr(route, "path", None)
+    if path is None:
+        return "unmatched"
+    concrete, _ = replace_params(route.path_format, route.param_convertors, dict(scope.get("path_params", {})))
+    if scope["path"].endswith(concrete):
+        return scope["path"][:len(scope["path"]) - len(concrete)] + path
+    return path
+
+
+# reine ASGI-Middleware, damit gestreamte Antworten nicht gepuffert werden;
+# gemessen wird bis zum letzten gesendeten Teil der Antwort
+class TimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route_template(scope),
+                status=status["code"],
+            )
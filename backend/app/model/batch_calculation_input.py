@@ -0,0 +1,12 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+
+
+class BatchCalculationInput(BaseModel):
+    ids: Optional[List[str]] = Field(None, description="Ids of stored entries to calculate")
+    entries: Optional[List[FinalExamResultInput]] = Field(None, description="Inline entries to calculate")
+
+    model_config = ConfigDict(extra="forbid")
@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+from backend.app.model.final_exam_result_output import FinalExamResultOutput
+
+
+class BatchCalculationItem(BaseModel):
+    id: Optional[str] = Field(None, description="Id of the stored entry, None for inline entries")
+    result: Optional[FinalExamResultOutput] = Field(None, description="Calculated result")
+    error: Optional[str] = Field(None, description="Error message if the entry could not be calculated")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BatchCalculationOutput(BaseModel):
+    results: List[BatchCalculationItem] = Field(default_factory=list, description="Per-entry results in request order")
+    total: int = Field(0, description="Number of requested entries")
+    passed: int = Field(0, description="Number of entries that passed the exam")
+    failed: int = Field(0, description="Number of entries that failed the exam")
+    errors: int = Field(0, description="Number of entries that could not be calculated")
+
+    model_config = ConfigDict(extra="forbid")
@@ -0,0 +1,11 @@
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class ExamSearchOutput(BaseModel):
+    total: int = Field(0, description="Number of matching entries")
+    offset: int = Field(0, description="Number of matching entries skipped")
+    entries: List[Dict[str, Any]] = Field(default_factory=list, description="Matching entries, at most limit")
+
+    model_config = ConfigDict(extra="forbid")
@@ -0,0 +1,23 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class RequiredScores(BaseModel):
+    passed: Optional[int] = Field(None, description="Minimum points to pass the exam, None if not reachable")
+    grades: Dict[str, Optional[int]] = Field(
+        default_factory=dict,
+        description="Minimum points to pass with this overall grade or better (1–4), None if not reachable")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ExamSolverOutput(BaseModel):
+    outstanding: List[str] = Field(default_factory=list, description="Components without points yet")
+    assumed: int = Field(..., description="Points assumed for the other outstanding components")
+    components: Dict[str, RequiredScores] = Field(
+        default_factory=dict, description="Minimum points per outstanding component, the others at 'assumed'")
+    uniform: Optional[RequiredScores] = Field(
+        None, description="Minimum points if every outstanding component gets the same points")
+
+    model_config = ConfigDict(extra="forbid")
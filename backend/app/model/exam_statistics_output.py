@@ -0,0 +1,23 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class ComponentStatistics(BaseModel):
+    count: int = Field(0, description="Number of entries with points for this component")
+    average_points: Optional[float] = Field(None, description="Average points, None if no entry has points")
+    grades: Dict[str, int] = Field(default_factory=dict, description="Number of entries per grade 1–6")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ExamStatisticsOutput(BaseModel):
+    total: int = Field(0, description="Number of stored entries")
+    invalid: int = Field(0, description="Number of stored entries that could not be calculated")
+    passed: int = Field(0, description="Number of entries that passed the exam")
+    failed: int = Field(0, description="Number of entries that failed the exam")
+    pass_rate: Optional[float] = Field(None, description="passed / (passed + failed)")
+    failure_reasons: Dict[str, int] = Field(default_factory=dict, description="Number of entries per failure reason")
+    components: Dict[str, ComponentStatistics] = Field(default_factory=dict, description="Statistics per component")
+
+    model_config = ConfigDict(extra="forbid")
@@ -75,3 +75,33 @@ class FinalExamResultOutput(BaseModel):
             Overall=to_component("Overall"),
             Status=status
         )
+
+    # gleiche Struktur wie from_result_dict(result_dict).model_dump(), ohne die Modelle zu bauen;
+    # nur für Ergebnis-Dicts der Berechnung, deren Werte bereits im gültigen Bereich liegen
+    @staticmethod
+    def dump_result_dict(result_dict: dict) -> dict:
+        def to_component(key: str):
+            v = result_dict.get(key)
+            if v is None:
+                return None
+            return {"points": v.get("points"), "grade": v.get("grade")}
+
+        return {
+            "AP1": to_component("ap1"),
+            "AP2": {
+                "planning": to_component("ap2_planning"),
+                "development": to_component("ap2_development"),
+                "economy": to_component("ap2_economy"),
+                "pw": {
+                    "project": to_component("ap2_pw_project"),
+                    "presentation": to_component("ap2_pw_presentation"),
+                    "overall": to_component("ap2_pw_overall"),
+                },
+                "overall": to_component("ap2_overall"),
+            },
+            "Overall": to_component("Overall"),
+            "Status": {
+                "passed": result_dict.get("Passed", False),
+                "reasons": list(result_dict.get("FailureReasons", [])),
+            },
+        }
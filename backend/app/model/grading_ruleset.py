@@ -0,0 +1,48 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+# Komponenten, auf die sich Gewichte und Bestehensregeln beziehen können
+RULESET_COMPONENTS = (
+    "ap1",
+    "ap2_planning",
+    "ap2_development",
+    "ap2_economy",
+    "ap2_pw_project",
+    "ap2_pw_presentation",
+    "ap2_pw_overall",
+    "ap2_overall",
+    "Overall",
+)
+
+
+class Blend(BaseModel):
+    first: float = Field(..., description="Weight of the first score (main exam / project)")
+    second: float = Field(..., description="Weight of the second score (additional exam / presentation)")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class FailureRule(BaseModel):
+    reason: str = Field(..., description="Failure reason reported when the rule is violated")
+    components: List[str] = Field(..., min_length=1, description="Components the rule looks at")
+    below: int = Field(..., ge=0, le=101, description="Points below which a component counts")
+    max_count: int = Field(0, ge=0, description="Number of counted components that is still allowed")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class GradingRuleset(BaseModel):
+    id: str = Field(..., pattern="^[a-z0-9][a-z0-9_.-]*$", description="Unique id, e.g. ao2020")
+    version: int = Field(..., ge=1, description="Increased with every change of the rules")
+    title: str = Field("", description="Training regulation the rules belong to")
+    valid_from: Optional[str] = Field(None, description="First exam date the rules apply to (ISO date)")
+    weights: Dict[str, float] = Field(..., description="Weight per component in the overall result")
+    ap2_weights: Dict[str, float] = Field(..., description="Weight per AP2 component in the AP2 result")
+    ap2_part_blend: Blend = Field(..., description="Main and additional exam of an AP2 part")
+    pw_blend: Blend = Field(..., description="Project and presentation of the project work")
+    grade_thresholds: List[int] = Field(..., min_length=5, max_length=5,
+                                        description="Lowest points for grade 1, 2, 3, 4 and 5, descending")
+    failure_rules: List[FailureRule] = Field(..., description="The exam is failed if any rule is violated")
+
+    model_config = ConfigDict(extra="forbid")
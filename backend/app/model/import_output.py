@@ -0,0 +1,19 @@
+from typing import List
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class ImportRowError(BaseModel):
+    row: int = Field(..., description="Row number in the uploaded file (header is row 1 for CSV/XLSX)")
+    error: str = Field(..., description="Validation error of this row")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ImportOutput(BaseModel):
+    total: int = Field(0, description="Number of data rows in the file")
+    imported: int = Field(0, description="Number of stored entries")
+    failed: int = Field(0, description="Number of rows that could not be imported")
+    errors: List[ImportRowError] = Field(default_factory=list, description="Per-row errors, at most 1000")
+
+    model_config = ConfigDict(extra="forbid")
@@ -0,0 +1,27 @@
+from typing import List
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class WorkerThroughput(BaseModel):
+    pid: int = Field(..., description="Process id of the worker")
+    chunks: int = Field(0, description="Number of chunks calculated by this worker")
+    entries: int = Field(0, description="Number of entries calculated by this worker")
+    busy_seconds: float = Field(0.0, description="Time spent calculating")
+    entries_per_second: float = Field(0.0, description="entries / busy_seconds")
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class RecomputeReport(BaseModel):
+    total: int = Field(0, description="Number of stored entries when the job started")
+    processed: int = Field(0, description="Number of entries calculated so far")
+    updated: int = Field(0, description="Entries whose stored result was replaced")
+    unchanged: int = Field(0, description="Entries whose stored result was already up to date")
+    invalid: int = Field(0, description="Entries that could not be calculated, kept without stored result")
+    conflicts: int = Field(0, description="Entries changed by someone else during the job, left untouched")
+    seconds: float = Field(0.0, description="Elapsed time")
+    entries_per_second: float = Field(0.0, description="processed / seconds")
+    workers: List[WorkerThroughput] = Field(default_factory=list, description="Throughput per worker process")
+
+    model_config = ConfigDict(extra="forbid")
@@ -0,0 +1,166 @@
+import struct
+import uuid
+from typing import Optional, Tuple
+
+import numpy as np
+
+from backend.app.service.vectorized_calculation_service import AP2_SCORE_FIELDS, MISSING
+
+# Dateikopf: Magic, Formatversion, Datensatzgröße, Generation der Namenstabelle
+MAGIC = b"EXB1"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+
+# Datensatz fester Breite: id (UUID-Bytes), Flags, 9 Score-Bytes in der
+# Reihenfolge von SCORE_COLUMNS, Offset und Länge des Namens in der Namenstabelle
+RECORD = struct.Struct("<16sB9sII")
+RECORD_DTYPE = np.dtype([
+    ("id", "V16"),
+    ("flags", "u1"),
+    ("scores", "u1", (9,)),
+    ("name_offset", "<u4"),
+    ("name_length", "<u4"),
+])
+
+MISSING_SCORE = 0xFF
+NO_NAME = 0xFFFFFFFF
+
+FLAG_DELETED = 0x01
+FLAG_AP2 = 0x02
+# Teil von ap2 vorhanden (auch wenn alle seine Punkte fehlen)
+FLAG_PLANNING = 0x04
+FLAG_DEVELOPMENT = 0x08
+FLAG_ECONOMY = 0x10
+FLAG_PW = 0x20
+# über die API gespeichert und damit bereits validiert (Schlüssel "validated")
+FLAG_VALIDATED = 0x40
+PART_FLAGS = {"planning": FLAG_PLANNING, "development": FLAG_DEVELOPMENT, "economy": FLAG_ECONOMY, "pw": FLAG_PW}
+PART_FIELDS = {"planning": ("main", "extra"), "development": ("main", "extra"), "economy": ("main", "extra"),
+               "pw": ("project", "presentation")}
+
+# Felder, die das Format abbildet; berechnete Ergebnisse werden nicht gespeichert
+ENTRY_KEYS = ("name", "ap1", "ap2", "id", "validated")
+DERIVED_KEYS = ("result", "result_key")
+# Felder jedes Eintrags in der Form von model_dump() plus id
+EXACT_KEYS = ("name", "ap1", "ap2", "id")
+
+
+def _score_byte(value) -> int:
+    if value is None:
+        return MISSING_SCORE
+    if type(value) is not int or not 0 <= value < MISSING_SCORE:
+        raise ValueError(f"Score {value!r} cannot be stored in the binary format")
+    return value
+
+
+def encode_scores(entry: dict) -> Tuple[int, bytes]:
+    unknown = [key for key in entry if key not in ENTRY_KEYS + DERIVED_KEYS]
+    if unknown:
+        raise ValueError(f"Field(s) {unknown} cannot be stored in the binary format")
+    ap2 = entry.get("ap2")
+    flags = FLAG_VALIDATED if entry.get("validated") else 0
+    values = [entry.get("ap1")]
+    if ap2 is not None:
+        flags |= FLAG_AP2
+        for part, flag in PART_FLAGS.items():
+            if ap2.get(part) is not None:
+                flags |= flag
+    for part, field in AP2_SCORE_FIELDS:
+        values.append(((ap2 or {}).get(part) or {}).get(field))
+    return flags, bytes(_score_byte(v) for v in values)
+
+
+# (Teil, Flag, Felder) in der Reihenfolge der Score-Bytes
+_PARTS = tuple((part, PART_FLAGS[part], fields) for part, fields in PART_FIELDS.items())
+
+
+# Flags und Score-Bytes, wenn decode_entry den Eintrag unverändert zurückliefert
+# (Form von model_dump() plus id und optional validated), sonst None.
+# Ausgeschrieben statt über encode_scores, EntryTable ruft das beim Laden für jeden Eintrag auf
+def encode_exact(entry: dict) -> Optional[Tuple[int, bytes]]:
+    if len(entry) == 4:
+        flags = 0
+    elif len(entry) == 5 and entry.get("validated") is True:
+        flags = FLAG_VALIDATED
+    else:
+        return None
+    try:
+        name, ap1, ap2, _ = entry["name"], entry["ap1"], entry["ap2"], entry["id"]
+    except KeyError:
+        return None
+    if name is not None and type(name) is not str:
+        return None
+    values = [ap1]
+    if ap2 is None:
+        values += (None,) * 8
+    else:
+        if type(ap2) is not dict or len(ap2) != len(_PARTS):
+            return None
+        flags |= FLAG_AP2
+        for part, flag, (first, second) in _PARTS:
+            fields = ap2.get(part, False)
+            if fields is None:
+                values += (None, None)
+                continue
+            if type(fields) is not dict or len(fields) != 2 or first not in fields or second not in fields:
+                return None
+            flags |= flag
+            values += (fields[first], fields[second])
+    scores = bytearray(len(values))
+    for i, v in enumerate(values):
+        if v is None:
+            scores[i] = MISSING_SCORE
+        elif type(v) is int and 0 <= v < MISSING_SCORE:
+            scores[i] = v
+        else:
+            return None
+    return flags, bytes(scores)
+
+
+def encode_name(name: Optional[str]) -> bytes:
+    return b"" if name is None else name.encode("utf-8")
+
+
+def encode_record(entry: dict, name_offset: int) -> bytes:
+    flags, scores = encode_scores(entry)
+    name = entry.get("name")
+    name_length = NO_NAME if name is None else len(encode_name(name))
+    return RECORD.pack(uuid.UUID(entry["id"]).bytes, flags, scores, name_offset, name_length)
+
+
+# schneller als str(uuid.UUID(bytes=...)), macht bei 100k Einträgen einen spürbaren Unterschied
+def format_id(raw: bytes) -> str:
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def decode_entry(entry_id: str, flags: int, scores: bytes, name: Optional[str]) -> dict:
+    v = [None if b == MISSING_SCORE else b for b in scores]
+    ap2 = None
+    # ausgeschrieben statt über AP2_SCORE_FIELDS, load_all ruft das für jeden Eintrag auf
+    if flags & FLAG_AP2:
+        ap2 = {
+            "planning": {"main": v[1], "extra": v[2]} if flags & FLAG_PLANNING else None,
+            "development": {"main": v[3], "extra": v[4]} if flags & FLAG_DEVELOPMENT else None,
+            "economy": {"main": v[5], "extra": v[6]} if flags & FLAG_ECONOMY else None,
+            "pw": {"project": v[7], "presentation": v[8]} if flags & FLAG_PW else None,
+        }
+    # gleiche Schlüsselreihenfolge wie model_dump() plus id
+    entry = {"name": name, "ap1": v[0], "ap2": ap2, "id": entry_id}
+    if flags & FLAG_VALIDATED:
+        entry["validated"] = True
+    return entry
+
+
+def id_bytes(entry_id: str) -> Optional[bytes]:
+    try:
+        return uuid.UUID(entry_id).bytes
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+# Score-Bytes (0xFF = fehlt) in die Score-Matrix der vektorisierten Berechnung übersetzen
+def to_score_matrix(scores: np.ndarray) -> np.ndarray:
+    matrix = scores.astype(np.int16)
+    matrix[matrix == MISSING_SCORE] = MISSING
+    return matrix
@@ -0,0 +1,409 @@
+import mmap
+import os
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.app.service.binary_codec import (
+    FLAG_DELETED,
+    FORMAT_VERSION,
+    HEADER,
+    MAGIC,
+    NO_NAME,
+    RECORD,
+    RECORD_DTYPE,
+    decode_entry,
+    encode_name,
+    encode_record,
+    encode_scores,
+    format_id,
+    id_bytes,
+    to_score_matrix,
+)
+from backend.app.service.file_lock import FileLock
+from backend.app.service.file_service import FileService
+from backend.app.service.metrics_service import STORAGE_LOAD_DURATION, STORAGE_SAVE_DURATION
+from backend.app.service.storage_repository import StorageRepository, format_entry_cursor, parse_entry_cursor
+
+
+def _release(mapping):
+    if not isinstance(mapping, mmap.mmap):
+        return
+    try:
+        mapping.close()
+    except BufferError:
+        # es existieren noch numpy-Sichten auf die alte Abbildung, sie wird mit ihnen freigegeben
+        pass
+
+
+# Einträge als Datensätze fester Breite (siehe binary_codec) in einer per mmap
+# gelesenen Datei, Namen in einer eigenen Namenstabelle <filepath>.names.<Generation>.
+# Datensatz i liegt bei HEADER.size + i * RECORD.size, Zugriff per Index ist O(1).
+# Gelöschte Datensätze bleiben als Tombstone stehen, bis compact() die Datei neu schreibt; das
+# geschieht wie beim Journal der JSON-Ablage automatisch, sobald compaction_threshold Tombstones
+# oder compaction_name_bytes nicht mehr referenzierte Namensbytes zusammengekommen sind.
+class BinaryStorageService(StorageRepository):
+    # das Datensatzformat hat keinen Platz für result/result_key
+    stores_results = False
+
+    def __init__(self, filepath: str, compaction_threshold: int = 1000, compaction_name_bytes: int = 64 * 1024):
+        self.filepath = filepath
+        self.compaction_threshold = compaction_threshold
+        self.compaction_name_bytes = compaction_name_bytes
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(filepath + ".lock")
+        # Änderungszähler (8 Byte), In-Place-Änderungen lassen Größe und Inode der Datei gleich
+        self._version_path = filepath + ".version"
+        self._data = None
+        self._data_stamp = None
+        self._names = None
+        self._names_stamp = None
+        self._generation = 0
+        self._count = 0
+        # UUID-Bytes -> Datensatzindex, wird erst beim ersten Zugriff per id aufgebaut
+        self._index: Optional[Dict[bytes, int]] = None
+        dirpath = os.path.dirname(filepath)
+        if dirpath and not os.path.exists(dirpath):
+            os.makedirs(dirpath, exist_ok=True)
+        with self._write_lock():
+            if not os.path.exists(filepath):
+                self._write_files(0, [], [])
+            else:
+                self._truncate_torn_tail()
+
+    # liefert eine Liste mit einem Flag; wer nichts geändert hat, setzt es auf False,
+    # dann bleibt der Stand (und damit z.B. das ETag von /exam/list) unverändert
+    @contextmanager
+    def _write_lock(self):
+        with self._lock:
+            with self._file_lock:
+                before = self.version()
+                changed = [True]
+                yield changed
+                if changed[0]:
+                    self.last_write_versions = (before, self._bump_version(before))
+
+    def version(self) -> str:
+        try:
+            with open(self._version_path, "rb") as f:
+                return str(int.from_bytes(f.read(8), "little"))
+        except FileNotFoundError:
+            return "0"
+
+    # überschreibt die 8 Byte an Ort und Stelle, Leser sehen nie eine leere Datei
+    def _bump_version(self, current: str) -> str:
+        version = int(current) + 1
+        with open(self._version_path, "r+b" if os.path.exists(self._version_path) else "wb") as f:
+            f.write(version.to_bytes(8, "little"))
+        return str(version)
+
+    def _names_path(self, generation: int) -> str:
+        return f"{self.filepath}.names.{generation}"
+
+    # ein beim Absturz halb angehängter Datensatz wird abgeschnitten
+    def _truncate_torn_tail(self):
+        size = os.path.getsize(self.filepath)
+        torn = (size - HEADER.size) % RECORD.size
+        if torn:
+            with open(self.filepath, "r+b") as f:
+                f.truncate(size - torn)
+
+    @staticmethod
+    def _write_atomic(path: str, content: bytes):
+        dirpath = os.path.dirname(path) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=dirpath)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            FileService._replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # schreibt eine neue Generation: erst die Namenstabelle, dann atomar die
+    # Datensätze, deren Kopf auf diese Namenstabelle verweist
+    def _write_files(self, generation: int, records: List[bytes], names: List[bytes]):
+        self._write_atomic(self._names_path(generation), b"".join(names))
+        self._write_atomic(self.filepath,
+                           HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, generation) + b"".join(records))
+
+    def _refresh(self):
+        st = os.stat(self.filepath)
+        stamp = (st.st_ino, st.st_size)
+        if stamp != self._data_stamp:
+            replaced = self._data_stamp is None or st.st_ino != self._data_stamp[0]
+            with open(self.filepath, "rb") as f:
+                magic, version, record_size, generation = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+                    raise ValueError(f"{self.filepath} is not a binary storage file of version {FORMAT_VERSION}")
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            _release(self._data)
+            self._data = mapping
+            count = (st.st_size - HEADER.size) // RECORD.size
+            if replaced:
+                self._index = None
+            elif self._index is not None:
+                # bisher nur angehängt: Index um die neuen Datensätze ergänzen
+                self._extend_index(self._count, count)
+            self._count = count
+            self._generation = generation
+            self._data_stamp = stamp
+        names_path = self._names_path(self._generation)
+        names_stamp = (self._generation, os.path.getsize(names_path))
+        if names_stamp != self._names_stamp:
+            _release(self._names)
+            if names_stamp[1] == 0:
+                self._names = b""
+            else:
+                with open(names_path, "rb") as f:
+                    self._names = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._names_stamp = names_stamp
+
+    def _extend_index(self, start: int, stop: int):
+        ids = self._records(start, stop)["id"]
+        for i, key in enumerate(ids.tolist(), start):
+            self._index[key] = i
+
+    def _id_index(self) -> Dict[bytes, int]:
+        if self._index is None:
+            self._index = {}
+            self._extend_index(0, self._count)
+        return self._index
+
+    def _records(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        stop = self._count if stop is None else stop
+        return np.frombuffer(self._data, dtype=RECORD_DTYPE, count=stop - start,
+                             offset=HEADER.size + start * RECORD.size)
+
+    def _name(self, offset: int, length: int) -> Optional[str]:
+        if length == NO_NAME:
+            return None
+        return bytes(self._names[offset:offset + length]).decode("utf-8")
+
+    def _entry(self, index: int) -> Optional[dict]:
+        entry_id, flags, scores, name_offset, name_length = RECORD.unpack_from(
+            self._data, HEADER.size + index * RECORD.size)
+        if flags & FLAG_DELETED:
+            return None
+        return decode_entry(format_id(entry_id), flags, scores, self._name(name_offset, name_length))
+
+    def _find(self, entry_id: str) -> Optional[int]:
+        key = id_bytes(entry_id)
+        if key is None:
+            return None
+        index = self._id_index().get(key)
+        if index is None or self._data[HEADER.size + index * RECORD.size + 16] & FLAG_DELETED:
+            return None
+        return index
+
+    def _append_names(self, entries: List[dict]) -> List[int]:
+        names_path = self._names_path(self._generation)
+        offset = os.path.getsize(names_path)
+        offsets = []
+        encoded = []
+        for entry in entries:
+            name = encode_name(entry.get("name"))
+            offsets.append(offset)
+            encoded.append(name)
+            offset += len(name)
+        if any(encoded):
+            with open(names_path, "ab") as f:
+                f.write(b"".join(encoded))
+                f.flush()
+                os.fsync(f.fileno())
+        return offsets
+
+    @STORAGE_SAVE_DURATION.timed(backend="binary")
+    def _append(self, entries: List[dict]):
+        for entry in entries:
+            encode_scores(entry)
+        self._refresh()
+        # Namen zuerst: ein Absturz dazwischen hinterlässt höchstens unbenutzte Namen
+        offsets = self._append_names(entries)
+        records = b"".join(encode_record(entry, offset) for entry, offset in zip(entries, offsets))
+        with open(self.filepath, "ab") as f:
+            f.write(records)
+            f.flush()
+            os.fsync(f.fileno())
+        self._refresh()
+
+    def _write_record(self, index: int, record: bytes):
+        with open(self.filepath, "r+b") as f:
+            f.seek(HEADER.size + index * RECORD.size)
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def save(self, entry: dict):
+        entry["id"] = str(uuid.uuid4())
+        with self._write_lock():
+            self._append([entry])
+        return entry
+
+    def save_many(self, entries):
+        for entry in entries:
+            entry["id"] = str(uuid.uuid4())
+        if entries:
+            with self._write_lock():
+                self._append(entries)
+        return entries
+
+    @STORAGE_LOAD_DURATION.timed(backend="binary")
+    def load_all(self):
+        with self._lock:
+            self._refresh()
+            records = memoryview(self._data)[HEADER.size:HEADER.size + self._count * RECORD.size]
+            try:
+                return [decode_entry(format_id(entry_id), flags, scores, self._name(name_offset, name_length))
+                        for entry_id, flags, scores, name_offset, name_length in RECORD.iter_unpack(records)
+                        if not flags & FLAG_DELETED]
+            finally:
+                records.release()
+
+    def get_by_id(self, entry_id: str):
+        with self._lock:
+            self._refresh()
+            index = self._find(entry_id)
+            return self._entry(index) if index is not None else None
+
+    def get_by_ids(self, entry_ids):
+        with self._lock:
+            self._refresh()
+            found = {}
+            for entry_id in entry_ids:
+                index = self._find(entry_id)
+                if index is not None:
+                    found[entry_id] = self._entry(index)
+            return found
+
+    def parse_cursor(self, cursor):
+        return parse_entry_cursor(cursor)
+
+    # Cursor "<Datensatzindex dahinter>:<id>": compact() vergibt die Indizes neu, fortgesetzt wird
+    # daher hinter dem Datensatz mit der id, nur wenn es ihn nicht mehr gibt am Index
+    def iter_entries(self, name_prefix=None, cursor=None):
+        position, last_id = parse_entry_cursor(cursor)
+        generation = None
+        while True:
+            with self._lock:
+                self._refresh()
+                if generation != self._generation:
+                    found = self._find(last_id) if last_id is not None else None
+                    position = found + 1 if found is not None else position
+                    generation = self._generation
+                if position >= self._count:
+                    return
+                entry = self._entry(position)
+            position += 1
+            if entry is None:
+                continue
+            last_id = entry["id"]
+            if name_prefix is None or (entry.get("name") or "").startswith(name_prefix):
+                yield format_entry_cursor(position, last_id), entry
+
+    def get_by_index(self, index: int) -> Optional[dict]:
+        with self._lock:
+            self._refresh()
+            if not 0 <= index < self._count:
+                raise IndexError(index)
+            return self._entry(index)
+
+    def delete_by_id(self, entry_id: str):
+        with self._write_lock() as changed:
+            self._refresh()
+            index = self._find(entry_id)
+            if index is None:
+                changed[0] = False
+                return False
+            flags = self._data[HEADER.size + index * RECORD.size + 16]
+            with open(self.filepath, "r+b") as f:
+                f.seek(HEADER.size + index * RECORD.size + 16)
+                f.write(bytes([flags | FLAG_DELETED]))
+                f.flush()
+                os.fsync(f.fileno())
+            self._compact_if_needed()
+        return True
+
+    # Datensätze haben eine feste Breite und werden an Ort und Stelle überschrieben
+    def update_by_id(self, entry_id: str, new_entry: dict):
+        with self._write_lock() as changed:
+            self._refresh()
+            index = self._find(entry_id)
+            if index is None:
+                changed[0] = False
+                return None
+            new_entry["id"] = entry_id
+            encode_scores(new_entry)
+            _, _, _, name_offset, name_length = RECORD.unpack_from(self._data, HEADER.size + index * RECORD.size)
+            name = encode_name(new_entry.get("name"))
+            if name_length == NO_NAME or bytes(self._names[name_offset:name_offset + name_length]) != name:
+                name_offset = self._append_names([new_entry])[0]
+            # unveränderte Namen werden weiterverwendet und nicht erneut angehängt
+            self._write_record(index, encode_record(new_entry, name_offset))
+            self._compact_if_needed()
+        return new_entry
+
+    # (Tombstones, nicht mehr referenzierte Namensbytes)
+    def _garbage(self) -> Tuple[int, int]:
+        records = self._records()
+        live = (records["flags"] & FLAG_DELETED) == 0
+        lengths = records["name_length"][live]
+        live_name_bytes = int(lengths[lengths != NO_NAME].sum(dtype=np.int64))
+        return len(records) - int(np.count_nonzero(live)), self._names_stamp[1] - live_name_bytes
+
+    def _compact_if_needed(self):
+        self._refresh()
+        # die numpy-Sichten auf die Abbildung sind hier schon wieder freigegeben
+        tombstones, dead_name_bytes = self._garbage()
+        if tombstones >= self.compaction_threshold or dead_name_bytes >= self.compaction_name_bytes:
+            self._compact()
+
+    # entfernt Tombstones und nicht mehr referenzierte Namen
+    def compact(self):
+        with self._write_lock():
+            self._compact()
+
+    def _compact(self):
+        self._refresh()
+        old_generation = self._generation
+        records, names = [], []
+        offset = 0
+        for i in range(self._count):
+            entry = self._entry(i)
+            if entry is None:
+                continue
+            name = encode_name(entry.get("name"))
+            records.append(encode_record(entry, offset))
+            names.append(name)
+            offset += len(name)
+        # unter Windows lässt sich eine abgebildete Datei nicht ersetzen
+        _release(self._data)
+        _release(self._names)
+        self._data = self._names = self._data_stamp = self._names_stamp = None
+        self._write_files(old_generation + 1, records, names)
+        self._refresh()
+        try:
+            os.remove(self._names_path(old_generation))
+        except OSError:
+            # unter Windows evtl. noch von einem anderen Prozess abgebildet
+            pass
+
+    # Zero-Copy-Sicht auf alle Datensätze (inklusive Tombstones) als numpy-Structured-Array
+    def records(self) -> np.ndarray:
+        with self._lock:
+            self._refresh()
+            return self._records()
+
+    # ids und Score-Matrix (MISSING = -1) aller gültigen Einträge, ohne ein Dict pro Eintrag zu bauen
+    def score_matrix(self) -> Tuple[List[str], np.ndarray]:
+        records = self.records()
+        live = records[(records["flags"] & FLAG_DELETED) == 0]
+        ids = [format_id(key) for key in live["id"].tolist()]
+        return ids, to_score_matrix(live["scores"])
@@ -0,0 +1,160 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.model.final_exam_result_output import FinalExamResultOutput
+from backend.app.model.grading_ruleset import GradingRuleset
+from backend.app.model.recompute_report import RecomputeReport, WorkerThroughput
+from backend.app.service.result_cache_service import result_key, strip_metadata
+from backend.app.service.ruleset_service import CompiledRuleset, rulesets
+from backend.app.service.storage_repository import StorageRepository
+from backend.app.service.vectorized_calculation_service import VectorizedExamCalculationService
+
+RECOMPUTE_CHUNK_SIZE = 5000
+# so viele Einträge werden gesammelt und mit einem replace_many geschrieben
+RECOMPUTE_WRITE_SIZE = 50000
+RESULT_KEYS = ("result", "result_key")
+
+_calculation_service = None
+
+
+def _json(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+# Initializer der Worker-Prozesse: übersetzt das Regelwerk einmal je Prozess
+def init_worker(definition: str):
+    global _calculation_service
+    ruleset = CompiledRuleset(GradingRuleset.model_validate_json(definition))
+    _calculation_service = VectorizedExamCalculationService(ruleset)
+
+
+# läuft im Worker-Prozess. Ein- und Ausgabe sind je Block ein einziger JSON-Text: das Übertragen
+# kostet dann kaum mehr als ein memcpy, während gepickelte Dicts je Eintrag fast so teuer wären wie
+# die Berechnung selbst. Liefert (pid, Rechenzeit, [[result_key, result] oder null, ...])
+def recompute_chunk(payload: str) -> Tuple[int, float, str]:
+    started = time.perf_counter()
+    ruleset_key = _calculation_service.ruleset.key
+    entries = json.loads(payload)
+    output = []
+    for entry, result in zip(entries, _calculation_service.calculateEntryResults(entries)):
+        if result is not None and not entry.get("validated"):
+            # nicht über die API gespeichert: wie GET /exam/calculate erst gegen das Eingabemodell prüfen
+            try:
+                FinalExamResultInput.model_validate(strip_metadata(entry))
+            except ValidationError:
+                result = None
+        output.append(None if result is None else [result_key(entry, ruleset_key), FinalExamResultOutput.dump_result_dict(result)])
+    return os.getpid(), time.perf_counter() - started, _json(output)
+
+
+# Berechnet die Ergebnisse aller gespeicherten Einträge neu (z.B. nach geänderten Notengrenzen) und
+# speichert sie als result/result_key am Eintrag. Die Ablage wird blockweise gelesen, die Blöcke
+# werden auf einen ProcessPoolExecutor verteilt und die Ergebnisse in Lesereihenfolge zurückgeschrieben;
+# höchstens zwei Blöcke je Worker sind gleichzeitig unterwegs. Einträge, die sich während des Laufs
+# geändert haben, werden nicht überschrieben (replace_many).
+class BulkRecomputeService:
+    def __init__(self, storage: StorageRepository, workers: Optional[int] = None,
+                 chunk_size: int = RECOMPUTE_CHUNK_SIZE, write_size: int = RECOMPUTE_WRITE_SIZE,
+                 ruleset: Optional[CompiledRuleset] = None):
+        if not storage.stores_results:
+            raise ValueError(f"{type(storage).__name__} cannot store calculated results")
+        self.storage = storage
+        # Regelwerk, unter dem neu berechnet wird, z.B. das zum Prüfungszeitpunkt gültige
+        self.ruleset = ruleset or rulesets.get()
+        # 0 rechnet ohne Worker-Prozesse im aufrufenden Prozess
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self.write_size = write_size
+
+    def _chunks(self):
+        entries = (entry for _, entry in self.storage.iter_entries())
+        while True:
+            chunk = list(islice(entries, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _replacement(entry: dict, calculated) -> Optional[dict]:
+        if calculated is not None:
+            result_key, result = calculated
+            if entry.get("result_key") == result_key and entry.get("result") == result:
+                return None
+            return {**entry, "result_key": result_key, "result": result}
+        if not any(key in entry for key in RESULT_KEYS):
+            return None
+        return {key: value for key, value in entry.items() if key not in RESULT_KEYS}
+
+    def run(self, progress: Optional[Callable[[RecomputeReport], None]] = None) -> RecomputeReport:
+        report = RecomputeReport(total=self.storage.count())
+        workers: Dict[int, WorkerThroughput] = {}
+        replacements: List[Tuple[dict, dict]] = []
+        cleanups: List[Tuple[dict, dict]] = []
+        started = time.perf_counter()
+
+        def write():
+            replaced = self.storage.replace_many(replacements)
+            report.updated += replaced
+            report.conflicts += len(replacements) - replaced
+            replacements.clear()
+            # ungültige Einträge verlieren nur ihr veraltetes Ergebnis und zählen weiter allein unter invalid
+            self.storage.replace_many(cleanups)
+            cleanups.clear()
+
+        def collect(chunk: List[dict], pid: int, busy: float, output: str):
+            worker = workers.setdefault(pid, WorkerThroughput(pid=pid))
+            worker.chunks += 1
+            worker.entries += len(chunk)
+            worker.busy_seconds += busy
+            worker.entries_per_second = worker.entries / worker.busy_seconds if worker.busy_seconds else 0.0
+            report.workers = sorted(workers.values(), key=lambda w: w.pid)
+            for entry, calculated in zip(chunk, json.loads(output)):
+                new = self._replacement(entry, calculated)
+                if calculated is None:
+                    report.invalid += 1
+                    if new is not None:
+                        cleanups.append((entry, new))
+                elif new is None:
+                    report.unchanged += 1
+                else:
+                    replacements.append((entry, new))
+            if len(replacements) + len(cleanups) >= self.write_size:
+                write()
+            report.processed += len(chunk)
+            report.seconds = time.perf_counter() - started
+            report.entries_per_second = report.processed / report.seconds if report.seconds else 0.0
+            if progress is not None:
+                progress(report)
+
+        definition = self.ruleset.definition.model_dump_json()
+        if self.workers == 0:
+            init_worker(definition)
+            for chunk in self._chunks():
+                collect(chunk, *recompute_chunk(_json(chunk)))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                     initargs=(definition,)) as pool:
+                pending: deque = deque()
+                for chunk in self._chunks():
+                    pending.append((chunk, pool.submit(recompute_chunk, _json(chunk))))
+                    if len(pending) >= 2 * self.workers:
+                        chunk, future = pending.popleft()
+                        collect(chunk, *future.result())
+                while pending:
+                    chunk, future = pending.popleft()
+                    collect(chunk, *future.result())
+        if replacements or cleanups:
+            write()
+
+        # inklusive des letzten Schreibvorgangs
+        report.seconds = time.perf_counter() - started
+        report.entries_per_second = report.processed / report.seconds if report.seconds else 0.0
+        return report
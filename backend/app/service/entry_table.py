@@ -0,0 +1,161 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from backend.app.service.binary_codec import FLAG_DELETED, decode_entry, encode_exact
+
+SCORE_WIDTH = 9
+EMPTY_SCORES = bytes(SCORE_WIDTH)
+# Zeile liegt nicht kompakt vor, sondern als Dict in _dicts
+FLAG_DICT = 0x80
+# ab so vielen Tombstones (und mehr als der Hälfte der Zeilen) wird die Tabelle neu aufgebaut
+COMPACTION_MIN_DELETED = 1024
+
+
+# Speicherschonende Ablage der Einträge im Speicher statt verschachtelter Dicts: ids und Namen
+# als Listen, Flags und Score-Bytes im Format von binary_codec als zusammenhängende bytearrays,
+# dazu ein Index id -> Zeile. Dicts werden erst beim Lesen gebaut. Einträge, die decode_entry
+# nicht exakt wiederherstellen würde (zusätzliche Felder, gespeicherte Ergebnisse, andere Typen),
+# bleiben als Dict erhalten. Gelöschte Zeilen bleiben als Tombstone stehen, damit sich die
+# Zeilennummern laufender Iterationen nicht verschieben.
+class EntryTable:
+    __slots__ = ("_ids", "_names", "_flags", "_scores", "_dicts", "_index", "_deleted", "layout")
+
+    def __init__(self, entries: Iterable[dict] = ()):
+        self._ids: List[Optional[str]] = []
+        self._names: List[Optional[str]] = []
+        self._flags = bytearray()
+        self._scores = bytearray()
+        self._dicts: Dict[int, dict] = {}
+        self._index: Dict[str, int] = {}
+        self._deleted = 0
+        # ändert sich, wenn Zeilen ihre Nummer wechseln
+        self.layout = 0
+        self._extend(entries)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, entry_id) -> bool:
+        return entry_id in self._index
+
+    def _set(self, row: int, entry: dict):
+        encoded = encode_exact(entry)
+        self._dicts.pop(row, None)
+        if encoded is None:
+            self._flags[row] = FLAG_DICT
+            self._names[row] = None
+            self._dicts[row] = entry
+        else:
+            self._flags[row], self._scores[row * SCORE_WIDTH:(row + 1) * SCORE_WIDTH] = encoded
+            self._names[row] = entry["name"]
+
+    # fügt einen Eintrag an oder ersetzt den Eintrag mit derselben id an seiner Stelle
+    def put(self, entry: dict):
+        entry_id = entry.get("id")
+        row = self._index.get(entry_id)
+        if row is None:
+            row = len(self._ids)
+            self._ids.append(entry_id)
+            self._names.append(None)
+            self._flags.append(0)
+            self._scores.extend(EMPTY_SCORES)
+            self._index[entry_id] = row
+        self._set(row, entry)
+
+    # wie put() für jeden Eintrag, ohne dessen Verwaltungsaufwand beim Laden der ganzen Ablage
+    def _extend(self, entries: Iterable[dict]):
+        ids, names, flags, scores, dicts, index = \
+            self._ids, self._names, self._flags, self._scores, self._dicts, self._index
+        for entry in entries:
+            entry_id = entry.get("id")
+            if entry_id in index:
+                self.put(entry)
+                continue
+            encoded = encode_exact(entry)
+            row = len(ids)
+            index[entry_id] = row
+            ids.append(entry_id)
+            if encoded is None:
+                names.append(None)
+                flags.append(FLAG_DICT)
+                scores.extend(EMPTY_SCORES)
+                dicts[row] = entry
+            else:
+                names.append(entry["name"])
+                flags.append(encoded[0])
+                scores.extend(encoded[1])
+
+    def delete(self, entry_id) -> bool:
+        row = self._index.pop(entry_id, None)
+        if row is None:
+            return False
+        self._ids[row] = self._names[row] = None
+        self._flags[row] = FLAG_DELETED
+        self._dicts.pop(row, None)
+        self._deleted += 1
+        if self._deleted >= COMPACTION_MIN_DELETED and self._deleted * 2 > len(self._ids):
+            self._compact()
+        return True
+
+    def _compact(self):
+        live = [row for row in range(len(self._ids)) if not self._flags[row] & FLAG_DELETED]
+        ids, names, flags, scores, dicts = self._ids, self._names, self._flags, self._scores, self._dicts
+        self._ids = [ids[row] for row in live]
+        self._names = [names[row] for row in live]
+        self._flags = bytearray(flags[row] for row in live)
+        self._scores = bytearray(b"".join(scores[row * SCORE_WIDTH:(row + 1) * SCORE_WIDTH] for row in live))
+        self._dicts = {new: dicts[row] for new, row in enumerate(live) if row in dicts}
+        self._index = {entry_id: row for row, entry_id in enumerate(self._ids)}
+        self._deleted = 0
+        self.layout += 1
+
+    def entry(self, row: int) -> dict:
+        flags = self._flags[row]
+        if flags & FLAG_DICT:
+            return self._dicts[row]
+        return decode_entry(self._ids[row], flags, self._scores[row * SCORE_WIDTH:(row + 1) * SCORE_WIDTH],
+                            self._names[row])
+
+    def get(self, entry_id) -> Optional[dict]:
+        row = self._index.get(entry_id)
+        return None if row is None else self.entry(row)
+
+    def row_of(self, entry_id) -> Optional[int]:
+        return self._index.get(entry_id)
+
+    def entry_id(self, row: int):
+        return self._ids[row]
+
+    def name(self, row: int) -> Optional[str]:
+        if self._flags[row] & FLAG_DICT:
+            return self._dicts[row].get("name")
+        return self._names[row]
+
+    def entries(self) -> Iterator[dict]:
+        for row in self.live_rows(0, len(self._ids)):
+            yield self.entry(row)
+
+    # Nummern der nächsten höchstens count gültigen Zeilen ab Zeile start
+    def live_rows(self, start: int, count: int) -> List[int]:
+        if not self._deleted:
+            return list(range(start, min(start + count, len(self._ids))))
+        rows = []
+        flags = self._flags
+        for row in range(start, len(self._ids)):
+            if not flags[row] & FLAG_DELETED:
+                rows.append(row)
+                if len(rows) == count:
+                    break
+        return rows
+
+    # Zeile des position-ten gültigen Eintrags (bzw. hinter dem letzten)
+    def row_of_position(self, position: int) -> int:
+        if not self._deleted:
+            return min(position, len(self._ids))
+        seen = 0
+        for row, flags in enumerate(self._flags):
+            if flags & FLAG_DELETED:
+                continue
+            if seen == position:
+                return row
+            seen += 1
+        return len(self._ids)
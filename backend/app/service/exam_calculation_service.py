@@ -1,137 +1,108 @@
 from typing import Optional
 from backend.app.model.final_exam_result_input import FinalExamResultInput, AP2Part
 from backend.app.model.final_exam_result_output import FinalExamResultOutput
+from backend.app.service.metrics_service import CALCULATION_DURATION
+from backend.app.service.ruleset_service import CompiledRuleset, rulesets
+
+
+# Punktwerte einer Eingabe in der Reihenfolge von SCORE_COLUMNS (vectorized_calculation_service), None = fehlt
+def scores_from_input(finalExamResult: FinalExamResultInput) -> tuple:
+    ap2 = finalExamResult.ap2
+    planning = ap2.planning if ap2 else None
+    development = ap2.development if ap2 else None
+    economy = ap2.economy if ap2 else None
+    pw = ap2.pw if ap2 else None
+    return (
+        finalExamResult.ap1,
+        planning.main if planning else None,
+        planning.extra if planning else None,
+        development.main if development else None,
+        development.extra if development else None,
+        economy.main if economy else None,
+        economy.extra if economy else None,
+        pw.project if pw else None,
+        pw.presentation if pw else None,
+    )
 
 
 class ExamCalculationService:
-    WEIGHTS = {
-        "ap1": 0.20,
-        "ap2_planning": 0.10,
-        "ap2_development": 0.10,
-        "ap2_economy": 0.10,
-        "ap2_pw_overall": 0.50
-    }
+    # ruleset: übersetztes Regelwerk (RulesetService.get), Standard ist das konfigurierte Regelwerk
+    def __init__(self, ruleset: Optional[CompiledRuleset] = None):
+        self.ruleset = ruleset or rulesets.get()
 
     def _grade_from_points(self, points: Optional[int]) -> Optional[int]:
         if points is None or points < 0 or points > 100:
             return None
-        p = float(points)
-        if p >= 92: return 1
-        if p >= 81: return 2
-        if p >= 67: return 3
-        if p >= 50: return 4
-        if p >= 30: return 5
-        return 6
+        # die Notengrenzen sind ganzzahlig, daher ist Abrunden auf den Tabellenindex exakt
+        return self.ruleset.grade_table[int(points)]
 
-    def _calculate_ap2_part(self, part: Optional[AP2Part]) -> Optional[int]:
-        if part is None:
-            return None
-        main = part.main
-        extra = part.extra
+    def _ap2_part_points(self, main: Optional[int], extra: Optional[int]) -> Optional[int]:
         if main is None:
             return None
         if extra is None:
             return round(float(main))
-        val = (2.0 / 3.0) * float(main) + (1.0 / 3.0) * float(extra)
-        return round(val)
+        return self.ruleset.ap2_part_table[main * 101 + extra]
 
-    def calculateExamResults(self, finalExamResult: FinalExamResultInput) -> FinalExamResultOutput:
-        ap1_points = round(finalExamResult.ap1) if finalExamResult.ap1 is not None else None
-
-        ap2_planning_points = self._calculate_ap2_part(
-            finalExamResult.ap2.planning if (finalExamResult.ap2 and finalExamResult.ap2.planning) else None)
-        ap2_development_points = self._calculate_ap2_part(
-            finalExamResult.ap2.development if (finalExamResult.ap2 and finalExamResult.ap2.development) else None)
-        ap2_economy_points = self._calculate_ap2_part(
-            finalExamResult.ap2.economy if (finalExamResult.ap2 and finalExamResult.ap2.economy) else None)
-
-        ap2_pw_project_points = round(finalExamResult.ap2.pw.project) if (
-                    finalExamResult.ap2 and finalExamResult.ap2.pw and finalExamResult.ap2.pw.project is not None) else None
-        ap2_pw_presentation_points = round(finalExamResult.ap2.pw.presentation) if (
-                    finalExamResult.ap2 and finalExamResult.ap2.pw and finalExamResult.ap2.pw.presentation is not None) else None
-
-        ap2_pw_overall_points = None
-        if ap2_pw_project_points is not None and ap2_pw_presentation_points is not None:
-            ap2_pw_overall_points = round(0.5 * ap2_pw_project_points + 0.5 * ap2_pw_presentation_points)
-        elif ap2_pw_project_points is not None:
-            ap2_pw_overall_points = ap2_pw_project_points
-        elif ap2_pw_presentation_points is not None:
-            ap2_pw_overall_points = ap2_pw_presentation_points
-
-        ap2_overall_points = None
-        ap2_components_for_calc = {
-            "ap2_planning": ap2_planning_points,
-            "ap2_development": ap2_development_points,
-            "ap2_economy": ap2_economy_points,
-            "ap2_pw_overall": ap2_pw_overall_points,
-        }
+    def _calculate_ap2_part(self, part: Optional[AP2Part]) -> Optional[int]:
+        if part is None:
+            return None
+        return self._ap2_part_points(part.main, part.extra)
 
-        ap2_weighted_sum = 0.0
-        ap2_present_weight_sum = 0.0
-        for key, pts in ap2_components_for_calc.items():
-            if pts is not None:
-                w = self.WEIGHTS.get(key, 0.0)
-                ap2_weighted_sum += w * float(pts)
-                ap2_present_weight_sum += w
-
-        if ap2_present_weight_sum > 0:
-            ap2_overall_points = round(ap2_weighted_sum / ap2_present_weight_sum)
-
-        components = {
-            "ap1": {"points": ap1_points, "grade": self._grade_from_points(ap1_points)},
-            "ap2_planning": {"points": ap2_planning_points, "grade": self._grade_from_points(ap2_planning_points)},
-            "ap2_development": {"points": ap2_development_points,
-                                "grade": self._grade_from_points(ap2_development_points)},
-            "ap2_economy": {"points": ap2_economy_points, "grade": self._grade_from_points(ap2_economy_points)},
-            "ap2_pw_project": {"points": ap2_pw_project_points, "grade": self._grade_from_points(ap2_pw_project_points)},
-            "ap2_pw_presentation": {"points": ap2_pw_presentation_points,
-                                "grade": self._grade_from_points(ap2_pw_presentation_points)},
-            "ap2_pw_overall": {"points": ap2_pw_overall_points, "grade": self._grade_from_points(ap2_pw_overall_points)},
-            "ap2_overall": {"points": ap2_overall_points, "grade": self._grade_from_points(ap2_overall_points)}
-        }
+    def _calculate_pw_overall(self, project: Optional[int], presentation: Optional[int]) -> Optional[int]:
+        if project is not None and presentation is not None:
+            return self.ruleset.pw_overall_table[project * 101 + presentation]
+        if project is not None:
+            return project
+        return presentation
 
+    @staticmethod
+    def _weighted_points(points: dict, weights: tuple) -> Optional[int]:
         weighted_sum = 0.0
         present_weight_sum = 0.0
-        for key, val in components.items():
-            pts = val["points"]
+        for key, w in weights:
+            pts = points[key]
             if pts is not None:
-                w = self.WEIGHTS.get(key, 0.0)
                 weighted_sum += w * float(pts)
                 present_weight_sum += w
-
         if present_weight_sum > 0:
-            overall_points = round(weighted_sum / present_weight_sum)
-            overall_grade = self._grade_from_points(overall_points)
-        else:
-            overall_points = None
-            overall_grade = None
-
-        components["Overall"] = {"points": overall_points, "grade": overall_grade}
-
-        failure_reasons = []
-
-        # im Gesamtergebnis von Teil 1 und Teil 2 mit mindestens „ausreichend“
-        if overall_points is not None and overall_points < 50:
-            failure_reasons.append("OVERALL_BELOW_50_POINTS")
+            return round(weighted_sum / present_weight_sum)
+        return None
 
-        # im Ergebnis von Teil 2 mit mindestens „ausreichend“
-        if ap2_overall_points is not None and ap2_overall_points < 50:
-            failure_reasons.append("AP2_OVERALL_BELOW_50_POINTS")
-
-        # in mindestens drei Prüfungsbereichen von Teil 2 mit mindestens „ausreichend“
-        if sum(1 for p in [ap2_planning_points, ap2_development_points, ap2_economy_points, ap2_pw_overall_points]
-               if p is not None and p < 50) > 1:
-            failure_reasons.append("TOO_MANY_COMPONENTS_BELOW_50_POINTS")
-
-        # in keinem Prüfungsbereich von Teil 2 mit „ungenügend“
-        if any(p is not None and p < 30 for p in
-               [ap2_planning_points, ap2_development_points, ap2_economy_points, ap2_pw_overall_points]):
-            failure_reasons.append("COMPONENT_BELOW_30_POINTS")
+    def calculateExamResults(self, finalExamResult: FinalExamResultInput) -> FinalExamResultOutput:
+        return FinalExamResultOutput.from_result_dict(self.calculateResultDict(scores_from_input(finalExamResult)))
+
+    # rechnet auf einfachen Punktwerten (Reihenfolge wie SCORE_COLUMNS, None = fehlt) und liefert das
+    # Ergebnis-Dict, aus dem FinalExamResultOutput gebaut wird
+    @CALCULATION_DURATION.timed(mode="single")
+    def calculateResultDict(self, scores: tuple) -> dict:
+        (ap1, planning_main, planning_extra, development_main, development_extra,
+         economy_main, economy_extra, pw_project, pw_presentation) = scores
+        ruleset = self.ruleset
+        ap2_pw_project_points = round(pw_project) if pw_project is not None else None
+        ap2_pw_presentation_points = round(pw_presentation) if pw_presentation is not None else None
+
+        # Reihenfolge wie im Ergebnis-Dict
+        points = {
+            "ap1": round(ap1) if ap1 is not None else None,
+            "ap2_planning": self._ap2_part_points(planning_main, planning_extra),
+            "ap2_development": self._ap2_part_points(development_main, development_extra),
+            "ap2_economy": self._ap2_part_points(economy_main, economy_extra),
+            "ap2_pw_project": ap2_pw_project_points,
+            "ap2_pw_presentation": ap2_pw_presentation_points,
+            "ap2_pw_overall": self._calculate_pw_overall(ap2_pw_project_points, ap2_pw_presentation_points),
+        }
+        points["ap2_overall"] = self._weighted_points(points, ruleset.ap2_weights)
+        points["Overall"] = self._weighted_points(points, ruleset.weights)
 
+        components = {key: {"points": pts, "grade": self._grade_from_points(pts)} for key, pts in points.items()}
 
-        passed = not failure_reasons
+        # eine Regel ist verletzt, wenn mehr als max_count ihrer Komponenten unter der Grenze liegen
+        failure_reasons = [
+            reason for reason, rule_components, below, max_count in ruleset.failure_rules
+            if sum(1 for key in rule_components if points[key] is not None and points[key] < below) > max_count
+        ]
 
-        components["Passed"] = passed
+        components["Passed"] = not failure_reasons
         components["FailureReasons"] = failure_reasons
 
-        return FinalExamResultOutput.from_result_dict(components)
+        return components
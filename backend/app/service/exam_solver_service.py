@@ -0,0 +1,60 @@
+from typing import List, Optional
+
+import numpy as np
+
+from backend.app.model.exam_solver_output import ExamSolverOutput, RequiredScores
+from backend.app.service.metrics_service import CALCULATION_DURATION
+from backend.app.service.vectorized_calculation_service import (
+    MISSING,
+    SCORE_COLUMNS,
+    VectorizedExamCalculationService,
+)
+
+# Ergänzungsprüfungen (extra) sind freiwillig und zählen nicht als ausstehend
+OUTSTANDING_COLUMNS = tuple(i for i, name in enumerate(SCORE_COLUMNS) if not name.endswith("_extra"))
+SOLVER_GRADES = (1, 2, 3, 4)
+POINTS = np.arange(101, dtype=np.int16)
+
+
+# Mindestpunkte für ausstehende Prüfungsteile. Sind alle Teile vorhanden, steigen Gesamtpunkte und
+# Bestehen monoton mit jedem einzelnen Punktwert (gewichtete Mittel, monotones Runden, Schwellen).
+# Statt des Gitters 101^k wird daher je Komponente nur eine Achse 0–100 vektorisiert berechnet;
+# die erreichten Werte bilden ein Suffix, die Mindestpunktzahl ergibt sich aus ihrer Anzahl.
+class ExamSolverService:
+    def __init__(self, calculation_service: Optional[VectorizedExamCalculationService] = None):
+        self.calculation_service = calculation_service or VectorizedExamCalculationService()
+
+    @staticmethod
+    def _minimum(reached: np.ndarray) -> Optional[int]:
+        count = int(reached.sum())
+        return len(reached) - count if count else None
+
+    def _required(self, passed: np.ndarray, grades: np.ndarray) -> RequiredScores:
+        return RequiredScores(
+            passed=self._minimum(passed),
+            grades={str(grade): self._minimum(passed & (grades <= grade)) for grade in SOLVER_GRADES},
+        )
+
+    # scores in der Reihenfolge von SCORE_COLUMNS, None = fehlt
+    @CALCULATION_DURATION.timed(mode="solve")
+    def solve(self, scores: tuple, assumed: int = 100) -> ExamSolverOutput:
+        outstanding: List[int] = [i for i in OUTSTANDING_COLUMNS if scores[i] is None]
+        output = ExamSolverOutput(outstanding=[SCORE_COLUMNS[i] for i in outstanding], assumed=assumed)
+        if not outstanding:
+            return output
+
+        base = np.array([MISSING if v is None else v for v in scores], dtype=np.int16)
+        base[outstanding] = assumed
+        # ein Block je ausstehender Komponente (nur sie durchläuft 0–100) und einer, in dem alle gemeinsam laufen
+        blocks = np.tile(base, (len(outstanding) + 1, len(POINTS), 1))
+        for block, column in enumerate(outstanding):
+            blocks[block, :, column] = POINTS
+        blocks[-1][:, outstanding] = POINTS[:, None]
+
+        result = self.calculation_service.calculateScoreColumns(blocks.reshape(-1, len(SCORE_COLUMNS)))
+        passed = result["Passed"].reshape(len(blocks), len(POINTS))
+        grades = result["Overall_grade"].reshape(len(blocks), len(POINTS))
+        output.components = {SCORE_COLUMNS[column]: self._required(passed[block], grades[block])
+                             for block, column in enumerate(outstanding)}
+        output.uniform = self._required(passed[-1], grades[-1])
+        return output
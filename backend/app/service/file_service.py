@@ -1,66 +1,355 @@
-import json
 import os
+import tempfile
+import threading
+import time
 import uuid
+from contextlib import contextmanager
 from json import JSONDecodeError
 
-class FileService:
-    def __init__(self, filepath: str):
+from backend.app.service.entry_table import EntryTable
+from backend.app.service import json_codec
+from backend.app.service.file_lock import FileLock
+from backend.app.service.metrics_service import STORAGE_LOAD_DURATION, STORAGE_SAVE_DURATION
+from backend.app.service.storage_repository import StorageRepository, format_entry_cursor, parse_entry_cursor
+
+ITER_BATCH_SIZE = 500
+
+class FileService(StorageRepository):
+    def __init__(self, filepath: str, journal: bool = False, compaction_threshold: int = 1000):
         self.filepath = filepath
+        # Im Journal-Modus werden Änderungen nur an die Journal-Datei angehängt
+        # und erst beim Kompaktieren in den Snapshot (filepath) übernommen.
+        self.journal = journal
+        self.journal_path = filepath + ".journal"
+        self.compaction_threshold = compaction_threshold
+        # _lock serialisiert Threads dieses Prozesses, _file_lock Schreiber aus anderen Prozessen
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(filepath + ".lock")
+        # geparster Inhalt als kompakte EntryTable, gültig solange sich die Dateien nicht ändern
+        self._cache = None
+        self._cache_stamp = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._journal_records = 0
+        # bis hierhin ist das Journal in den Cache übernommen (Byte-Offset)
+        self._journal_offset = 0
         dirpath = os.path.dirname(filepath)
         if dirpath and not os.path.exists(dirpath):
             os.makedirs(dirpath, exist_ok=True)
-        if not os.path.exists(filepath):
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump([], f)
+        with self._write_lock():
+            if not os.path.exists(filepath):
+                self._save([])
+            if journal:
+                self._truncate_torn_journal_tail()
+                self._journal_records = self._count_journal_records()
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock:
+            with self._file_lock:
+                before = self.version()
+                yield
+                self.last_write_versions = (before, self.version())
 
+    @STORAGE_LOAD_DURATION.timed(backend="json")
     def _load(self):
         try:
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(self.filepath, "rb") as f:
+                data = json_codec.loads(f.read())
         except (JSONDecodeError, ValueError):
-            with open(self.filepath, "w", encoding="utf-8") as f:
-                json.dump([], f)
-            return []
+            # beschädigte Datei zur Analyse aufheben statt sie zu überschreiben
+            os.replace(self.filepath, self.filepath + ".corrupt")
+            self._save([])
+            data = []
         except FileNotFoundError:
-            with open(self.filepath, "w", encoding="utf-8") as f:
-                json.dump([], f)
-            return []
+            self._save([])
+            data = []
+        return data
 
+    # schreibt erst in eine temporäre Datei und ersetzt dann atomar, damit ein
+    # Absturz während des Schreibens nie eine halbe storage.json hinterlässt
+    @STORAGE_SAVE_DURATION.timed(backend="json")
     def _save(self, data):
-        with open(self.filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        dirpath = os.path.dirname(self.filepath) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.filepath) + ".", suffix=".tmp", dir=dirpath)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json_codec.dumps(data, indent=True))
+                f.flush()
+                os.fsync(f.fileno())
+            self._replace(tmp_path, self.filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _replace(src: str, dst: str, attempts: int = 10):
+        # unter Windows schlägt os.replace fehl, solange ein Leser die Datei geöffnet hat
+        for attempt in range(attempts):
+            try:
+                os.replace(src, dst)
+                return
+            except PermissionError:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(0.05)
+
+    def _stamp(self):
+        stamp = []
+        for path in (self.filepath, self.journal_path) if self.journal else (self.filepath,):
+            try:
+                st = os.stat(path)
+                # st_ino ändert sich bei jedem os.replace, auch wenn mtime und Größe gleich bleiben
+                stamp.append((st.st_ino, st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    # Stand der Dateien, in allen Prozessen gleich; jeder Schreibzugriff ersetzt den Snapshot
+    # (neue Inode) oder verlängert das Journal
+    def version(self) -> str:
+        return ";".join("-" if st is None else "-".join(map(str, st)) for st in self._stamp())
+
+    # andere Prozesse haben seit dem letzten Abgleich nur ans Journal angehängt
+    def _journal_appended(self, stamp) -> bool:
+        if not self.journal or self._cache is None or self._cache_stamp is None:
+            return False
+        (snapshot, journal), (cached_snapshot, cached_journal) = stamp, self._cache_stamp
+        return (snapshot == cached_snapshot and journal is not None and cached_journal is not None
+                and journal[0] == cached_journal[0] and journal[2] >= self._journal_offset)
+
+    def _index(self):
+        with self._lock:
+            stamp = self._stamp()
+            if self._cache is not None and stamp == self._cache_stamp:
+                self.cache_hits += 1
+                return self._cache
+            self.cache_misses += 1
+            if self._journal_appended(stamp):
+                # nur die neuen Journal-Datensätze nachspielen statt die ganze Ablage neu zu laden
+                self._replay_journal(self._cache)
+            else:
+                table = EntryTable(self._load())
+                if self.journal:
+                    self._journal_offset = self._journal_records = 0
+                    self._replay_journal(table)
+                self._cache = table
+            self._cache_stamp = stamp
+            if self.journal and stamp[1] is not None:
+                # mit dem tatsächlich gelesenen Stand vergleichen; wurde inzwischen weiter angehängt
+                # oder ein Datensatz nur halb gelesen, wird beim nächsten Zugriff nachgeholt
+                self._cache_stamp = (stamp[0], stamp[1][:2] + (self._journal_offset,))
+            return self._cache
+
+    def _refresh_stamp(self):
+        self._cache_stamp = self._stamp()
+
+    def cache_stats(self):
+        with self._lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "entries": len(self._cache) if self._cache is not None else 0,
+            }
+
+    # liefert (Offset hinter dem Datensatz, Datensatz) für alle vollständigen Zeilen ab offset
+    def _read_journal(self, offset: int = 0):
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(offset)
+                content = f.read()
+        except FileNotFoundError:
+            return
+        for line in content.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                # wird gerade von einem anderen Prozess geschrieben
+                return
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                yield offset, json_codec.loads(line)
+            except (JSONDecodeError, ValueError):
+                # unvollständig geschriebener Datensatz (z.B. nach einem Absturz)
+                continue
+
+    # entfernt einen beim Absturz halb geschriebenen letzten Datensatz,
+    # damit neue Datensätze nicht an ihn angehängt werden
+    def _truncate_torn_journal_tail(self):
+        try:
+            with open(self.journal_path, "rb+") as f:
+                content = f.read()
+                if content and not content.endswith(b"\n"):
+                    f.truncate(content.rfind(b"\n") + 1)
+        except FileNotFoundError:
+            return
+
+    def _count_journal_records(self):
+        return sum(1 for _ in self._read_journal())
+
+    # spielt die Journal-Datensätze ab _journal_offset in die Tabelle ein
+    def _replay_journal(self, table: EntryTable):
+        for offset, record in self._read_journal(self._journal_offset):
+            self._journal_offset = offset
+            # andere Prozesse können ebenfalls ins Journal geschrieben haben
+            self._journal_records += 1
+            op = record.get("op")
+            if op == "save":
+                table.put(record["entry"])
+            elif op == "save_many":
+                for entry in record["entries"]:
+                    table.put(entry)
+            elif op == "update":
+                if record["id"] in table:
+                    table.put(record["entry"])
+            elif op == "update_many":
+                for entry in record["entries"]:
+                    if entry["id"] in table:
+                        table.put(entry)
+            elif op == "delete":
+                table.delete(record["id"])
+
+    @STORAGE_SAVE_DURATION.timed(backend="json-journal")
+    def _append_journal(self, record: dict):
+        with open(self.journal_path, "ab") as f:
+            f.write(json_codec.dumps(record) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            # unter der Dateisperre: alles davor ist bereits im Cache
+            self._journal_offset = f.tell()
+        self._journal_records += 1
+
+    # schreibt eine Änderung am Cache auf die Platte: im Journal-Modus als
+    # angehängter Datensatz, sonst als kompletter Snapshot
+    def _persist(self, record: dict):
+        try:
+            if self.journal:
+                self._append_journal(record)
+            else:
+                self._save(list(self._cache.entries()))
+        except BaseException:
+            # Cache wurde schon geändert, die Datei aber nicht: beim nächsten Zugriff neu laden
+            self._cache = None
+            raise
+        self._refresh_stamp()
+        if self.journal and self._journal_records >= self.compaction_threshold:
+            self._compact()
+
+    # schreibt den aktuellen Stand als Snapshot und leert das Journal
+    def compact(self):
+        if not self.journal:
+            return
+        with self._write_lock():
+            self._compact()
+
+    def _compact(self):
+        data = list(self._index().entries())
+        self._save(data)
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self._journal_records = self._journal_offset = 0
+        self._refresh_stamp()
 
     def save(self, entry: dict):
-        data = self._load()
         entry["id"] = str(uuid.uuid4())
-        data.append(entry)
-        self._save(data)
+        with self._write_lock():
+            self._index().put(entry)
+            self._persist({"op": "save", "entry": entry})
         return entry
 
+    # ein einziger Schreibvorgang (Snapshot bzw. fsync) für alle Einträge
+    def save_many(self, entries):
+        for entry in entries:
+            entry["id"] = str(uuid.uuid4())
+        if not entries:
+            return entries
+        with self._write_lock():
+            index = self._index()
+            for entry in entries:
+                index.put(entry)
+            # ein Journal-Datensatz für alle Einträge: ein abgerissener Datensatz verwirft den ganzen Import
+            self._persist({"op": "save_many", "entries": entries})
+        return entries
+
     def load_all(self):
-        return self._load()
+        with self._lock:
+            return list(self._index().entries())
 
     def get_by_id(self, entry_id: str):
-        data = self._load()
-        for item in data:
-            if item.get("id") == entry_id:
-                return item
-        return None
+        with self._lock:
+            return self._index().get(entry_id)
+
+    def get_by_ids(self, entry_ids):
+        with self._lock:
+            index = self._index()
+            return {entry_id: index.get(entry_id) for entry_id in entry_ids if entry_id in index}
+
+    # Dicts werden blockweise unter der Sperre gebaut, nicht für die ganze Ablage auf einmal.
+    # Cursor ist wie in der Standardimplementierung die Position in load_all()
+    def parse_cursor(self, cursor):
+        return parse_entry_cursor(cursor)
+
+    # Cursor "<Position>:<id>" (siehe format_entry_cursor): Positionen verschieben sich, wenn davor
+    # Einträge gelöscht werden, die Seite setzt daher hinter dem zuletzt gelieferten Eintrag fort
+    def iter_entries(self, name_prefix=None, cursor=None):
+        position, last_id = parse_entry_cursor(cursor)
+        table = layout = None
+        row = 0
+        while True:
+            with self._lock:
+                index = self._index()
+                if index is not table or index.layout != layout:
+                    # erster Durchlauf, neu geladen oder umgebaut: hinter dem zuletzt gelesenen Eintrag
+                    # fortsetzen, falls es ihn nicht mehr gibt, an derselben Position
+                    last_row = index.row_of(last_id) if last_id is not None else None
+                    row = last_row + 1 if last_row is not None else index.row_of_position(position)
+                    table, layout = index, index.layout
+                rows = index.live_rows(row, ITER_BATCH_SIZE)
+                if not rows:
+                    return
+                batch = [index.entry(r) if name_prefix is None or (index.name(r) or "").startswith(name_prefix)
+                         else None for r in rows]
+                row = rows[-1] + 1
+                last_id = index.entry_id(rows[-1])
+                ids = [index.entry_id(r) for r in rows]
+            for entry_id, entry in zip(ids, batch):
+                position += 1
+                if entry is not None:
+                    yield format_entry_cursor(position, entry_id), entry
+
+    def count(self):
+        with self._lock:
+            return len(self._index())
+
+    # ein einziger Schreibvorgang für alle Einträge, die sich seit dem Lesen nicht geändert haben
+    def replace_many(self, replacements):
+        with self._write_lock():
+            index = self._index()
+            replaced = []
+            for old, new in replacements:
+                if index.get(old["id"]) == old:
+                    new["id"] = old["id"]
+                    index.put(new)
+                    replaced.append(new)
+            if replaced:
+                self._persist({"op": "update_many", "entries": replaced})
+        return len(replaced)
 
     def delete_by_id(self, entry_id: str):
-        data = self._load()
-        new_data = [item for item in data if item.get("id") != entry_id]
-        if len(new_data) == len(data):
-            return False
-        self._save(new_data)
+        with self._write_lock():
+            index = self._index()
+            if not index.delete(entry_id):
+                return False
+            self._persist({"op": "delete", "id": entry_id})
         return True
 
     def update_by_id(self, entry_id: str, new_entry: dict):
-        data = self._load()
-        for i, item in enumerate(data):
-            if item.get("id") == entry_id:
-                new_entry["id"] = entry_id
-                data[i] = new_entry
-                self._save(data)
-                return new_entry
-        return None
+        with self._write_lock():
+            index = self._index()
+            if entry_id not in index:
+                return None
+            new_entry["id"] = entry_id
+            index.put(new_entry)
+            self._persist({"op": "update", "id": entry_id, "entry": new_entry})
+        return new_entry
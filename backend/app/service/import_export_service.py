@@ -0,0 +1,244 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.model.final_exam_result_output import FinalExamResultOutput
+from backend.app.model.import_output import ImportOutput, ImportRowError
+from backend.app.service import json_codec
+from backend.app.service.result_cache_service import public_entry, strip_metadata
+from backend.app.service.vectorized_calculation_service import (
+    AP2_SCORE_FIELDS,
+    POINT_COMPONENTS,
+    SCORE_COLUMNS,
+    VectorizedExamCalculationService,
+)
+
+IMPORT_FORMATS = ("csv", "ndjson", "xlsx")
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+# weitere übliche Content-Types, die beim Import erkannt werden
+CONTENT_TYPE_ALIASES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json-lines": "ndjson",
+    CONTENT_TYPES["xlsx"]: "xlsx",
+}
+
+# flache Spalten für CSV/XLSX, die Score-Spalten entsprechen der Score-Matrix
+FLAT_COLUMNS = ("name",) + SCORE_COLUMNS
+# (Teil, Feld) je Score-Spalte unterhalb von ap2
+AP2_COLUMNS = dict(zip(SCORE_COLUMNS[1:], AP2_SCORE_FIELDS))
+RESULT_COLUMNS = tuple(f"{key.lower()}_{kind}" for key in POINT_COMPONENTS for kind in ("points", "grade")) + (
+    "passed", "failure_reasons")
+# Spalten des Exports, die beim erneuten Import ignoriert werden
+IGNORED_COLUMNS = ("id",) + RESULT_COLUMNS
+
+VALIDATION_CHUNK_SIZE = 1000
+EXPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def format_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    if not content_type:
+        return None
+    return CONTENT_TYPE_ALIASES.get(content_type.split(";")[0].strip().lower())
+
+
+def _cell(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def unflatten(row: dict) -> dict:
+    ap2 = {}
+    for column, (part, field) in AP2_COLUMNS.items():
+        value = _cell(row.get(column))
+        if value is not None:
+            ap2.setdefault(part, {})[field] = value
+    data = {"name": _cell(row.get("name")), "ap1": _cell(row.get("ap1")), "ap2": ap2 or None}
+    if isinstance(data["name"], (int, float)):
+        data["name"] = str(data["name"])
+    return data
+
+
+def flatten(entry: dict) -> dict:
+    ap2 = entry.get("ap2") or {}
+    row = {"name": entry.get("name"), "ap1": entry.get("ap1")}
+    for column, (part, field) in AP2_COLUMNS.items():
+        row[column] = (ap2.get(part) or {}).get(field)
+    return row
+
+
+def _header(cells) -> List[str]:
+    header = [str(cell).strip().lower() if cell is not None else "" for cell in cells]
+    unknown = [column for column in header if column and column not in FLAT_COLUMNS + IGNORED_COLUMNS]
+    if unknown:
+        raise ImportFormatError(f"Unknown column(s) {unknown}, expected {list(FLAT_COLUMNS)}")
+    if not any(column in FLAT_COLUMNS for column in header):
+        raise ImportFormatError(f"Missing header row, expected columns {list(FLAT_COLUMNS)}")
+    return header
+
+
+def _text(stream: BinaryIO) -> io.TextIOWrapper:
+    # utf-8-sig entfernt das BOM, das Excel beim CSV-Export voranstellt
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+
+def read_csv(stream: BinaryIO) -> Iterator[Tuple[int, object]]:
+    text = _text(stream)
+    first_line = text.readline()
+    if not first_line.strip():
+        return
+    try:
+        # deutsches Excel trennt mit Semikolon
+        dialect = csv.Sniffer().sniff(first_line, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    header = _header(next(csv.reader([first_line], dialect)))
+    reader = csv.reader(text, dialect)
+    for row_number, cells in enumerate(reader, 2):
+        if not any(cell.strip() for cell in cells):
+            continue
+        if len(cells) > len(header):
+            yield row_number, f"Row has {len(cells)} columns, header has {len(header)}"
+            continue
+        yield row_number, unflatten(dict(zip(header, cells)))
+
+
+def read_ndjson(stream: BinaryIO) -> Iterator[Tuple[int, object]]:
+    for row_number, line in enumerate(_text(stream), 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield row_number, f"Invalid JSON: {e}"
+            continue
+        # Einträge aus dem NDJSON-Export bringen id und Ergebnis mit, gespeichert wird mit neuer id
+        yield row_number, strip_metadata(data) if isinstance(data, dict) else "Expected a JSON object"
+
+
+def read_xlsx(stream: BinaryIO) -> Iterator[Tuple[int, object]]:
+    # openpyxl wird nur für Excel-Dateien benötigt und deshalb erst hier geladen
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFormatError(f"Invalid XLSX file: {e}")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        first = next(rows, None)
+        if first is None:
+            return
+        header = _header(first)
+        for row_number, cells in enumerate(rows, 2):
+            if all(_cell(cell) is None for cell in cells):
+                continue
+            yield row_number, unflatten(dict(zip(header, cells)))
+    finally:
+        workbook.close()
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson, "xlsx": read_xlsx}
+
+
+class ImportExportService:
+    def __init__(self, calculation_service: Optional[VectorizedExamCalculationService] = None):
+        self.calculation_service = calculation_service or VectorizedExamCalculationService()
+
+    @staticmethod
+    def _validate_chunk(chunk, output: ImportOutput, valid: List[FinalExamResultInput]):
+        for row_number, data in chunk:
+            output.total += 1
+            error = data if isinstance(data, str) else None
+            if error is None:
+                try:
+                    valid.append(FinalExamResultInput.model_validate(data))
+                    continue
+                except ValidationError as e:
+                    error = "; ".join(
+                        f"{'.'.join(str(loc) for loc in err['loc']) or 'row'}: {err['msg']}" for err in e.errors())
+            output.failed += 1
+            if len(output.errors) < MAX_REPORTED_ERRORS:
+                output.errors.append(ImportRowError(row=row_number, error=error))
+
+    # liest und validiert die Datei blockweise; gespeichert wird danach in einem Schritt
+    def read_file(self, fmt: str, stream: BinaryIO) -> Tuple[ImportOutput, List[FinalExamResultInput]]:
+        if fmt not in READERS:
+            raise ImportFormatError(f"Unsupported import format '{fmt}', expected one of {list(IMPORT_FORMATS)}")
+        output = ImportOutput()
+        valid: List[FinalExamResultInput] = []
+        rows = READERS[fmt](stream)
+        while True:
+            chunk = list(islice(rows, VALIDATION_CHUNK_SIZE))
+            if not chunk:
+                break
+            self._validate_chunk(chunk, output, valid)
+        return output, valid
+
+    @staticmethod
+    def _flat_result(result: Optional[dict]) -> dict:
+        if result is None:
+            return {column: None for column in RESULT_COLUMNS}
+        row = {}
+        for key in POINT_COMPONENTS:
+            row[f"{key.lower()}_points"] = result[key]["points"]
+            row[f"{key.lower()}_grade"] = result[key]["grade"]
+        row["passed"] = result["Passed"]
+        # FailureReasons steht bereits in der Reihenfolge der Regeln des Regelwerks
+        row["failure_reasons"] = " ".join(result["FailureReasons"])
+        return row
+
+    def export_rows(self, entries: List[dict]) -> Iterator[dict]:
+        for entry, result in zip(entries, self.calculation_service.calculateEntryResults(entries)):
+            yield {"id": entry.get("id"), **flatten(entry), **self._flat_result(result)}
+
+    @staticmethod
+    def export_columns() -> Tuple[str, ...]:
+        return ("id",) + FLAT_COLUMNS + RESULT_COLUMNS
+
+    def csv_chunk(self, entries: List[dict], header: bool) -> str:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.export_columns(), lineterminator="\n")
+        if header:
+            writer.writeheader()
+        writer.writerows(self.export_rows(entries))
+        return buffer.getvalue()
+
+    # Ergebnis in der Form von /exam/calculate/{id} (FinalExamResultOutput), None für ungültige Einträge
+    def ndjson_chunk(self, entries: List[dict]) -> bytes:
+        return b"".join(
+            json_codec.dumps({**public_entry(entry),
+                              "result": FinalExamResultOutput.dump_result_dict(result) if result is not None else None}) + b"\n"
+            for entry, result in zip(entries, self.calculation_service.calculateEntryResults(entries)))
+
+    def xlsx_workbook(self, chunks: Iterable[List[dict]], stream: BinaryIO):
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("results")
+        columns = self.export_columns()
+        sheet.append(columns)
+        for entries in chunks:
+            for row in self.export_rows(entries):
+                sheet.append([row[column] for column in columns])
+        workbook.save(stream)
+
@@ -0,0 +1,29 @@
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# BACKEND_FAST_JSON=1 kodiert Antworten und die JSON-Ablage mit orjson, sofern installiert;
+# ohne orjson bleibt es beim json-Modul der Standardbibliothek
+fast = os.getenv("BACKEND_FAST_JSON") == "1" and orjson is not None
+
+
+# kompakt wie JSONResponse und das Journal, mit indent wie storage.json (orjson kennt nur 2 Leerzeichen)
+def dumps(data, indent: bool = False, default=None) -> bytes:
+    if fast:
+        try:
+            return orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # z.B. Ganzzahlen über 64 Bit oder Schlüssel, die keine Strings sind: wie ohne orjson
+            pass
+    if indent:
+        return json.dumps(data, indent=4, ensure_ascii=False, default=default).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+
+# str oder bytes; Fehler sind in beiden Fällen json.JSONDecodeError
+def loads(data):
+    return orjson.loads(data) if fast else json.loads(data)
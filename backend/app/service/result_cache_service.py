@@ -0,0 +1,74 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# Felder, die die Ablage selbst an einem Eintrag pflegt und die nicht zur Eingabe gehören
+STORAGE_METADATA_KEYS = ("id", "result", "result_key", "validated")
+
+
+def strip_metadata(entry: dict) -> dict:
+    return {key: value for key, value in entry.items() if key not in STORAGE_METADATA_KEYS}
+
+
+# Felder, die nur die Ablage und die Berechnung auswerten und nicht über die API ausgeliefert werden
+INTERNAL_KEYS = ("result_key", "validated")
+
+
+# Eintrag, wie er über HTTP ausgeliefert wird; result nur, wenn gespeicherte Ergebnisse angefordert sind
+def public_entry(entry: dict, with_result: bool = False) -> dict:
+    hidden = INTERNAL_KEYS if with_result else INTERNAL_KEYS + ("result",)
+    if not any(key in entry for key in hidden):
+        return entry
+    return {key: value for key, value in entry.items() if key not in hidden}
+
+
+# stabiler Inhalts-Hash der Eingabe, unabhängig von id und gespeichertem Ergebnis
+def input_key(entry: dict) -> str:
+    payload = json.dumps(strip_metadata(entry), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Schlüssel eines berechneten Ergebnisses: dieselbe Eingabe ergibt unter einem anderen
+# Regelwerk (oder einer neuen Version davon) ein anderes Ergebnis
+def result_key(entry: dict, ruleset_key: str) -> str:
+    return f"{ruleset_key}:{input_key(entry)}"
+
+
+class ResultCacheService:
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, entry_id: str, key: str) -> Optional[object]:
+        with self._lock:
+            cached = self._results.get(entry_id)
+            if cached is None or cached[0] != key:
+                self.misses += 1
+                return None
+            self._results.move_to_end(entry_id)
+            self.hits += 1
+            return cached[1]
+
+    def put(self, entry_id: str, key: str, result):
+        with self._lock:
+            self._results[entry_id] = (key, result)
+            self._results.move_to_end(entry_id)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def invalidate(self, entry_id: str):
+        with self._lock:
+            self._results.pop(entry_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._results)}
@@ -0,0 +1,135 @@
+import glob
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend.app.model.grading_ruleset import RULESET_COMPONENTS, Blend, GradingRuleset
+
+RULESETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rulesets")
+DEFAULT_RULESET = "ao2020"
+
+# Komponenten, die aus den Eingaben berechnet und gewichtet werden können (alles außer Overall)
+WEIGHT_COMPONENTS = RULESET_COMPONENTS[:-1]
+# ap2_overall wird selbst aus den AP2-Gewichten gebildet
+AP2_WEIGHT_COMPONENTS = ("ap2_planning", "ap2_development", "ap2_economy",
+                         "ap2_pw_project", "ap2_pw_presentation", "ap2_pw_overall")
+
+
+def _blend_table(blend: Blend) -> tuple:
+    # gleiche Rechenreihenfolge wie die vektorisierte Berechnung, damit die Rundung identisch ist
+    return tuple(round(blend.first * float(first) + blend.second * float(second))
+                 for first in range(101) for second in range(101))
+
+
+def _weights(weights: Dict[str, float], allowed: tuple, name: str) -> tuple:
+    unknown = sorted(set(weights) - set(allowed))
+    if unknown:
+        raise ValueError(f"{name} contains unknown components {unknown}, expected some of {list(allowed)}")
+    if any(w < 0 for w in weights.values()) or not any(w > 0 for w in weights.values()):
+        raise ValueError(f"{name} must be non-negative with at least one positive weight")
+    # feste Reihenfolge wie im Ergebnis-Dict, damit die Summen in beiden Berechnungen gleich gebildet
+    # werden; Gewicht 0 ändert keine Summe und entfällt
+    return tuple((key, weights[key]) for key in allowed if weights.get(key, 0.0) > 0)
+
+
+# einmal beim Laden aus einem GradingRuleset gebaut: Nachschlagetabellen für alle Punktwerte
+# 0–100 (bzw. alle 101×101 Paare), Gewichte in Berechnungsreihenfolge und die Bestehensregeln
+# als Tupel. Die Rechnungen lesen nur noch diese Felder und interpretieren die Definition nicht
+class CompiledRuleset:
+    __slots__ = ("id", "version", "key", "definition", "grade_table", "grade_thresholds",
+                 "ap2_part_blend", "ap2_part_table", "pw_blend", "pw_overall_table",
+                 "weights", "ap2_weights", "failure_rules", "failure_reasons")
+
+    def __init__(self, definition: GradingRuleset):
+        thresholds = definition.grade_thresholds
+        if any(upper <= lower for upper, lower in zip(thresholds, thresholds[1:])):
+            raise ValueError(f"Ruleset '{definition.id}': grade_thresholds must be strictly descending")
+        for name, blend in (("ap2_part_blend", definition.ap2_part_blend), ("pw_blend", definition.pw_blend)):
+            # Mischwerte bleiben so im Bereich 0–100 und steigen mit beiden Punktwerten (ExamSolverService)
+            if blend.first < 0 or blend.second < 0 or abs(blend.first + blend.second - 1.0) > 1e-9:
+                raise ValueError(f"Ruleset '{definition.id}': {name} must be non-negative and add up to 1")
+        for rule in definition.failure_rules:
+            unknown = sorted(set(rule.components) - set(RULESET_COMPONENTS))
+            if unknown:
+                raise ValueError(f"Ruleset '{definition.id}': rule {rule.reason} uses unknown components {unknown}")
+        reasons = [rule.reason for rule in definition.failure_rules]
+        if len(set(reasons)) != len(reasons):
+            raise ValueError(f"Ruleset '{definition.id}': failure reasons must be unique")
+
+        self.id = definition.id
+        self.version = definition.version
+        # landet in result_key und ETag, damit Ergebnisse anderer Regeln nicht wiederverwendet werden
+        self.key = f"{definition.id}@{definition.version}"
+        self.definition = definition
+        self.weights = _weights(definition.weights, WEIGHT_COMPONENTS, f"Ruleset '{definition.id}': weights")
+        self.ap2_weights = _weights(definition.ap2_weights, AP2_WEIGHT_COMPONENTS,
+                                    f"Ruleset '{definition.id}': ap2_weights")
+        # Note = 1 + Zahl der Grenzen oberhalb der Punkte
+        self.grade_table = tuple(1 + sum(1 for t in thresholds if p < t) for p in range(101))
+        # Untergrenzen der Noten 5, 4, 3, 2, 1 (aufsteigend für np.searchsorted)
+        self.grade_thresholds = np.array(sorted(thresholds))
+        self.ap2_part_blend = (definition.ap2_part_blend.first, definition.ap2_part_blend.second)
+        # Index main * 101 + extra
+        self.ap2_part_table = _blend_table(definition.ap2_part_blend)
+        self.pw_blend = (definition.pw_blend.first, definition.pw_blend.second)
+        # Index project * 101 + presentation
+        self.pw_overall_table = _blend_table(definition.pw_blend)
+        # (Grund, Komponenten, Grenze, erlaubte Anzahl darunter)
+        self.failure_rules = tuple((rule.reason, tuple(rule.components), rule.below, rule.max_count)
+                                   for rule in definition.failure_rules)
+        self.failure_reasons = tuple(reasons)
+
+
+# lädt die Regelwerke (*.json) aus dem mitgelieferten Verzeichnis und optional aus
+# BACKEND_RULESETS_DIR; jedes Regelwerk wird beim ersten Zugriff einmal übersetzt und
+# danach je id wiederverwendet
+class RulesetService:
+    def __init__(self, directories: Optional[List[str]] = None, default_id: Optional[str] = None):
+        if directories is None:
+            directories = [RULESETS_DIR]
+            if os.getenv("BACKEND_RULESETS_DIR"):
+                directories.append(os.getenv("BACKEND_RULESETS_DIR"))
+        self.directories = directories
+        self.default_id = default_id or os.getenv("BACKEND_RULESET", DEFAULT_RULESET)
+        self._definitions: Optional[Dict[str, GradingRuleset]] = None
+        self._compiled: Dict[str, CompiledRuleset] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, GradingRuleset]:
+        definitions = {}
+        for directory in self.directories:
+            for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+                with open(path, "r", encoding="utf-8") as f:
+                    definition = GradingRuleset.model_validate(json.load(f))
+                # spätere Verzeichnisse ersetzen mitgelieferte Regelwerke gleicher id
+                definitions[definition.id] = definition
+        return definitions
+
+    def definitions(self) -> Dict[str, GradingRuleset]:
+        if self._definitions is None:
+            with self._lock:
+                if self._definitions is None:
+                    self._definitions = self._load()
+        return self._definitions
+
+    def ids(self) -> List[str]:
+        return sorted(self.definitions())
+
+    def get(self, ruleset_id: Optional[str] = None) -> CompiledRuleset:
+        ruleset_id = ruleset_id or self.default_id
+        compiled = self._compiled.get(ruleset_id)
+        if compiled is None:
+            definitions = self.definitions()
+            if ruleset_id not in definitions:
+                raise ValueError(f"Unknown ruleset '{ruleset_id}', expected one of {sorted(definitions)}")
+            with self._lock:
+                compiled = self._compiled.get(ruleset_id)
+                if compiled is None:
+                    compiled = self._compiled[ruleset_id] = CompiledRuleset(definitions[ruleset_id])
+        return compiled
+
+
+rulesets = RulesetService()
@@ -0,0 +1,244 @@
+import threading
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.app.service.vectorized_calculation_service import VectorizedExamCalculationService
+
+WARM_UP_BATCH_SIZE = 5000
+INITIAL_CAPACITY = 1024
+# ab so vielen gelöschten Plätzen (und mehr als der Hälfte) werden die Plätze neu vergeben
+COMPACTION_MIN_DELETED = 1024
+# Status je Platz
+STATUS_INVALID = -1
+STATUS_FAILED = 0
+STATUS_PASSED = 1
+
+
+def normalize_name(name) -> str:
+    return name.casefold() if isinstance(name, str) else ""
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# mit Rand-Markierungen, damit auch kurze Namen Trigramme haben und jede Zeichenfolge
+# aus ein oder zwei Zeichen in einem Trigramm des Namens vorkommt
+def name_trigrams(name: str) -> Set[str]:
+    return trigrams(f"\x02{name}\x03")
+
+
+# Sekundärindizes über die gespeicherten Einträge: Namen (sortiert für Präfixe, Trigramme für
+# Teilstrings) sowie Bestanden-Status, Gesamtnote und Fehlergründe nach dem konfigurierten Regelwerk.
+# Jeder Eintrag belegt einen Platz; Status, Note und Gründe (Bitmaske) liegen als numpy-Spalten
+# je Platz vor, sodass sich Filter als wenige Vektoroperationen über alle Plätze kombinieren lassen.
+# Fortschreiben und Invalidieren bei Schreibzugriffen anderer Prozesse wie in StatsService.
+class SearchIndexService:
+    def __init__(self, calculation_service: Optional[VectorizedExamCalculationService] = None):
+        self.calculation_service = calculation_service or VectorizedExamCalculationService()
+        self.failure_reasons = self.calculation_service.ruleset.failure_reasons
+        if len(self.failure_reasons) > 64:
+            raise ValueError("The search index supports at most 64 failure reasons")
+        self._lock = threading.RLock()
+        self._warm = False
+        # Stand der Ablage, zu dem die Indizes passen (None: unbekannt)
+        self._version = None
+        self._reset()
+
+    def _reset(self, capacity: int = INITIAL_CAPACITY):
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._names: List[str] = []
+        # (normalisierter Name, Platz), sortiert
+        self._sorted_names: List[Tuple[str, int]] = []
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._status = np.zeros(capacity, dtype=np.int8)
+        self._grade = np.zeros(capacity, dtype=np.int8)
+        self._reasons = np.zeros(capacity, dtype=np.uint64)
+        self._deleted = 0
+
+    def _grow(self):
+        capacity = 2 * len(self._alive)
+        for name in ("_alive", "_status", "_grade", "_reasons"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def _add_name(self, slot: int, name: str):
+        self._names[slot] = name
+        insort(self._sorted_names, (name, slot))
+        for trigram in name_trigrams(name):
+            self._trigrams.setdefault(trigram, set()).add(slot)
+
+    def _remove_name(self, slot: int):
+        name = self._names[slot]
+        position = bisect_left(self._sorted_names, (name, slot))
+        del self._sorted_names[position]
+        for trigram in name_trigrams(name):
+            slots = self._trigrams[trigram]
+            slots.discard(slot)
+            if not slots:
+                del self._trigrams[trigram]
+
+    def _set(self, entry_id: str, name: str, status: int, grade: int, reasons: int):
+        slot = self._slots.get(entry_id)
+        if slot is None:
+            slot = len(self._ids)
+            if slot == len(self._alive):
+                self._grow()
+            self._slots[entry_id] = slot
+            self._ids.append(entry_id)
+            self._names.append(name)
+            self._add_name(slot, name)
+            self._alive[slot] = True
+        elif self._names[slot] != name:
+            self._remove_name(slot)
+            self._add_name(slot, name)
+        self._status[slot] = status
+        self._grade[slot] = grade
+        self._reasons[slot] = reasons
+
+    def _upsert(self, entries: List[dict]):
+        for entry, result in zip(entries, self.calculation_service.calculateEntryResults(entries)):
+            name = normalize_name(entry.get("name"))
+            if result is None:
+                self._set(entry.get("id"), name, STATUS_INVALID, 0, 0)
+                continue
+            reasons = 0
+            for i, reason in enumerate(self.failure_reasons):
+                if reason in result["FailureReasons"]:
+                    reasons |= 1 << i
+            status = STATUS_PASSED if result["Passed"] else STATUS_FAILED
+            self._set(entry.get("id"), name, status, result["Overall"]["grade"] or 0, reasons)
+
+    def _remove(self, entry_id: str):
+        slot = self._slots.pop(entry_id, None)
+        if slot is None:
+            return
+        self._remove_name(slot)
+        self._ids[slot] = None
+        self._alive[slot] = False
+        self._deleted += 1
+        if self._deleted >= COMPACTION_MIN_DELETED and self._deleted * 2 > len(self._ids):
+            self._compact()
+
+    # vergibt die Plätze lückenlos neu, ohne die Einträge neu zu berechnen
+    def _compact(self):
+        live = np.flatnonzero(self._alive[:len(self._ids)])
+        ids, names = self._ids, self._names
+        status, grade, reasons = self._status[live], self._grade[live], self._reasons[live]
+        self._reset(max(INITIAL_CAPACITY, 2 * len(live)))
+        for slot, old in enumerate(live.tolist()):
+            self._slots[ids[old]] = slot
+            self._ids.append(ids[old])
+            self._names.append(names[old])
+            self._add_name(slot, names[old])
+        self._alive[:len(live)] = True
+        self._status[:len(live)] = status
+        self._grade[:len(live)] = grade
+        self._reasons[:len(live)] = reasons
+
+    # versions: (Stand vor, Stand nach) des eigenen Schreibzugriffs, siehe StatsService
+    def _follow(self, versions: Optional[Tuple[str, str]]) -> bool:
+        if versions is None or self._version is None:
+            return True
+        before, after = versions
+        if before != self._version:
+            self.invalidate()
+            return False
+        self._version = after
+        return True
+
+    def upsert(self, entries: List[dict], versions: Optional[Tuple[str, str]] = None):
+        with self._lock:
+            if self._warm and self._follow(versions):
+                self._upsert(entries)
+
+    def remove(self, entry_id: str, versions: Optional[Tuple[str, str]] = None):
+        with self._lock:
+            if self._warm and self._follow(versions):
+                self._remove(entry_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._warm = False
+            self._version = None
+            self._reset()
+
+    def warm_up(self, entries: Iterable[dict], version: Optional[str] = None):
+        with self._lock:
+            if self._warm:
+                return
+            self._reset()
+            self._version = version
+            batch = []
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) >= WARM_UP_BATCH_SIZE:
+                    self._upsert(batch)
+                    batch = []
+            self._upsert(batch)
+            self._warm = True
+
+    # Plätze, deren Name zu den Namensfiltern passt, None ohne Namensfilter
+    def _name_slots(self, query: Optional[str], name_prefix: Optional[str]) -> Optional[Iterable[int]]:
+        slots = None
+        if name_prefix is not None:
+            prefix = normalize_name(name_prefix)
+            # alle Namen mit dem Präfix liegen in der sortierten Liste zusammenhängend
+            start = bisect_left(self._sorted_names, (prefix,))
+            stop = bisect_left(self._sorted_names, (prefix + "\U0010ffff",))
+            slots = [slot for _, slot in self._sorted_names[start:stop]]
+        if query is not None:
+            query = normalize_name(query)
+            if len(query) < 3:
+                # zu kurz für eigene Trigramme: alle Trigramme, die die Zeichenfolge enthalten
+                matches = set().union(*(postings for trigram, postings in self._trigrams.items() if query in trigram))
+                if slots is not None:
+                    matches.intersection_update(slots)
+            else:
+                postings = sorted((self._trigrams.get(trigram, set()) for trigram in trigrams(query)), key=len)
+                candidates = set.intersection(*postings)
+                if slots is not None:
+                    candidates.intersection_update(slots)
+                # Trigramme sagen nichts über ihre Reihenfolge, daher am Namen bestätigen
+                matches = [slot for slot in candidates if query in self._names[slot]]
+            slots = matches
+        return slots
+
+    # liefert (Zahl der Treffer, ids der Treffer ab offset) in der Reihenfolge der Plätze
+    def _search(self, query: Optional[str] = None, name_prefix: Optional[str] = None,
+                passed: Optional[bool] = None, grade: Optional[int] = None, reason: Optional[str] = None,
+                offset: int = 0, limit: int = 100) -> Tuple[int, List[str]]:
+        count = len(self._ids)
+        mask = self._alive[:count].copy()
+        slots = self._name_slots(query, name_prefix)
+        if slots is not None:
+            selected = np.zeros(count, dtype=bool)
+            selected[np.fromiter(slots, dtype=np.int64, count=len(slots))] = True
+            mask &= selected
+        if passed is not None:
+            mask &= self._status[:count] == (STATUS_PASSED if passed else STATUS_FAILED)
+        if grade is not None:
+            mask &= self._grade[:count] == grade
+        if reason is not None:
+            if reason not in self.failure_reasons:
+                raise ValueError(f"Unknown failure reason '{reason}', expected one of {list(self.failure_reasons)}")
+            bit = np.uint64(1 << self.failure_reasons.index(reason))
+            mask &= (self._reasons[:count] & bit) != 0
+        matches = np.flatnonzero(mask)
+        return len(matches), [self._ids[slot] for slot in matches[offset:offset + limit].tolist()]
+
+    def search(self, load_entries: Callable[[], Iterable[dict]], version: Optional[str] = None,
+               **filters) -> Tuple[int, List[str]]:
+        with self._lock:
+            if self._warm and version is not None and version != self._version:
+                # ein anderer Prozess hat die Ablage geändert
+                self.invalidate()
+            if not self._warm:
+                self.warm_up(load_entries(), version)
+            return self._search(**filters)
@@ -0,0 +1,164 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+# SQLite erlaubt standardmäßig höchstens 999 Parameter pro Statement
+MAX_QUERY_PARAMETERS = 900
+ITER_BATCH_SIZE = 500
+
+from backend.app.service.metrics_service import STORAGE_LOAD_DURATION, STORAGE_SAVE_DURATION
+from backend.app.service.storage_repository import StorageRepository, parse_position_cursor
+
+
+class SqliteService(StorageRepository):
+    def __init__(self, filepath: str, name_index: bool = True):
+        self.filepath = filepath
+        dirpath = os.path.dirname(filepath)
+        if dirpath and not os.path.exists(dirpath):
+            os.makedirs(dirpath, exist_ok=True)
+        # sqlite3-Verbindungen dürfen nicht zwischen Threads geteilt werden
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "id TEXT PRIMARY KEY, "
+                "name TEXT, "
+                "data TEXT NOT NULL)"
+            )
+            if name_index:
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_name ON entries(name)")
+            # Änderungszähler, wird in derselben Transaktion wie jede Änderung erhöht
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.filepath, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def version(self) -> str:
+        return str(self._connection().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0])
+
+    # innerhalb der Schreibtransaktion, andere Schreiber warten bis zum Commit
+    def _bump_version(self, conn: sqlite3.Connection):
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        after = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+        self.last_write_versions = (str(after - 1), str(after))
+
+    @staticmethod
+    def _dump(entry: dict) -> str:
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+    @STORAGE_SAVE_DURATION.timed(backend="sqlite")
+    def save(self, entry: dict):
+        entry["id"] = str(uuid.uuid4())
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO entries (id, name, data) VALUES (?, ?, ?)",
+                (entry["id"], entry.get("name"), self._dump(entry)),
+            )
+            self._bump_version(conn)
+        return entry
+
+    @STORAGE_SAVE_DURATION.timed(backend="sqlite")
+    def save_many(self, entries):
+        for entry in entries:
+            entry["id"] = str(uuid.uuid4())
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO entries (id, name, data) VALUES (?, ?, ?)",
+                ((entry["id"], entry.get("name"), self._dump(entry)) for entry in entries),
+            )
+            self._bump_version(conn)
+        return entries
+
+    @STORAGE_LOAD_DURATION.timed(backend="sqlite")
+    def load_all(self):
+        rows = self._connection().execute("SELECT data FROM entries ORDER BY rowid")
+        return [json.loads(data) for (data,) in rows]
+
+    def get_by_id(self, entry_id: str):
+        row = self._connection().execute("SELECT data FROM entries WHERE id = ?", (entry_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # Cursor ist die rowid des letzten Eintrags. Jeder Batch wird vollständig
+    # gelesen, da der Generator z.B. von StreamingResponse aus wechselnden
+    # Threads fortgesetzt wird und Verbindungen threadgebunden sind.
+    def iter_entries(self, name_prefix=None, cursor=None):
+        last_rowid = parse_position_cursor(cursor)
+        query = "SELECT rowid, data FROM entries WHERE rowid > ?"
+        params = []
+        if name_prefix is not None:
+            # Bereichsabfrage statt LIKE, damit der Index auf name genutzt wird
+            query += " AND name >= ? AND name < ?"
+            params = [name_prefix, name_prefix + "\U0010ffff"]
+        query += " ORDER BY rowid LIMIT ?"
+        while True:
+            rows = self._connection().execute(query, [last_rowid, *params, ITER_BATCH_SIZE]).fetchall()
+            for rowid, data in rows:
+                yield str(rowid), json.loads(data)
+            if len(rows) < ITER_BATCH_SIZE:
+                return
+            last_rowid = rows[-1][0]
+
+    def get_by_ids(self, entry_ids):
+        entry_ids = list(dict.fromkeys(entry_ids))
+        conn = self._connection()
+        found = {}
+        for start in range(0, len(entry_ids), MAX_QUERY_PARAMETERS):
+            chunk = entry_ids[start:start + MAX_QUERY_PARAMETERS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(f"SELECT id, data FROM entries WHERE id IN ({placeholders})", chunk)
+            for entry_id, data in rows:
+                found[entry_id] = json.loads(data)
+        return found
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @STORAGE_SAVE_DURATION.timed(backend="sqlite")
+    def replace_many(self, replacements):
+        conn = self._connection()
+        with conn:
+            # IMMEDIATE sperrt andere Schreiber schon vor dem Vergleich mit dem gespeicherten Stand
+            conn.execute("BEGIN IMMEDIATE")
+            current = self.get_by_ids(old["id"] for old, _ in replacements)
+            rows = []
+            for old, new in replacements:
+                if current.get(old["id"]) == old:
+                    new["id"] = old["id"]
+                    rows.append((new.get("name"), self._dump(new), old["id"]))
+            if rows:
+                conn.executemany("UPDATE entries SET name = ?, data = ? WHERE id = ?", rows)
+                self._bump_version(conn)
+        return len(rows)
+
+    def delete_by_id(self, entry_id: str):
+        with self._connection() as conn:
+            cursor = conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+            if cursor.rowcount > 0:
+                self._bump_version(conn)
+        return cursor.rowcount > 0
+
+    def update_by_id(self, entry_id: str, new_entry: dict):
+        new_entry["id"] = entry_id
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE entries SET name = ?, data = ? WHERE id = ?",
+                (new_entry.get("name"), self._dump(new_entry), entry_id),
+            )
+            if cursor.rowcount > 0:
+                self._bump_version(conn)
+        return new_entry if cursor.rowcount > 0 else None
@@ -0,0 +1,166 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.app.model.exam_statistics_output import ComponentStatistics, ExamStatisticsOutput
+from backend.app.service.vectorized_calculation_service import POINT_COMPONENTS, VectorizedExamCalculationService
+
+GRADES = (1, 2, 3, 4, 5, 6)
+WARM_UP_BATCH_SIZE = 5000
+
+
+# Laufende Aggregate über alle gespeicherten Einträge. Je Eintrag wird sein Beitrag
+# gemerkt, damit Update und Delete ihn wieder abziehen können; ein erneutes
+# upsert derselben id ersetzt den Beitrag, doppeltes Melden ist also unschädlich.
+# Schreiben mehrere Worker-Prozesse in dieselbe Ablage, erkennt der Stand der Ablage
+# (StorageRepository.version) fremde Änderungen; die Aggregate werden dann neu aufgebaut.
+class StatsService:
+    def __init__(self, calculation_service: Optional[VectorizedExamCalculationService] = None):
+        self.calculation_service = calculation_service or VectorizedExamCalculationService()
+        self._lock = threading.RLock()
+        self._warm = False
+        # Stand der Ablage, zu dem die Aggregate passen (None: unbekannt)
+        self._version = None
+        self._reset()
+
+    def _reset(self):
+        # id -> (Punkte je Komponente, Noten je Komponente, bestanden, Gründe) oder None bei ungültigem Eintrag
+        self._contributions: Dict[str, Optional[tuple]] = {}
+        self._invalid = 0
+        self._passed = 0
+        self._failed = 0
+        self._reason_counts = [0] * len(self.calculation_service.ruleset.failure_reasons)
+        self._point_counts = [0] * len(POINT_COMPONENTS)
+        self._point_sums = [0] * len(POINT_COMPONENTS)
+        self._grade_counts = [[0] * len(GRADES) for _ in POINT_COMPONENTS]
+
+    def _contribution(self, result: Optional[dict]) -> Optional[tuple]:
+        if result is None:
+            return None
+        points = tuple(result[key]["points"] for key in POINT_COMPONENTS)
+        grades = tuple(result[key]["grade"] for key in POINT_COMPONENTS)
+        reasons = tuple(i for i, reason in enumerate(self.calculation_service.ruleset.failure_reasons)
+                        if reason in result["FailureReasons"])
+        return points, grades, result["Passed"], reasons
+
+    def _apply(self, contribution: Optional[tuple], sign: int):
+        if contribution is None:
+            self._invalid += sign
+            return
+        points, grades, passed, reasons = contribution
+        if passed:
+            self._passed += sign
+        else:
+            self._failed += sign
+        for i in reasons:
+            self._reason_counts[i] += sign
+        for i, (pts, grade) in enumerate(zip(points, grades)):
+            if pts is not None:
+                self._point_counts[i] += sign
+                self._point_sums[i] += sign * pts
+                self._grade_counts[i][grade - 1] += sign
+
+    def _upsert(self, entries: List[dict]):
+        self._upsert_results([entry.get("id") for entry in entries],
+                             self.calculation_service.calculateEntryResults(entries))
+
+    def _upsert_results(self, entry_ids: List[str], results: List[Optional[dict]]):
+        for entry_id, result in zip(entry_ids, results):
+            if entry_id in self._contributions:
+                self._apply(self._contributions[entry_id], -1)
+            contribution = self._contribution(result)
+            self._contributions[entry_id] = contribution
+            self._apply(contribution, 1)
+
+    # versions: (Stand vor, Stand nach) des eigenen Schreibzugriffs. Lag davor ein fremder
+    # Schreibzugriff, passen die Aggregate nicht mehr und werden beim nächsten Abruf neu aufgebaut
+    def _follow(self, versions: Optional[Tuple[str, str]]) -> bool:
+        if versions is None or self._version is None:
+            return True
+        before, after = versions
+        if before != self._version:
+            self.invalidate()
+            return False
+        self._version = after
+        return True
+
+    def upsert(self, entries: List[dict], versions: Optional[Tuple[str, str]] = None):
+        with self._lock:
+            # vor dem ersten Aufwärmen gibt es nichts fortzuschreiben
+            if self._warm and self._follow(versions):
+                self._upsert(entries)
+
+    def remove(self, entry_id: str, versions: Optional[Tuple[str, str]] = None):
+        with self._lock:
+            if self._warm and self._follow(versions) and entry_id in self._contributions:
+                self._apply(self._contributions.pop(entry_id), -1)
+
+    def invalidate(self):
+        with self._lock:
+            self._warm = False
+            self._version = None
+            self._reset()
+
+    # einmaliger Durchlauf über die Ablage; der Lock bleibt dabei gehalten, damit
+    # parallel geschriebene Einträge erst danach (und damit genau einmal) gezählt werden.
+    # version ist der vor dem Lesen bestimmte Stand der Ablage
+    def warm_up(self, entries: Iterable[dict], version: Optional[str] = None):
+        with self._lock:
+            if self._warm:
+                return
+            self._reset()
+            self._version = version
+            batch = []
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) >= WARM_UP_BATCH_SIZE:
+                    self._upsert(batch)
+                    batch = []
+            self._upsert(batch)
+            self._warm = True
+
+    # wie warm_up, aus ids und Score-Matrix der Ablage (StorageRepository.score_matrix)
+    def warm_up_scores(self, entry_ids: List[str], scores: np.ndarray, version: Optional[str] = None):
+        with self._lock:
+            if self._warm:
+                return
+            self._reset()
+            self._version = version
+            for start in range(0, len(entry_ids), WARM_UP_BATCH_SIZE):
+                stop = start + WARM_UP_BATCH_SIZE
+                self._upsert_results(entry_ids[start:stop],
+                                     self.calculation_service.calculateMatrixResults(scores[start:stop]))
+            self._warm = True
+
+    # load_scores: liefert (ids, Score-Matrix) oder None, dann wird über load_entries aufgewärmt
+    def statistics(self, load_entries: Callable[[], Iterable[dict]], version: Optional[str] = None,
+                   load_scores: Optional[Callable[[], Optional[tuple]]] = None) -> ExamStatisticsOutput:
+        with self._lock:
+            if self._warm and version is not None and version != self._version:
+                # ein anderer Prozess hat die Ablage geändert
+                self.invalidate()
+            if not self._warm:
+                matrix = load_scores() if load_scores is not None else None
+                if matrix is not None:
+                    self.warm_up_scores(*matrix, version)
+                else:
+                    self.warm_up(load_entries(), version)
+            calculated = self._passed + self._failed
+            components = {}
+            for i, key in enumerate(POINT_COMPONENTS):
+                count = self._point_counts[i]
+                components[key] = ComponentStatistics(
+                    count=count,
+                    average_points=round(self._point_sums[i] / count, 2) if count else None,
+                    grades={str(grade): n for grade, n in zip(GRADES, self._grade_counts[i])},
+                )
+            return ExamStatisticsOutput(
+                total=len(self._contributions),
+                invalid=self._invalid,
+                passed=self._passed,
+                failed=self._failed,
+                pass_rate=round(self._passed / calculated, 4) if calculated else None,
+                failure_reasons=dict(zip(self.calculation_service.ruleset.failure_reasons, self._reason_counts)),
+                components=components,
+            )
@@ -0,0 +1,37 @@
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+
+# Führt blockierende Ablage-Zugriffe außerhalb des Event-Loops aus: Lesen und
+# Rechnen in einem kleinen Thread-Pool, Schreiben nacheinander in genau einem
+# Schreib-Thread. Die Zahl wartender Schreibzugriffe ist begrenzt, weitere
+# Aufrufer warten im Event-Loop, ohne einen Thread zu belegen.
+class StorageExecutor:
+    def __init__(self, read_workers: int = 4, max_pending_writes: int = 64):
+        self.max_pending_writes = max_pending_writes
+        self._read_executor = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="storage-read")
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage-write")
+        # asyncio.Semaphore ist an einen Event-Loop gebunden (z.B. neuer Loop je TestClient)
+        self._write_slots = weakref.WeakKeyDictionary()
+
+    def _slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slots = self._write_slots.get(loop)
+        if slots is None:
+            slots = self._write_slots[loop] = asyncio.Semaphore(self.max_pending_writes)
+        return slots
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_executor, partial(func, *args, **kwargs))
+
+    async def write(self, func, *args, **kwargs):
+        async with self._slots():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._write_executor, partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        self._read_executor.shutdown(wait=True)
+        self._write_executor.shutdown(wait=True)
@@ -0,0 +1,57 @@
+import os
+import threading
+
+from backend.app.service.binary_storage_service import BinaryStorageService
+from backend.app.service.file_service import FileService
+from backend.app.service.sqlite_service import SqliteService
+from backend.app.service.storage_repository import StorageRepository
+
+DEFAULT_PATHS = {
+    "json": "backend/data/storage.json",
+    "sqlite": "backend/data/storage.db",
+    "binary": "backend/data/storage.bin",
+}
+
+
+def create_storage() -> StorageRepository:
+    backend = os.getenv("BACKEND_STORAGE", "json").lower()
+    if backend not in DEFAULT_PATHS:
+        raise ValueError(f"Unknown storage backend '{backend}', expected one of {sorted(DEFAULT_PATHS)}")
+    path = os.getenv("BACKEND_STORAGE_PATH", DEFAULT_PATHS[backend])
+    compaction_threshold = int(os.getenv("BACKEND_STORAGE_COMPACTION_THRESHOLD", 1000))
+
+    if backend == "binary":
+        return BinaryStorageService(path, compaction_threshold=compaction_threshold)
+    if backend == "sqlite":
+        return SqliteService(path, name_index=os.getenv("BACKEND_STORAGE_NAME_INDEX", "1") == "1")
+    return FileService(
+        path,
+        journal=os.getenv("BACKEND_STORAGE_JOURNAL") == "1",
+        compaction_threshold=compaction_threshold,
+    )
+
+
+# legt die Ablage erst beim ersten Zugriff an (Datei öffnen, Journal zählen,
+# Schema anlegen), damit der Import des Controllers nichts von der Platte liest
+class LazyStorage:
+    # optionale Fähigkeiten, die nur abgefragt werden (hasattr) und die Ablage dafür nicht anlegen sollen
+    PROBES = ("cache_stats",)
+
+    def __init__(self, factory=create_storage):
+        self._factory = factory
+        self._storage = None
+        self._lock = threading.Lock()
+
+    def _instance(self) -> StorageRepository:
+        if self._storage is None:
+            with self._lock:
+                if self._storage is None:
+                    self._storage = self._factory()
+        return self._storage
+
+    def __getattr__(self, name):
+        # mock.patch, copy und pickle fragen Dunder- und private Attribute ab (z.B. _is_coroutine),
+        # das soll keine Datei anlegen; weitergereicht wird nur die öffentliche Schnittstelle
+        if name.startswith("_") or (name in self.PROBES and self._storage is None):
+            raise AttributeError(name)
+        return getattr(self._instance(), name)
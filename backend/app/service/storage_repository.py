@@ -0,0 +1,107 @@
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def parse_position_cursor(cursor: Optional[str]) -> int:
+    if cursor is None:
+        return 0
+    if not cursor.isdigit():
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return int(cursor)
+
+
+# Cursor "<Position>:<id>" für Backends ohne stabilen Schlüssel: fortgesetzt wird hinter dem Eintrag mit
+# dieser id, nur wenn es ihn nicht mehr gibt an der Position. Reine Positionen bleiben gültig; ids, die
+# nicht in einen HTTP-Header passen, werden weggelassen
+def format_entry_cursor(position: int, entry_id) -> str:
+    if isinstance(entry_id, str) and entry_id.isascii() and entry_id.isprintable():
+        return f"{position}:{entry_id}"
+    return str(position)
+
+
+def parse_entry_cursor(cursor: Optional[str]) -> Tuple[int, Optional[str]]:
+    if cursor is None:
+        return 0, None
+    position, separator, entry_id = cursor.partition(":")
+    return parse_position_cursor(position), (entry_id if separator else None)
+
+
+class StorageRepository(ABC):
+    # (Stand vor, Stand nach) dem letzten Schreibzugriff dieser Instanz, unter derselben Sperre
+    # wie der Schreibzugriff bestimmt; weicht "vor" vom zuletzt bekannten Stand ab, hat
+    # zwischendurch ein anderer Prozess geschrieben
+    last_write_versions: Optional[Tuple[str, str]] = None
+    # False, wenn das Format berechnete Ergebnisse (result, result_key) nicht speichern kann
+    stores_results: bool = True
+
+    # Stand der Ablage: ändert sich mit jedem Schreibzugriff, auch aus anderen Prozessen, und ist
+    # für denselben Stand in allen Prozessen gleich. None, wenn das Backend keinen Stand kennt
+    def version(self) -> Optional[str]:
+        return None
+
+    @abstractmethod
+    def save(self, entry: dict) -> dict:
+        ...
+
+    # Standardimplementierung ohne gemeinsame Transaktion, Backends überschreiben sie
+    def save_many(self, entries: List[dict]) -> List[dict]:
+        return [self.save(entry) for entry in entries]
+
+    @abstractmethod
+    def load_all(self) -> List[dict]:
+        ...
+
+    @abstractmethod
+    def get_by_id(self, entry_id: str) -> Optional[dict]:
+        ...
+
+    # prüft einen Cursor aus iter_entries, ValueError wenn er nicht von diesem Backend stammen kann
+    def parse_cursor(self, cursor: Optional[str]):
+        return parse_position_cursor(cursor)
+
+    # liefert (cursor, Eintrag)-Paare; mit dem Cursor eines Eintrags setzt ein
+    # späterer Aufruf direkt hinter diesem Eintrag fort. Standardimplementierung
+    # mit Positions-Cursor, Backends mit eigenem Schlüssel überschreiben sie.
+    def iter_entries(self, name_prefix: Optional[str] = None,
+                     cursor: Optional[str] = None) -> Iterator[Tuple[str, dict]]:
+        start = parse_position_cursor(cursor)
+        for position, entry in enumerate(islice(self.load_all(), start, None), start + 1):
+            if name_prefix is None or (entry.get("name") or "").startswith(name_prefix):
+                yield str(position), entry
+
+    # Standardimplementierung, Backends mit günstigerem Massenzugriff überschreiben sie
+    def get_by_ids(self, entry_ids: Iterable[str]) -> Dict[str, dict]:
+        found = {}
+        for entry_id in entry_ids:
+            entry = self.get_by_id(entry_id)
+            if entry is not None:
+                found[entry_id] = entry
+        return found
+
+    # (ids, Score-Matrix mit MISSING = -1) aller Einträge in der Spaltenreihenfolge von SCORE_COLUMNS,
+    # ohne ein Dict pro Eintrag zu bauen; None, wenn das Backend das nicht günstiger kann als load_all
+    def score_matrix(self):
+        return None
+
+    # Standardimplementierung über iter_entries, Backends mit günstigerer Zählung überschreiben sie
+    def count(self) -> int:
+        return sum(1 for _ in self.iter_entries())
+
+    @abstractmethod
+    def delete_by_id(self, entry_id: str) -> bool:
+        ...
+
+    # ersetzt (bisheriger Eintrag, neuer Eintrag)-Paare nur, wenn der gespeicherte Eintrag noch dem
+    # bisherigen entspricht, damit zwischenzeitliche Änderungen nicht überschrieben werden; liefert die
+    # Zahl der ersetzten Einträge. Standardimplementierung ohne gemeinsame Sperre, Backends überschreiben sie
+    def replace_many(self, replacements: List[Tuple[dict, dict]]) -> int:
+        replaced = 0
+        for old, new in replacements:
+            if self.get_by_id(old["id"]) == old and self.update_by_id(old["id"], new) is not None:
+                replaced += 1
+        return replaced
+
+    @abstractmethod
+    def update_by_id(self, entry_id: str, new_entry: dict) -> Optional[dict]:
+        ...
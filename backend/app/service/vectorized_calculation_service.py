@@ -0,0 +1,237 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.model.final_exam_result_output import FinalExamResultOutput
+from backend.app.service.exam_calculation_service import scores_from_input
+from backend.app.service.metrics_service import CALCULATION_DURATION
+from backend.app.service.ruleset_service import CompiledRuleset, rulesets
+
+# Spaltenreihenfolge der Score-Matrix, fehlende Werte werden als MISSING (-1) abgelegt
+SCORE_COLUMNS = (
+    "ap1",
+    "planning_main",
+    "planning_extra",
+    "development_main",
+    "development_extra",
+    "economy_main",
+    "economy_extra",
+    "pw_project",
+    "pw_presentation",
+)
+MISSING = -1
+# (Teil, Feld) unterhalb von ap2 für SCORE_COLUMNS[1:], wie in model_dump() gespeichert
+AP2_SCORE_FIELDS = (
+    ("planning", "main"),
+    ("planning", "extra"),
+    ("development", "main"),
+    ("development", "extra"),
+    ("economy", "main"),
+    ("economy", "extra"),
+    ("pw", "project"),
+    ("pw", "presentation"),
+)
+
+# Reihenfolge der Komponenten wie im Ergebnis-Dict von ExamCalculationService
+POINT_COMPONENTS = (
+    "ap1",
+    "ap2_planning",
+    "ap2_development",
+    "ap2_economy",
+    "ap2_pw_project",
+    "ap2_pw_presentation",
+    "ap2_pw_overall",
+    "ap2_overall",
+    "Overall",
+)
+
+
+def row_from_input(finalExamResult: FinalExamResultInput) -> tuple:
+    return tuple(MISSING if v is None else v for v in scores_from_input(finalExamResult))
+
+
+# Punktwerte direkt aus einem gespeicherten Eintrag (None = fehlt), None wenn er keine gültigen Punkte enthält
+def scores_from_entry(entry: dict) -> Optional[tuple]:
+    ap2 = entry.get("ap2") or {}
+    values = (entry.get("ap1"),) + tuple((ap2.get(part) or {}).get(field) for part, field in AP2_SCORE_FIELDS)
+    if not all(v is None or (type(v) is int and 0 <= v <= 100) for v in values):
+        return None
+    return values
+
+
+# Score-Zeile direkt aus einem gespeicherten Eintrag, None wenn er keine gültigen Punkte enthält
+def row_from_entry(entry: dict) -> Optional[tuple]:
+    values = scores_from_entry(entry)
+    if values is None:
+        return None
+    return tuple(MISSING if v is None else v for v in values)
+
+
+def score_matrix(rows) -> np.ndarray:
+    scores = np.array(rows, dtype=np.int16)
+    return scores.reshape(-1, len(SCORE_COLUMNS))
+
+
+class VectorizedExamCalculationService:
+    # ruleset: übersetztes Regelwerk (RulesetService.get), Standard ist das konfigurierte Regelwerk
+    def __init__(self, ruleset: Optional[CompiledRuleset] = None):
+        self.ruleset = ruleset or rulesets.get()
+
+    def _grades(self, points: np.ndarray, present: np.ndarray) -> np.ndarray:
+        grades = 6 - np.searchsorted(self.ruleset.grade_thresholds, points, side="right")
+        return np.where(present, grades, 0).astype(np.int8)
+
+    def _ap2_part(self, main: np.ndarray, extra: np.ndarray):
+        first, second = self.ruleset.ap2_part_blend
+        main_present = main != MISSING
+        extra_present = extra != MISSING
+        # gleiche Rechenreihenfolge wie die Tabelle des Regelwerks, damit die Rundung identisch ist
+        blended = np.rint(first * main.astype(np.float64) + second * extra.astype(np.float64))
+        points = np.where(extra_present, blended, main).astype(np.int16)
+        return np.where(main_present, points, MISSING), main_present
+
+    @staticmethod
+    def _weighted(points: dict, weights: tuple) -> tuple:
+        length = len(points["ap1"][0])
+        weighted_sum = np.zeros(length, dtype=np.float64)
+        present_weight_sum = np.zeros(length, dtype=np.float64)
+        for key, w in weights:
+            pts, present = points[key]
+            weighted_sum = weighted_sum + np.where(present, w * pts.astype(np.float64), 0.0)
+            present_weight_sum = present_weight_sum + np.where(present, w, 0.0)
+        has_weight = present_weight_sum > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = np.rint(weighted_sum / np.where(has_weight, present_weight_sum, 1.0)).astype(np.int16)
+        return np.where(has_weight, result, MISSING), has_weight
+
+    def calculateScoreColumns(self, scores: np.ndarray) -> Dict[str, np.ndarray]:
+        ruleset = self.ruleset
+        columns = {name: scores[:, i] for i, name in enumerate(SCORE_COLUMNS)}
+
+        project = columns["pw_project"]
+        presentation = columns["pw_presentation"]
+        project_present = project != MISSING
+        presentation_present = presentation != MISSING
+        first, second = ruleset.pw_blend
+        pw_both = np.rint(first * project.astype(np.float64) + second * presentation.astype(np.float64)).astype(np.int16)
+        pw_overall = np.where(
+            project_present & presentation_present, pw_both,
+            np.where(project_present, project, presentation),
+        )
+
+        # Reihenfolge wie im Ergebnis-Dict
+        points = {
+            "ap1": (columns["ap1"], columns["ap1"] != MISSING),
+            "ap2_planning": self._ap2_part(columns["planning_main"], columns["planning_extra"]),
+            "ap2_development": self._ap2_part(columns["development_main"], columns["development_extra"]),
+            "ap2_economy": self._ap2_part(columns["economy_main"], columns["economy_extra"]),
+            "ap2_pw_project": (project, project_present),
+            "ap2_pw_presentation": (presentation, presentation_present),
+            "ap2_pw_overall": (pw_overall, project_present | presentation_present),
+        }
+        points["ap2_overall"] = self._weighted(points, ruleset.ap2_weights)
+        points["Overall"] = self._weighted(points, ruleset.weights)
+
+        result = {}
+        for key, (pts, present) in points.items():
+            result[key + "_points"] = np.where(present, pts, MISSING).astype(np.int16)
+            result[key + "_grade"] = self._grades(pts, present)
+
+        # eine Regel ist verletzt, wenn mehr als max_count ihrer Komponenten unter der Grenze liegen
+        failed = np.zeros(len(scores), dtype=bool)
+        for reason, rule_components, below, max_count in ruleset.failure_rules:
+            counted = sum((points[key][1] & (points[key][0] < below)).astype(np.int8) for key in rule_components)
+            result[reason] = counted > max_count
+            failed |= result[reason]
+        result["Passed"] = ~failed
+        return result
+
+    def result_dicts(self, result: Dict[str, np.ndarray]) -> List[dict]:
+        failure_reasons = self.ruleset.failure_reasons
+        columns = {key: value.tolist() for key, value in result.items()}
+        dicts = []
+        for i in range(len(columns["Passed"])):
+            row = {}
+            for key in POINT_COMPONENTS:
+                pts = columns[key + "_points"][i]
+                row[key] = {"points": None, "grade": None} if pts == MISSING else \
+                    {"points": pts, "grade": columns[key + "_grade"][i]}
+            row["Passed"] = columns["Passed"][i]
+            row["FailureReasons"] = [reason for reason in failure_reasons if columns[reason][i]]
+            dicts.append(row)
+        return dicts
+
+    def output_dicts(self, result: Dict[str, np.ndarray]) -> List[dict]:
+        failure_reasons = self.ruleset.failure_reasons
+        passed = result["Passed"].tolist()
+        columns = [[{"points": None, "grade": None} if pts == MISSING else {"points": pts, "grade": grade}
+                    for pts, grade in zip(result[key + "_points"].tolist(), result[key + "_grade"].tolist())]
+                   for key in POINT_COMPONENTS]
+        flags = list(zip(*(result[reason].tolist() for reason in failure_reasons))) or [()] * len(passed)
+        return [
+            {
+                "AP1": ap1,
+                "AP2": {
+                    "planning": planning,
+                    "development": development,
+                    "economy": economy,
+                    "pw": {"project": project, "presentation": presentation, "overall": pw_overall},
+                    "overall": ap2_overall,
+                },
+                "Overall": overall,
+                "Status": {"passed": row_passed,
+                           "reasons": [reason for reason, flag in zip(failure_reasons, row_flags) if flag]},
+            }
+            for ap1, planning, development, economy, project, presentation, pw_overall, ap2_overall, overall,
+            row_passed, row_flags in zip(*columns, passed, flags)
+        ]
+
+    # Ergebnis-Dicts für gespeicherte Einträge ohne Umweg über FinalExamResultInput,
+    # None für Einträge mit ungültigen Werten
+    @CALCULATION_DURATION.timed(mode="batch")
+    def calculateEntryResults(self, entries: List[dict]) -> List[Optional[dict]]:
+        rows = [row_from_entry(entry) for entry in entries]
+        valid = [i for i, row in enumerate(rows) if row is not None]
+        results: List[Optional[dict]] = [None] * len(entries)
+        if valid:
+            scores = score_matrix([rows[i] for i in valid])
+            for i, result in zip(valid, self.result_dicts(self.calculateScoreColumns(scores))):
+                results[i] = result
+        return results
+
+    # Ergebnis-Dicts für eine Score-Matrix aus der Ablage (StorageRepository.score_matrix),
+    # None für Zeilen mit Punkten über 100
+    @CALCULATION_DURATION.timed(mode="batch")
+    def calculateMatrixResults(self, scores: np.ndarray) -> List[Optional[dict]]:
+        valid = (scores <= 100).all(axis=1)
+        results: List[Optional[dict]] = [None] * len(scores)
+        if valid.any():
+            for i, result in zip(np.flatnonzero(valid).tolist(),
+                                 self.result_dicts(self.calculateScoreColumns(scores[valid]))):
+                results[i] = result
+        return results
+
+    @CALCULATION_DURATION.timed(mode="batch")
+    def calculateBatchResults(self, finalExamResults: List[FinalExamResultInput]) -> List[FinalExamResultOutput]:
+        if not finalExamResults:
+            return []
+        scores = score_matrix([row_from_input(finalExamResult) for finalExamResult in finalExamResults])
+        result = self.calculateScoreColumns(scores)
+        return [FinalExamResultOutput.from_result_dict(row) for row in self.result_dicts(result)]
+
+    # wie calculateBatchResults, aber gleich in der JSON-Struktur der Ausgabemodelle
+    # (FinalExamResultOutput.dump_result_dict), für Antworten ohne Modelle je Eintrag
+    @CALCULATION_DURATION.timed(mode="batch")
+    def calculateOutputDicts(self, finalExamResults: List[FinalExamResultInput]) -> List[dict]:
+        if not finalExamResults:
+            return []
+        scores = score_matrix([row_from_input(finalExamResult) for finalExamResult in finalExamResults])
+        return self.output_dicts(self.calculateScoreColumns(scores))
+
+    # wie calculateOutputDicts für eine Score-Matrix, deren Punkte alle im gültigen Bereich liegen
+    @CALCULATION_DURATION.timed(mode="batch")
+    def calculateMatrixOutputDicts(self, scores: np.ndarray) -> List[dict]:
+        if not len(scores):
+            return []
+        return self.output_dicts(self.calculateScoreColumns(scores))
@@ -0,0 +1,83 @@
+# Mikrobenchmark: Nachschlagetabellen gegen die ursprünglichen Formeln.
+# Aufruf aus dem Wurzelverzeichnis: python -m backend.benchmarks.calculation_benchmark
+import random
+import timeit
+from typing import Optional
+
+from backend.app.model.final_exam_result_input import AP2, AP2Part, FinalExamResultInput, PW
+from backend.app.service.exam_calculation_service import ExamCalculationService
+
+
+# die ursprünglichen Formeln des Regelwerks ao2020
+def reference_grade(p: float) -> int:
+    if p >= 92: return 1
+    if p >= 81: return 2
+    if p >= 67: return 3
+    if p >= 50: return 4
+    if p >= 30: return 5
+    return 6
+
+
+class ReferenceExamCalculationService(ExamCalculationService):
+    def _grade_from_points(self, points: Optional[int]) -> Optional[int]:
+        if points is None or points < 0 or points > 100:
+            return None
+        return reference_grade(float(points))
+
+    def _calculate_ap2_part(self, part: Optional[AP2Part]) -> Optional[int]:
+        if part is None or part.main is None:
+            return None
+        if part.extra is None:
+            return round(float(part.main))
+        return round((2.0 / 3.0) * float(part.main) + (1.0 / 3.0) * float(part.extra))
+
+    def _calculate_pw_overall(self, project: Optional[int], presentation: Optional[int]) -> Optional[int]:
+        if project is not None and presentation is not None:
+            return round(0.5 * project + 0.5 * presentation)
+        return project if project is not None else presentation
+
+
+def sample_inputs(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    score = lambda: rng.randint(0, 100)
+    return [
+        FinalExamResultInput(
+            AP1=score(),
+            AP2=AP2(
+                planning=AP2Part(main=score(), extra=score()),
+                development=AP2Part(main=score()),
+                economy=AP2Part(main=score(), extra=score()),
+                pw=PW(project=score(), presentation=score()),
+            ),
+        )
+        for _ in range(count)
+    ]
+
+
+def measure(label: str, func, number: int, repeat: int = 5) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"{label:<45} {best * 1e6:10.3f} µs")
+    return best
+
+
+def main():
+    table = ExamCalculationService()
+    reference = ReferenceExamCalculationService()
+    points = list(range(101))
+    parts = [AP2Part(main=m, extra=e) for m in range(0, 101, 5) for e in range(0, 101, 5)]
+    inputs = sample_inputs(1000)
+
+    results = {}
+    for label, service in (("reference", reference), ("tables", table)):
+        results[label] = (
+            measure(f"{label}: _grade_from_points x101", lambda: [service._grade_from_points(p) for p in points], 200),
+            measure(f"{label}: _calculate_ap2_part x{len(parts)}", lambda: [service._calculate_ap2_part(p) for p in parts], 200),
+            measure(f"{label}: calculateExamResults x1000", lambda: [service.calculateExamResults(i) for i in inputs], 5),
+        )
+
+    for name, ref, tab in zip(("grade", "ap2 part", "calculation"), results["reference"], results["tables"]):
+        print(f"speedup {name:<12} {ref / tab:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import json
+import os
+import random
+import sqlite3
+import uuid
+from typing import List, Optional
+
+from backend.app.service.binary_storage_service import BinaryStorageService
+from backend.app.service.file_service import FileService
+from backend.app.service.sqlite_service import SqliteService
+
+STORAGE_KINDS = ("json", "journal", "sqlite", "binary")
+
+
+def generate_entry(rng: random.Random, with_id: bool = True) -> dict:
+    def score(missing: float = 0.05) -> Optional[int]:
+        return None if rng.random() < missing else rng.randint(0, 100)
+
+    def part() -> dict:
+        return {"main": score(), "extra": score(0.8)}
+
+    entry = {
+        "name": f"Trainee {rng.randint(0, 10 ** 6):06d}",
+        "ap1": score(),
+        "ap2": {
+            "planning": part(),
+            "development": part(),
+            "economy": part(),
+            "pw": {"project": score(), "presentation": score()},
+        },
+    }
+    if with_id:
+        entry["id"] = str(uuid.UUID(int=rng.getrandbits(128)))
+    return entry
+
+
+def generate_entries(count: int, seed: int = 42) -> List[dict]:
+    rng = random.Random(seed)
+    return [generate_entry(rng) for _ in range(count)]
+
+
+def open_storage(kind: str, path: str):
+    if kind in ("json", "journal"):
+        return FileService(path, journal=kind == "journal")
+    if kind == "sqlite":
+        return SqliteService(path)
+    if kind == "binary":
+        return BinaryStorageService(path)
+    raise ValueError(f"Unknown storage kind '{kind}'")
+
+
+# schreibt den Datenbestand direkt in die Ablage, ohne count-mal save() aufzurufen
+def create_prefilled_storage(kind: str, directory: str, entries: List[dict]):
+    path = os.path.join(directory, {"sqlite": "storage.db", "binary": "storage.bin"}.get(kind, f"storage-{kind}.json"))
+    if kind == "binary":
+        storage = BinaryStorageService(path)
+        # _append übernimmt die vorhandenen ids, save_many würde neue vergeben
+        storage._append([dict(e) for e in entries])
+        return storage
+    if kind == "sqlite":
+        SqliteService(path).close()
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.executemany(
+                "INSERT INTO entries (id, name, data) VALUES (?, ?, ?)",
+                ((e["id"], e["name"], json.dumps(e, separators=(",", ":"))) for e in entries),
+            )
+        conn.close()
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+    return open_storage(kind, path)
@@ -0,0 +1,109 @@
+# Lasttest für den Betrieb mit mehreren Worker-Prozessen: startet das Backend je
+# Worker-Anzahl auf einer vorbefüllten Ablage und misst den Durchsatz mehrerer
+# Client-Prozesse. Aufruf aus dem Wurzelverzeichnis, z.B.:
+#   python -m backend.benchmarks.load_test --workers 1 2 4 --clients 8 --duration 10
+#   python -m backend.benchmarks.load_test --storage sqlite --write-ratio 0.1
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.benchmarks.dataset import STORAGE_KINDS, create_prefilled_storage, generate_entries
+from backend.benchmarks.startup_benchmark import free_port, wait_for
+
+
+def client_run(port: int, ids: list, duration: float, write_ratio: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    requests = errors = 0
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        entry_id = rng.choice(ids)
+        started = time.perf_counter()
+        if rng.random() < write_ratio:
+            body = json.dumps({"Name": f"Load {seed}", "AP1": rng.randint(0, 100)})
+            conn.request("PUT", f"/exam/{entry_id}", body, {"Content-Type": "application/json"})
+        else:
+            conn.request("GET", f"/exam/calculate/{entry_id}")
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        requests += 1
+        if response.status >= 400:
+            errors += 1
+    conn.close()
+    return {"requests": requests, "errors": errors, "latencies": latencies}
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def load_run(workers: int, args, directory: str, ids: list) -> dict:
+    port = free_port()
+    env = {**os.environ, "BACKEND_PORT": str(port), "BACKEND_WORKERS": str(workers),
+           "BACKEND_STORAGE": "json" if args.storage == "journal" else args.storage,
+           "BACKEND_STORAGE_JOURNAL": "1" if args.storage == "journal" else "0",
+           "BACKEND_STORAGE_PATH": args.path}
+    process = subprocess.Popen([sys.executable, "-m", "backend.main"], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        started = time.perf_counter()
+        wait_for(f"http://127.0.0.1:{port}/exam/list?limit=1", started, args.timeout)
+        # jeder Worker lädt die Exam-Routen und die Ablage beim ersten Request; vorher aufwärmen
+        with multiprocessing.Pool(args.clients) as pool:
+            pool.starmap(client_run, [(port, ids, 1.0, 0.0, seed) for seed in range(args.clients)])
+            results = pool.starmap(client_run, [(port, ids, args.duration, args.write_ratio, seed)
+                                                for seed in range(args.clients)])
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    latencies = [latency for result in results for latency in result["latencies"]]
+    requests = sum(result["requests"] for result in results)
+    return {"workers": workers, "requests": requests, "errors": sum(result["errors"] for result in results),
+            "requests_per_s": requests / args.duration,
+            "p50_ms": percentile(latencies, 0.5) * 1e3, "p99_ms": percentile(latencies, 0.99) * 1e3}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput with several backend worker processes")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8, help="client processes generating load")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per worker count")
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--storage", choices=STORAGE_KINDS, default="sqlite")
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="share of PUT requests")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    print(f"{os.cpu_count()} CPU cores, {args.clients} clients, {args.entries} entries in {args.storage} storage")
+    results = []
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            entries = [{**entry, "validated": True} for entry in generate_entries(args.entries)]
+            args.path = create_prefilled_storage(args.storage, directory, entries).filepath
+            record = load_run(workers, args, directory, [entry["id"] for entry in entries])
+        record["scaling"] = record["requests_per_s"] / results[0]["requests_per_s"] if results else 1.0
+        results.append(record)
+        print(f"workers={workers:<3} {record['requests_per_s']:9.1f} req/s  p50={record['p50_ms']:7.1f} ms  "
+              f"p99={record['p99_ms']:7.1f} ms  scaling={record['scaling']:5.2f}x  errors={record['errors']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Misst den Speicherbedarf des In-Memory-Caches von FileService: verschachtelte Dicts
+# (bisherige Darstellung) gegen EntryTable. Aufruf aus dem Wurzelverzeichnis, z.B.:
+#   python -m backend.benchmarks.memory_benchmark --sizes 10000 100000
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from backend.app.service.entry_table import EntryTable
+from backend.app.service.file_service import FileService
+from backend.benchmarks.dataset import create_prefilled_storage, generate_entries
+
+
+def traced(func):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0] - before, elapsed
+    finally:
+        tracemalloc.stop()
+
+
+def dict_cache(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return {item.get("id"): item for item in json.load(f)}
+
+
+def measure(size: int) -> list:
+    # wie über die API gespeichert
+    entries = [{**entry, "validated": True} for entry in generate_entries(size)]
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = create_prefilled_storage("json", directory, entries).filepath
+        del entries
+        for name, load in (("dict", lambda: dict_cache(path)),
+                           ("EntryTable", lambda: FileService(path)._index())):
+            cache, allocated, _ = traced(load)
+            assert isinstance(cache, EntryTable) == (name == "EntryTable")
+            del cache
+            # Ladezeit ohne tracemalloc, das die Messung stark verlangsamt
+            gc.collect()
+            started = time.perf_counter()
+            load()
+            elapsed = time.perf_counter() - started
+            results.append({"representation": name, "size": size, "bytes": allocated,
+                            "bytes_per_entry": allocated / size, "load_s": elapsed,
+                            "file_bytes": os.path.getsize(path)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory of the FileService entry cache")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000])
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        for record in measure(size):
+            results.append(record)
+            print(f"{record['representation']:<12} size={record['size']:<8} "
+                  f"{record['bytes'] / 1e6:8.1f} MB {record['bytes_per_entry']:8.0f} B/entry "
+                  f"load={record['load_s'] * 1e3:8.1f} ms")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
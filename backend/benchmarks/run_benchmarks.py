@@ -0,0 +1,269 @@
+# Benchmark-Suite für Ablage, Berechnung und komplette Requests.
+# Aufruf aus dem Wurzelverzeichnis, z.B.:
+#   python -m backend.benchmarks.run_benchmarks --sizes 1000 10000 --output bench.json
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.app.model.batch_calculation_output import BatchCalculationItem, BatchCalculationOutput
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.model.final_exam_result_output import FinalExamResultOutput
+from backend.app.service import json_codec
+from backend.app.service.exam_calculation_service import ExamCalculationService
+from backend.app.service.result_cache_service import strip_metadata
+from backend.app.service.search_index_service import SearchIndexService
+from backend.app.service.vectorized_calculation_service import VectorizedExamCalculationService, scores_from_entry
+from backend.benchmarks.dataset import (
+    STORAGE_KINDS,
+    create_prefilled_storage,
+    generate_entries,
+    generate_entry,
+    open_storage,
+)
+
+
+def measure(func, budget: float, max_iterations: int, min_iterations: int = 3) -> dict:
+    durations = []
+    started = time.perf_counter()
+    while len(durations) < max_iterations:
+        t0 = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - t0)
+        if len(durations) >= min_iterations and time.perf_counter() - started > budget:
+            break
+    durations.sort()
+    return {
+        "iterations": len(durations),
+        "mean_s": statistics.fmean(durations),
+        "p50_s": durations[len(durations) // 2],
+        "p95_s": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+        "min_s": durations[0],
+    }
+
+
+class Runner:
+    def __init__(self, budget: float, max_iterations: int):
+        self.budget = budget
+        self.max_iterations = max_iterations
+        self.results = []
+
+    def run(self, group: str, name: str, func, items_per_call: int = 1, **labels):
+        stats = measure(func, self.budget, self.max_iterations)
+        stats["items_per_s"] = items_per_call / stats["mean_s"] if stats["mean_s"] else None
+        record = {"group": group, "name": name, **labels, **stats}
+        self.results.append(record)
+        label = " ".join(f"{k}={v}" for k, v in labels.items())
+        print(f"{group:<10} {name:<28} {label:<28} mean={stats['mean_s'] * 1e3:9.3f} ms "
+              f"p95={stats['p95_s'] * 1e3:9.3f} ms n={stats['iterations']}", flush=True)
+
+
+def bench_storage(runner: Runner, kind: str, size: int, entries, directory: str):
+    storage = create_prefilled_storage(kind, directory, [dict(e) for e in entries])
+    rng = random.Random(size)
+    ids = [e["id"] for e in entries]
+    labels = {"backend": kind, "size": size}
+
+    runner.run("storage", "load_all (cold)", lambda: open_storage(kind, storage.filepath).load_all(), size, **labels)
+    runner.run("storage", "load_all", storage.load_all, size, **labels)
+    runner.run("storage", "get_by_id", lambda: storage.get_by_id(rng.choice(ids)), **labels)
+    runner.run("storage", "list page (limit 100)",
+               lambda: list(zip(range(100), storage.iter_entries())), 100, **labels)
+    runner.run("storage", "save", lambda: ids.append(storage.save(generate_entry(rng, with_id=False))["id"]),
+               **labels)
+    runner.run("storage", "update_by_id",
+               lambda: storage.update_by_id(rng.choice(ids), generate_entry(rng, with_id=False)), **labels)
+
+    def delete():
+        storage.delete_by_id(ids.pop(rng.randrange(len(ids))))
+
+    runner.run("storage", "delete_by_id", delete, **labels)
+
+
+def bench_calculation(runner: Runner, size: int, entries):
+    inputs = [FinalExamResultInput.model_validate(strip_metadata(e)) for e in entries]
+    scalar = ExamCalculationService()
+    vectorized = VectorizedExamCalculationService()
+    labels = {"size": size}
+
+    runner.run("calc", "scalar (per entry)", lambda: [scalar.calculateExamResults(i) for i in inputs], size, **labels)
+    runner.run("calc", "vectorized batch", lambda: vectorized.calculateBatchResults(inputs), size, **labels)
+    # GET /exam/calculate/{id} vom gespeicherten Dict bis zum JSON-Body, einmal mit erneuter Validierung
+    # und Ausgabemodellen, einmal für über die API gespeicherte Einträge auf einfachen Daten
+    runner.run("calc", "single entry, validated", lambda: [
+        JSONResponse(jsonable_encoder(
+            scalar.calculateExamResults(FinalExamResultInput.model_validate(strip_metadata(e))))) for e in entries],
+        size, **labels)
+    runner.run("calc", "single entry, trusted", lambda: [
+        JSONResponse(FinalExamResultOutput.dump_result_dict(scalar.calculateResultDict(scores_from_entry(e))))
+        for e in entries], size, **labels)
+
+
+# Abfragen auf den Sekundärindizes, ohne das Laden der gefundenen Einträge
+SEARCH_QUERIES = (
+    ("name contains", {"query": "ee 12"}),
+    ("name contains (2 chars)", {"query": "12"}),
+    ("name prefix", {"name_prefix": "trainee 12"}),
+    ("failed", {"passed": False}),
+    ("overall grade", {"grade": 2}),
+    ("failure reason", {"reason": "COMPONENT_BELOW_30_POINTS"}),
+    ("prefix + passed + grade", {"name_prefix": "trainee 5", "passed": True, "grade": 3}),
+)
+
+
+def bench_search(runner: Runner, size: int, entries):
+    index = SearchIndexService()
+    rng = random.Random(size)
+    labels = {"size": size}
+
+    runner.run("search", "build index", lambda: SearchIndexService().search(lambda: entries), size, **labels)
+    index.search(lambda: entries)
+    for name, filters in SEARCH_QUERIES:
+        runner.run("search", name, lambda: index.search(lambda: entries, **filters), **labels)
+    runner.run("search", "upsert", lambda: index.upsert([{**rng.choice(entries), "name": f"Renamed {rng.random()}"}]),
+               **labels)
+
+
+# Antworten von GET /exam/list und POST /exam/calculate/batch sowie storage.json vom Dict bis zu den Bytes,
+# einmal über jsonable_encoder und Ausgabemodelle wie früher, dann mit json_codec ohne und mit orjson
+def bench_serialization(runner: Runner, size: int, entries):
+    from backend.app.controller import exam_controller
+
+    vectorized = VectorizedExamCalculationService()
+    items = [(e["id"], e) for e in entries]
+    labels = {"size": size}
+
+    def batch_models():
+        inputs = [exam_controller._to_input(raw) for _, raw in items]
+        results = [BatchCalculationItem(id=entry_id, result=result)
+                   for (entry_id, _), result in zip(items, vectorized.calculateBatchResults(inputs))]
+        output = BatchCalculationOutput(results=results, total=size)
+        return JSONResponse(jsonable_encoder({"message": "Entries calculated successfully", "data": output})).body
+
+    runner.run("json", "list, jsonable_encoder", lambda: JSONResponse(jsonable_encoder(entries)).body, size, **labels)
+    runner.run("json", "batch, models", batch_models, size, **labels)
+    codecs = [("stdlib", False)] + ([("orjson", True)] if json_codec.orjson is not None else [])
+    for codec, fast in codecs:
+        with patch.object(json_codec, "fast", fast):
+            runner.run("json", f"list, {codec}", lambda: exam_controller._render(entries, plain=True).body,
+                       size, **labels)
+            runner.run("json", f"batch, {codec}", lambda: exam_controller._render_batch(items, vectorized).body,
+                       size, **labels)
+            runner.run("json", f"storage dump, {codec}", lambda: json_codec.dumps(entries, indent=True),
+                       size, **labels)
+            data = json_codec.dumps(entries, indent=True)
+            runner.run("json", f"storage load, {codec}", lambda: json_codec.loads(data), size, **labels)
+
+
+def bench_requests(runner: Runner, kind: str, size: int, entries, directory: str):
+    from fastapi.testclient import TestClient
+
+    from backend.app.controller import exam_controller
+    from backend.main import app
+
+    storage = create_prefilled_storage(kind, directory, [dict(e) for e in entries])
+    rng = random.Random(size)
+    ids = [e["id"] for e in entries]
+    payload = strip_metadata(entries[0])
+    batch_ids = ids[:1000]
+    labels = {"backend": kind, "size": size}
+
+    with patch.object(exam_controller, "file_service", storage), TestClient(app) as client:
+        runner.run("http", "GET /exam/{id}", lambda: client.get(f"/exam/{rng.choice(ids)}"), **labels)
+        runner.run("http", "GET /exam/calculate/{id}", lambda: client.get(f"/exam/calculate/{rng.choice(ids)}"),
+                   **labels)
+        runner.run("http", "GET /exam/list?limit=100", lambda: client.get("/exam/list", params={"limit": 100}),
+                   100, **labels)
+        runner.run("http", "GET /exam/list", lambda: client.get("/exam/list"), size, **labels)
+        runner.run("http", "GET /exam/search?q=", lambda: client.get("/exam/search", params={"q": "ee 12"}),
+                   **labels)
+        runner.run("http", "POST /exam/save", lambda: client.post("/exam/save", json=payload), **labels)
+        runner.run("http", "POST /exam/calculate/batch",
+                   lambda: client.post("/exam/calculate/batch", json={"ids": batch_ids}), len(batch_ids), **labels)
+
+
+def result_key(record: dict) -> tuple:
+    return tuple((k, record[k]) for k in ("group", "name", "backend", "size") if k in record)
+
+
+# vergleicht mit einem früheren Lauf, Faktor > 1 bedeutet langsamer als die Basis
+def compare(results, baseline_path: str):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {result_key(r): r for r in json.load(f)["results"]}
+    print(f"\ncompared with {baseline_path}")
+    for record in results:
+        base = baseline.get(result_key(record))
+        if base is None:
+            continue
+        ratio = record["mean_s"] / base["mean_s"]
+        label = " ".join(str(v) for _, v in result_key(record))
+        print(f"{label:<70} {ratio:6.2f}x")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for storage, calculation and HTTP hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--backends", nargs="+", choices=STORAGE_KINDS, default=list(STORAGE_KINDS))
+    parser.add_argument("--groups", nargs="+", choices=("storage", "calc", "search", "json", "http"),
+                        default=["storage", "calc", "search", "json", "http"])
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per measurement")
+    parser.add_argument("--max-iterations", type=int, default=200)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare against")
+    args = parser.parse_args(argv)
+
+    runner = Runner(args.budget, args.max_iterations)
+    for size in args.sizes:
+        # wie über die API gespeichert
+        entries = [{**entry, "validated": True} for entry in generate_entries(size)]
+        if "calc" in args.groups:
+            bench_calculation(runner, size, entries)
+        if "search" in args.groups:
+            bench_search(runner, size, entries)
+        if "json" in args.groups:
+            bench_serialization(runner, size, entries)
+        for kind in args.backends:
+            with tempfile.TemporaryDirectory() as directory:
+                if "storage" in args.groups:
+                    bench_storage(runner, kind, size, entries, directory)
+            with tempfile.TemporaryDirectory() as directory:
+                if "http" in args.groups:
+                    bench_requests(runner, kind, size, entries, directory)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "budget_s": args.budget,
+        },
+        "results": runner.results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(runner.results, args.compare)
+    return report
+
+
+if __name__ == "__main__":
+    main()
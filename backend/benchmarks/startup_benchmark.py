@@ -0,0 +1,103 @@
+# Misst den Kaltstart des Backends: Importzeit je Modul und Zeit bis /health bzw.
+# bis die Exam-Routen antworten. Aufruf aus dem Wurzelverzeichnis, z.B.:
+#   python -m backend.benchmarks.startup_benchmark --runs 5
+#   python -m backend.benchmarks.startup_benchmark --command dist_backend/backend/backend.exe
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+
+def import_times(module: str = "backend.main", top: int = 15) -> list:
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, check=True)
+    times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            times.append({"module": name, "cumulative_ms": int(cumulative) / 1000})
+        except ValueError:
+            continue
+    # je Paket zählt die kumulierte Zeit seines äußersten Moduls
+    top_level = {}
+    for record in times:
+        root = record["module"].split(".")[0]
+        top_level[root] = max(top_level.get(root, 0), record["cumulative_ms"])
+    ranked = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"package": name, "cumulative_ms": ms} for name, ms in ranked]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url: str, started: float, timeout: float) -> float:
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                response.read()
+                return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.005)
+    raise TimeoutError(f"{url} did not answer within {timeout} s")
+
+
+def startup_run(command: list, timeout: float) -> dict:
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        env = {**os.environ, "BACKEND_PORT": str(port),
+               "BACKEND_STORAGE_PATH": os.path.join(directory, "storage.json")}
+        started = time.perf_counter()
+        process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            healthy = wait_for(f"http://127.0.0.1:{port}/health", started, timeout)
+            ready = wait_for(f"http://127.0.0.1:{port}/exam/list?limit=1", started, timeout)
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return {"time_to_healthy_s": healthy, "time_to_ready_s": ready}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backend cold start timing")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--command", nargs="+", help="command that starts the backend (default: python -m backend.main)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    command = args.command or [sys.executable, "-m", "backend.main"]
+    modules = import_times()
+    print("import time of backend.main by package (cumulative):")
+    for record in modules:
+        print(f"  {record['package']:<30} {record['cumulative_ms']:8.1f} ms")
+
+    runs = [startup_run(command, args.timeout) for _ in range(args.runs)]
+    summary = {key: statistics.median(run[key] for run in runs) for key in ("time_to_healthy_s", "time_to_ready_s")}
+    print(f"\n{' '.join(command)} ({args.runs} runs, median)")
+    print(f"  time to /health      {summary['time_to_healthy_s'] * 1e3:8.1f} ms")
+    print(f"  time to /exam routes {summary['time_to_ready_s'] * 1e3:8.1f} ms")
+
+    report = {"command": command, "imports": modules, "runs": runs, "median": summary}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
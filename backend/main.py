@@ -1,9 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
 import os
 
-from backend.app.controller import exam_controller, root_controller
+from backend.app.controller import root_controller
+from backend.app.middleware.deferred_routes_middleware import DeferredRoutesMiddleware
+from backend.app.middleware.timing_middleware import TimingMiddleware
 
 LOG_CONFIG = {
     "version": 1,
@@ -48,18 +49,40 @@ origins = [
     "http://127.0.0.1:8000",
 ]
 
+# exam_controller (numpy, Pydantic-Modelle, Ablage) wird erst nach dem Start geladen,
+# damit /health möglichst früh antwortet
+def include_exam_router():
+    from backend.app.controller import exam_controller
+    app.include_router(exam_controller.router, prefix="/exam", tags=["Exam"])
+
+app.add_middleware(DeferredRoutesMiddleware, loader=include_exam_router, ready_paths=("/health", "/shutdown"))
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+app.add_middleware(TimingMiddleware)
 
 
-app.include_router(exam_controller.router, prefix="/exam", tags=["Exam"])
 app.include_router(root_controller.router, tags=["Root"])
 
 if __name__ == "__main__":
+    import multiprocessing
+    import uvicorn
+
+    # Worker-Prozesse starten per spawn auch aus der gepackten .exe
+    multiprocessing.freeze_support()
+    host = os.getenv("BACKEND_HOST", "127.0.0.1")
     port = int(os.getenv("BACKEND_PORT", 8000))
-    uvicorn.run(app, host="127.0.0.1", port=port, log_config=LOG_CONFIG)
+    workers = int(os.getenv("BACKEND_WORKERS", 1))
+    if workers > 1:
+        from backend.app.middleware.no_delay_protocol import NoDelayH11Protocol
+
+        # mehrere Prozesse auf derselben Ablage; uvicorn braucht dafür den Import-Pfad der App
+        uvicorn.run("backend.main:app", host=host, port=port, workers=workers, http=NoDelayH11Protocol,
+                    log_config=LOG_CONFIG)
+    else:
+        uvicorn.run(app, host=host, port=port, log_config=LOG_CONFIG)
@@ -0,0 +1,61 @@
+# Berechnet die Ergebnisse aller gespeicherten Einträge neu und speichert sie am Eintrag, z.B. nach
+# geänderten Notengrenzen. Die Ablage wird wie im Backend über BACKEND_STORAGE* gewählt.
+# Aufruf aus dem Wurzelverzeichnis, z.B.:
+#   python -m backend.recompute --workers 4
+#   BACKEND_STORAGE=sqlite python -m backend.recompute --chunk-size 10000 --output report.json
+#   python -m backend.recompute --ruleset ao2020
+import argparse
+import sys
+
+from backend.app.service.bulk_recompute_service import (
+    RECOMPUTE_CHUNK_SIZE,
+    RECOMPUTE_WRITE_SIZE,
+    BulkRecomputeService,
+)
+from backend.app.service.ruleset_service import rulesets
+from backend.app.service.storage_factory import create_storage
+
+
+def print_progress(report):
+    share = f"{report.processed / report.total:6.1%}" if report.total else "      "
+    workers = "  ".join(f"{w.pid}:{w.entries_per_second:,.0f}/s" for w in report.workers)
+    print(f"\r{report.processed:>10,}/{report.total:,} {share} {report.entries_per_second:10,.0f} entries/s  {workers}",
+          end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalculate and store the results of all stored entries")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU cores, 0: none)")
+    parser.add_argument("--chunk-size", type=int, default=RECOMPUTE_CHUNK_SIZE, help="entries per worker task")
+    parser.add_argument("--write-size", type=int, default=RECOMPUTE_WRITE_SIZE,
+                        help="entries collected before they are written to the storage")
+    parser.add_argument("--ruleset", help=f"grading ruleset id (default: {rulesets.default_id})")
+    parser.add_argument("--quiet", action="store_true", help="do not print progress")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+    try:
+        ruleset = rulesets.get(args.ruleset)
+    except ValueError as e:
+        parser.error(str(e))
+
+    service = BulkRecomputeService(create_storage(), workers=args.workers,
+                                   chunk_size=args.chunk_size, write_size=args.write_size,
+                                   ruleset=ruleset)
+    report = service.run(None if args.quiet else print_progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"{report.processed} entries under {service.ruleset.key} in {report.seconds:.2f} s "
+          f"({report.entries_per_second:,.0f} entries/s): "
+          f"{report.updated} updated, {report.unchanged} unchanged, {report.invalid} invalid, "
+          f"{report.conflicts} changed during the job")
+    for worker in report.workers:
+        print(f"  worker {worker.pid:<8} {worker.chunks:>5} chunks {worker.entries:>10} entries "
+              f"{worker.busy_seconds:8.2f} s busy {worker.entries_per_second:10,.0f} entries/s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report.model_dump_json(indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,22 @@
+import json
+
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from backend.app.controller import exam_controller
 from backend.app.controller.exam_controller import router
+from backend.app.model.batch_calculation_output import BatchCalculationOutput
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.service import json_codec
+from backend.app.service.binary_storage_service import BinaryStorageService
+from backend.app.service.exam_calculation_service import ExamCalculationService
+from backend.app.service.file_service import FileService
+from backend.app.service.result_cache_service import ResultCacheService
+from backend.app.service.ruleset_service import RULESETS_DIR, RulesetService
+from backend.app.service.search_index_service import SearchIndexService
+from backend.app.service.sqlite_service import SqliteService
+from backend.app.service.stats_service import StatsService
 
 app = FastAPI()
 app.include_router(router, prefix="/exam")
@@ -27,6 +42,28 @@ MOCK_ENTRY = {"id": "some_test_id", **VALID_PAYLOAD}
 
 from unittest.mock import patch, MagicMock
 
+
+# auch Tests, die file_service durch ein MagicMock ersetzen, sollen nie die Standardablage anlegen
+@pytest.fixture(autouse=True)
+def fresh_file_service(tmp_path):
+    with patch('backend.app.controller.exam_controller.file_service', FileService(str(tmp_path / "default.json"))) as service:
+        yield service
+
+@pytest.fixture(autouse=True)
+def fresh_result_cache():
+    with patch('backend.app.controller.exam_controller.result_cache', ResultCacheService()) as cache:
+        yield cache
+
+@pytest.fixture(autouse=True)
+def fresh_stats_service():
+    with patch('backend.app.controller.exam_controller.stats_service', StatsService()) as stats_service:
+        yield stats_service
+
+@pytest.fixture(autouse=True)
+def fresh_search_index():
+    with patch('backend.app.controller.exam_controller.search_index', SearchIndexService()) as search_index:
+        yield search_index
+
 @patch('backend.app.controller.exam_controller.file_service', new_callable=MagicMock)
 def test_get_all_results(mock_file_service):
     mock_file_service.load_all.return_value = []
@@ -149,3 +186,503 @@ def test_calculate_result_entry_not_found(mock_file_service):
 
     assert response.status_code == 404
     assert response.json() == {"detail": "Entry not found"}
+
+
+@patch('backend.app.controller.exam_controller.file_service', new_callable=MagicMock)
+def test_calculate_batch_by_ids_and_inline(mock_file_service):
+    mock_file_service.get_by_ids.return_value = {MOCK_ENTRY['id']: MOCK_ENTRY}
+    failing_payload = {"AP1": 20, "AP2": {"planning": {"main": 10}}}
+
+    response = client.post("/exam/calculate/batch", json={
+        "ids": [MOCK_ENTRY['id'], "an_id_that_does_not_exist"],
+        "entries": [failing_payload],
+    })
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total"] == 3
+    assert data["passed"] == 1
+    assert data["failed"] == 1
+    assert data["errors"] == 1
+    assert [item["id"] for item in data["results"]] == [MOCK_ENTRY['id'], "an_id_that_does_not_exist", None]
+    assert data["results"][0]["result"]["Status"]["passed"] is True
+    assert data["results"][1]["error"] == "Entry not found"
+    assert data["results"][2]["result"]["Status"]["reasons"] == [
+        "OVERALL_BELOW_50_POINTS", "AP2_OVERALL_BELOW_50_POINTS", "COMPONENT_BELOW_30_POINTS"
+    ]
+    mock_file_service.get_by_ids.assert_called_once_with([MOCK_ENTRY['id'], "an_id_that_does_not_exist"])
+    # ohne Ausgabemodelle aufgebaut, aber in deren Struktur
+    assert BatchCalculationOutput.model_validate(data).model_dump() == data
+
+
+@patch('backend.app.controller.exam_controller.file_service', new_callable=MagicMock)
+def test_calculate_all(mock_file_service):
+    mock_file_service.score_matrix.return_value = None
+    mock_file_service.load_all.return_value = [MOCK_ENTRY, {"id": "invalid", "AP1": 101}]
+
+    response = client.get("/exam/calculate/all")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total"] == 2
+    assert data["passed"] == 1
+    assert data["errors"] == 1
+    assert data["results"][1]["id"] == "invalid"
+    assert data["results"][1]["result"] is None
+    mock_file_service.load_all.assert_called_once()
+
+
+@pytest.fixture
+def stored_entries(tmp_path):
+    service = FileService(str(tmp_path / "storage.json"))
+    entries = [
+        service.save(FinalExamResultInput.model_validate({**VALID_PAYLOAD, "Name": name}).model_dump())
+        for name in ("Anna", "Ben", "Anton", "Carla", "Andrea")
+    ]
+    with patch('backend.app.controller.exam_controller.file_service', service):
+        yield entries
+
+
+def test_get_all_results_paginated(stored_entries):
+    first = client.get("/exam/list", params={"limit": 2})
+
+    assert first.status_code == 200
+    assert first.json() == stored_entries[:2]
+
+    second = client.get("/exam/list", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    third = client.get("/exam/list", params={"limit": 2, "cursor": second.headers["X-Next-Cursor"]})
+
+    assert second.json() == stored_entries[2:4]
+    assert third.json() == stored_entries[4:]
+    assert "X-Next-Cursor" not in third.headers
+
+
+def test_get_all_results_filtered_and_projected(stored_entries):
+    response = client.get("/exam/list", params={"name_prefix": "An", "fields": "name,ap1"})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": entry["id"], "name": entry["name"], "ap1": entry["ap1"]}
+        for entry in stored_entries if entry["name"].startswith("An")
+    ]
+
+
+def test_get_all_results_ndjson(stored_entries):
+    response = client.get("/exam/list", params={"format": "ndjson", "fields": "name"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": entry["id"], "name": entry["name"]} for entry in stored_entries
+    ]
+
+
+def test_get_all_results_pages_do_not_skip_entries_after_deletes(stored_entries):
+    first = client.get("/exam/list", params={"limit": 2})
+
+    client.delete(f"/exam/{stored_entries[0]['id']}")
+    second = client.get("/exam/list", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+
+    assert second.json() == stored_entries[2:4]
+
+
+def test_get_all_results_invalid_cursor(stored_entries):
+    response = client.get("/exam/list", params={"limit": 2, "cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+@patch('backend.app.controller.exam_controller.exam_calculation_service', new_callable=MagicMock)
+@patch('backend.app.controller.exam_controller.file_service', new_callable=MagicMock)
+def test_calculate_result_is_cached_until_update(mock_file_service, mock_calc_service, fresh_result_cache):
+    mock_file_service.get_by_id.return_value = MOCK_ENTRY
+    mock_calc_service.calculateExamResults.return_value = {"final_grade": 90.5, "passed": True}
+
+    for _ in range(3):
+        response = client.get(f"/exam/calculate/{MOCK_ENTRY['id']}")
+        assert response.json()["data"] == {"final_grade": 90.5, "passed": True}
+
+    mock_calc_service.calculateExamResults.assert_called_once()
+    assert fresh_result_cache.stats()["hits"] == 2
+
+    mock_file_service.update_by_id.return_value = MOCK_ENTRY
+    client.put(f"/exam/{MOCK_ENTRY['id']}", json=VALID_PAYLOAD)
+    client.get(f"/exam/calculate/{MOCK_ENTRY['id']}")
+
+    assert mock_calc_service.calculateExamResults.call_count == 2
+
+
+@patch('backend.app.controller.exam_controller.store_results', True)
+def test_stored_result_is_returned_without_recalculation(stored_entries):
+    entry = client.post("/exam/save", json=VALID_PAYLOAD).json()["data"]
+
+    assert entry["result"]["Overall"] == {"points": 91, "grade": 2}
+    assert "result_key" not in entry
+    assert "result_key" in exam_controller.file_service.get_by_id(entry["id"])
+
+    with patch('backend.app.controller.exam_controller.exam_calculation_service', new_callable=MagicMock) as mock_calc:
+        response = client.get(f"/exam/calculate/{entry['id']}")
+        mock_calc.calculateExamResults.assert_not_called()
+
+    assert response.status_code == 200
+    assert response.json()["data"] == entry["result"]
+
+
+@patch('backend.app.controller.exam_controller.store_results', True)
+def test_stored_result_is_ignored_when_input_changed(stored_entries):
+    entry = client.post("/exam/save", json=VALID_PAYLOAD).json()["data"]
+    # Eintrag wird direkt in der Ablage geändert, das gespeicherte Ergebnis ist damit veraltet
+    exam_controller.file_service.update_by_id(entry["id"], {**entry, "ap1": 10})
+
+    response = client.get(f"/exam/calculate/{entry['id']}")
+
+    assert response.json()["data"]["AP1"] == {"points": 10, "grade": 6}
+
+
+def test_validated_entry_is_calculated_without_revalidation(stored_entries):
+    entry = client.post("/exam/save", json=VALID_PAYLOAD).json()["data"]
+    assert exam_controller.file_service.get_by_id(entry["id"])["validated"] is True
+    expected = ExamCalculationService().calculateExamResults(FinalExamResultInput.model_validate(VALID_PAYLOAD))
+
+    with patch('backend.app.controller.exam_controller._to_input', new_callable=MagicMock) as mock_to_input:
+        response = client.get(f"/exam/calculate/{entry['id']}")
+        mock_to_input.assert_not_called()
+
+    assert response.status_code == 200
+    assert response.json()["data"] == expected.model_dump()
+
+
+def test_storage_metadata_is_not_returned(stored_entries):
+    entry = client.post("/exam/save", json=VALID_PAYLOAD).json()["data"]
+    exam_controller.file_service.update_by_id(entry["id"], {**entry, "validated": True, "result_key": "k",
+                                                            "result": {"Passed": True}})
+
+    responses = [
+        client.get(f"/exam/{entry['id']}").json(),
+        client.put(f"/exam/{entry['id']}", json=VALID_PAYLOAD).json()["data"],
+        *client.get("/exam/list").json(),
+        *client.get("/exam/list", params={"limit": 10, "fields": "name,validated"}).json(),
+        *[json.loads(line) for line in client.get("/exam/list", params={"format": "ndjson"}).text.splitlines()],
+        *client.get("/exam/search", params={"q": "test"}).json()["data"]["entries"],
+        *[json.loads(line) for line in client.get("/exam/export", params={"format": "ndjson"}).text.splitlines()],
+    ]
+
+    assert len(responses) > 2 + 2 * len(stored_entries)
+    for returned in responses:
+        assert "validated" not in returned
+        assert "result_key" not in returned
+    # ohne BACKEND_STORE_RESULTS=1 wird ein gespeichertes Ergebnis nicht ausgeliefert
+    assert "result" not in responses[0]
+
+
+def test_validated_entry_with_invalid_values_is_still_rejected(stored_entries):
+    entry = client.post("/exam/save", json=VALID_PAYLOAD).json()["data"]
+    exam_controller.file_service.update_by_id(entry["id"], {**entry, "ap1": 120})
+
+    response = client.get(f"/exam/calculate/{entry['id']}")
+
+    assert response.status_code == 400
+
+
+def test_list_answers_if_none_match_without_loading(stored_entries):
+    first = client.get("/exam/list")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    with patch.object(exam_controller.file_service, "load_all", side_effect=AssertionError):
+        unchanged = client.get("/exam/list", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+
+    # andere Parameter ergeben eine andere Darstellung
+    assert client.get("/exam/list", params={"limit": 2}).headers["ETag"] != etag
+
+    client.delete(f"/exam/{stored_entries[0]['id']}")
+    changed = client.get("/exam/list", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == len(stored_entries) - 1
+
+
+def test_entry_etag_only_changes_with_its_content(stored_entries):
+    entry_id = stored_entries[0]["id"]
+    etag = client.get(f"/exam/{entry_id}").headers["ETag"]
+
+    client.put(f"/exam/{stored_entries[1]['id']}", json={"Name": "Ben", "AP1": 10})
+    assert client.get(f"/exam/{entry_id}", headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+
+    client.put(f"/exam/{entry_id}", json={"Name": "Anna", "AP1": 10})
+    changed = client.get(f"/exam/{entry_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["ap1"] == 10
+
+
+def test_calculate_answers_if_none_match_without_calculating(stored_entries):
+    entry_id = stored_entries[0]["id"]
+    first = client.get(f"/exam/calculate/{entry_id}")
+    etag = first.headers["ETag"]
+
+    with patch.object(exam_controller.exam_calculation_service, "calculateResultDict", side_effect=AssertionError), \
+            patch.object(exam_controller.exam_calculation_service, "calculateExamResults", side_effect=AssertionError):
+        unchanged = client.get(f"/exam/calculate/{entry_id}", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    client.put(f"/exam/{entry_id}", json={"Name": "Anna", "AP1": 10})
+    changed = client.get(f"/exam/calculate/{entry_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_import_csv_reports_row_errors(stored_entries):
+    content = "name,ap1,pw_project\nDora,80,90\nEmil,120,\n"
+
+    response = client.post("/exam/import", content=content, headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 200
+    assert response.json()["data"]["imported"] == 1
+    assert response.json()["data"]["errors"][0]["row"] == 3
+    assert [e["name"] for e in client.get("/exam/list").json()][-1] == "Dora"
+
+
+def test_import_atomic_stores_nothing_on_error(stored_entries):
+    content = json.dumps({"Name": "Dora", "AP1": 80}) + "\n" + json.dumps({"Name": "Emil", "AP1": -1}) + "\n"
+
+    response = client.post("/exam/import", params={"format": "ndjson", "atomic": True}, content=content)
+
+    assert response.status_code == 200
+    assert response.json()["data"]["imported"] == 0
+    assert len(client.get("/exam/list").json()) == len(stored_entries)
+
+
+def test_import_unsupported_content_type():
+    response = client.post("/exam/import", content="{}", headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 415
+
+
+def test_export_csv_streams_entries_with_results(stored_entries):
+    response = client.get("/exam/export", params={"name_prefix": "An"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,name,ap1,")
+    assert len(lines) == 1 + sum(1 for e in stored_entries if e["name"].startswith("An"))
+
+
+def test_export_ndjson_round_trips_through_import(stored_entries):
+    exported = client.get("/exam/export", params={"format": "ndjson"})
+    rows = [json.loads(line) for line in exported.text.splitlines()]
+
+    assert [row["id"] for row in rows] == [e["id"] for e in stored_entries]
+    assert rows[0]["result"]["Overall"]["points"] == 91
+
+    response = client.post("/exam/import", content=exported.content, headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.json()["data"]["imported"] == len(stored_entries)
+    assert len(client.get("/exam/list").json()) == 2 * len(stored_entries)
+
+
+def test_export_ndjson_results_match_calculate(stored_entries):
+    exported = client.get("/exam/export", params={"format": "ndjson"})
+    rows = [json.loads(line) for line in exported.text.splitlines()]
+
+    for row in rows:
+        assert row["result"] == client.get(f"/exam/calculate/{row['id']}").json()["data"]
+
+
+def test_statistics_are_maintained_incrementally(stored_entries, fresh_stats_service):
+    first = client.get("/exam/stats").json()["data"]
+
+    assert first["total"] == len(stored_entries)
+    assert first["passed"] == len(stored_entries)
+    assert first["pass_rate"] == 1.0
+    assert first["components"]["Overall"]["grades"]["2"] == len(stored_entries)
+
+    client.delete(f"/exam/{stored_entries[0]['id']}")
+    client.put(f"/exam/{stored_entries[1]['id']}", json={"Name": "Ben", "AP1": 10})
+    client.post("/exam/save", json={"Name": "Dora"})
+
+    # nach dem Aufwärmen wird die Ablage nicht mehr gelesen
+    with patch.object(exam_controller.file_service, "iter_entries", side_effect=AssertionError):
+        stats = client.get("/exam/stats").json()["data"]
+
+    assert stats["total"] == len(stored_entries)
+    assert stats["passed"] == len(stored_entries) - 1
+    assert stats["failed"] == 1
+    assert stats["failure_reasons"]["OVERALL_BELOW_50_POINTS"] == 1
+    assert stats["components"]["ap1"]["count"] == len(stored_entries) - 1
+    assert stats["components"]["ap1"]["grades"]["6"] == 1
+
+
+def test_solve_required_scores_for_partial_input():
+    payload = {"Name": "Anna", "AP1": 80, "AP2": {"planning": {"main": 70}, "development": {"main": 90},
+                                                   "economy": {"main": 60}, "pw": {"project": 90}}}
+
+    response = client.post("/exam/solve", json=payload, params={"assumed": 50})
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["outstanding"] == ["pw_presentation"]
+    assert data["assumed"] == 50
+    assert data["components"]["pw_presentation"]["passed"] == 0
+    assert set(data["components"]["pw_presentation"]["grades"]) == {"1", "2", "3", "4"}
+
+
+def test_solve_required_scores_for_stored_entry(stored_entries):
+    entry = client.post("/exam/save", json={"Name": "Ben", "AP1": 70}).json()["data"]
+
+    response = client.get(f"/exam/solve/{entry['id']}")
+
+    assert response.status_code == 200
+    assert response.json()["data"]["outstanding"] == [
+        "planning_main", "development_main", "economy_main", "pw_project", "pw_presentation"]
+    assert client.get("/exam/solve/an_id_that_does_not_exist").status_code == 404
+
+
+@pytest.fixture
+def strict_ruleset(tmp_path):
+    with open(f"{RULESETS_DIR}/ao2020.json", encoding="utf-8") as f:
+        definition = {**json.load(f), "id": "strict", "grade_thresholds": [95, 90, 85, 80, 60]}
+    directory = tmp_path / "rulesets"
+    directory.mkdir()
+    (directory / "strict.json").write_text(json.dumps(definition), encoding="utf-8")
+    service = RulesetService([RULESETS_DIR, str(directory)])
+    # das konfigurierte Regelwerk bleibt dasselbe Objekt wie in den Diensten des Controllers
+    service._compiled["ao2020"] = exam_controller.exam_calculation_service.ruleset
+    with patch('backend.app.controller.exam_controller.rulesets', service):
+        yield service
+
+
+def test_list_rulesets(strict_ruleset):
+    response = client.get("/exam/rulesets")
+
+    assert response.status_code == 200
+    assert response.json()["default"] == "ao2020"
+    assert [ruleset["id"] for ruleset in response.json()["data"]] == ["ao2020", "strict"]
+
+
+def test_calculate_under_another_ruleset(stored_entries, strict_ruleset):
+    entry_id = stored_entries[0]["id"]
+
+    default = client.get(f"/exam/calculate/{entry_id}")
+    strict = client.get(f"/exam/calculate/{entry_id}", params={"ruleset": "strict"})
+
+    assert default.json()["data"]["AP1"] == {"points": 85, "grade": 2}
+    assert strict.json()["data"]["AP1"] == {"points": 85, "grade": 3}
+    # dieselbe Eingabe unter anderen Regeln ist eine andere Darstellung
+    assert strict.headers["ETag"] != default.headers["ETag"]
+    batch = client.post("/exam/calculate/batch", json={"ids": [entry_id]}, params={"ruleset": "strict"}).json()
+    assert batch["data"]["results"][0]["result"]["AP1"]["grade"] == 3
+
+
+def test_unknown_ruleset_is_rejected(stored_entries):
+    response = client.get(f"/exam/calculate/{stored_entries[0]['id']}", params={"ruleset": "ao1999"})
+
+    assert response.status_code == 400
+    assert "Unknown ruleset" in response.json()["detail"]
+    assert client.post("/exam/solve", json=VALID_PAYLOAD, params={"ruleset": "ao1999"}).status_code == 400
+
+
+def test_search_by_name_and_status(stored_entries):
+    response = client.get("/exam/search", params={"name_prefix": "an"})
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total"] == 3
+    assert [entry["name"] for entry in data["entries"]] == ["Anna", "Anton", "Andrea"]
+
+    # Änderungen über die API werden im Index fortgeschrieben
+    client.put(f"/exam/{stored_entries[1]['id']}", json={"Name": "Bert", "AP1": 10})
+    client.delete(f"/exam/{stored_entries[0]['id']}")
+    failed = client.get("/exam/search", params={"passed": False}).json()["data"]
+    assert [entry["name"] for entry in failed["entries"]] == ["Bert"]
+    assert client.get("/exam/search", params={"q": "ANTO"}).json()["data"]["total"] == 1
+    assert client.get("/exam/search", params={"q": "nna"}).json()["data"]["total"] == 0
+    by_reason = client.get("/exam/search", params={"reason": "OVERALL_BELOW_50_POINTS", "limit": 1}).json()["data"]
+    assert by_reason["total"] == 1
+    assert by_reason["entries"][0]["id"] == stored_entries[1]["id"]
+
+
+def test_search_rejects_unknown_reason(stored_entries):
+    response = client.get("/exam/search", params={"reason": "NOT_A_REASON"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.skipif(json_codec.orjson is None, reason="orjson is not installed")
+def test_fast_json_responses_match_default_responses(stored_entries, monkeypatch):
+    requests = [
+        ("get", "/exam/list", None),
+        ("get", f"/exam/{stored_entries[0]['id']}", None),
+        ("get", "/exam/list?format=ndjson", None),
+        ("get", f"/exam/calculate/{stored_entries[1]['id']}", None),
+        ("post", "/exam/calculate/batch", {"ids": [entry["id"] for entry in stored_entries], "entries": [{"AP1": 20}]}),
+        ("get", "/exam/stats", None),
+        ("get", "/exam/search?q=an", None),
+        ("post", "/exam/solve", {"AP1": 60}),
+    ]
+
+    def responses():
+        return [getattr(client, method)(url, **({"json": body} if body else {})) for method, url, body in requests]
+
+    default = responses()
+    monkeypatch.setattr(json_codec, "fast", True)
+    fast = responses()
+
+    for response, fast_response in zip(default, fast):
+        assert fast_response.status_code == response.status_code == 200
+        assert fast_response.content == response.content
+
+
+def test_binary_storage_is_calculated_from_its_score_matrix(tmp_path, monkeypatch):
+    service = BinaryStorageService(str(tmp_path / "storage.bin"))
+    payloads = [VALID_PAYLOAD, {"AP1": 20, "AP2": {"planning": {"main": 10}}}, {"Name": "empty"}]
+    service.save_many([{**FinalExamResultInput.model_validate(p).model_dump(), "validated": True} for p in payloads])
+
+    with patch('backend.app.controller.exam_controller.file_service', service):
+        monkeypatch.setattr(service, "load_all", MagicMock(side_effect=AssertionError("load_all")))
+        from_matrix = client.get("/exam/calculate/all").json()
+        stats_from_matrix = client.get("/exam/stats").json()
+        monkeypatch.undo()
+
+        monkeypatch.setattr(service, "score_matrix", lambda: None)
+        exam_controller.stats_service.invalidate()
+        assert client.get("/exam/calculate/all").json() == from_matrix
+        assert client.get("/exam/stats").json() == stats_from_matrix
+    assert from_matrix["data"]["passed"] == 2
+
+
+def test_binary_storage_with_invalid_scores_falls_back_to_entries(tmp_path):
+    service = BinaryStorageService(str(tmp_path / "storage.bin"))
+    service.save_many([FinalExamResultInput.model_validate(VALID_PAYLOAD).model_dump(), {"name": "x", "ap1": 150}])
+
+    with patch('backend.app.controller.exam_controller.file_service', service):
+        data = client.get("/exam/calculate/all").json()["data"]
+        stats = client.get("/exam/stats").json()["data"]
+
+    assert (data["passed"], data["errors"]) == (1, 1)
+    assert data["results"][1]["result"] is None
+    assert (stats["total"], stats["invalid"], stats["passed"]) == (2, 1, 1)
+
+
+@pytest.mark.parametrize("storage", ["sqlite", "binary"])
+def test_deleting_a_missing_entry_keeps_derived_indexes(tmp_path, storage, fresh_stats_service, fresh_search_index):
+    service = SqliteService(str(tmp_path / "storage.db")) if storage == "sqlite" else \
+        BinaryStorageService(str(tmp_path / "storage.bin"))
+    with patch('backend.app.controller.exam_controller.file_service', service):
+        client.post("/exam/save", json=VALID_PAYLOAD)
+        client.get("/exam/stats")
+        client.get("/exam/search", params={"q": "test"})
+        client.post("/exam/save", json={"Name": "Dora"})
+        etag = client.get("/exam/list").headers["ETag"]
+
+        assert client.delete("/exam/an_id_that_does_not_exist").status_code == 404
+
+        assert fresh_stats_service._warm and fresh_search_index._warm
+        assert client.get("/exam/list", headers={"If-None-Match": etag}).status_code == 304
+        with patch.object(service, "iter_entries", side_effect=AssertionError):
+            assert client.get("/exam/stats").json()["data"]["total"] == 2
+            assert client.get("/exam/search", params={"q": "dora"}).json()["data"]["total"] == 1
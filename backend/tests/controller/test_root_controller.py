@@ -0,0 +1,75 @@
+import threading
+from unittest.mock import patch
+
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from backend.app.controller.root_controller import router
+from backend.app.middleware.deferred_routes_middleware import DeferredRoutesMiddleware
+from backend.app.middleware.timing_middleware import TimingMiddleware
+
+app = FastAPI()
+app.add_middleware(TimingMiddleware)
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_health():
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_metrics_contains_request_latency_by_route():
+    client.get("/health")
+    client.get("/does-not-exist")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert 'route="unmatched",status="404"' in response.text
+    assert "# TYPE calculation_duration_seconds histogram" in response.text
+
+
+def test_metrics_label_routes_with_their_router_prefix(tmp_path):
+    from backend.app.controller import exam_controller
+    from backend.app.service.file_service import FileService
+    from backend.main import app as main_app
+
+    with patch.object(exam_controller, "file_service", FileService(str(tmp_path / "storage.json"))), \
+            TestClient(main_app) as main_client:
+        assert main_client.get("/exam/calculate/some_id").status_code == 404
+        assert main_client.get("/exam/some_id").status_code == 404
+        assert main_client.get("/exam/list").status_code == 200
+
+        metrics = main_client.get("/metrics").text
+
+    assert 'route="/exam/calculate/{entry_id}",status="404"' in metrics
+    assert 'route="/exam/{entry_id}",status="404"' in metrics
+    assert 'route="/exam/list",status="200"' in metrics
+    assert 'route="/calculate/{entry_id}"' not in metrics
+
+
+def test_health_answers_before_deferred_routes_are_loaded():
+    loaded = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        release.wait(5)
+        deferred_app.include_router(APIRouter(routes=[APIRoute("/late", lambda: {"late": True})]))
+        loaded.set()
+
+    deferred_app = FastAPI()
+    deferred_app.add_middleware(DeferredRoutesMiddleware, loader=loader, ready_paths=("/health",))
+    deferred_app.include_router(router)
+    deferred_client = TestClient(deferred_app)
+
+    assert deferred_client.get("/health").status_code == 200
+    assert not loaded.is_set()
+
+    release.set()
+    assert deferred_client.get("/late").json() == {"late": True}
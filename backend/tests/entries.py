@@ -0,0 +1,29 @@
+import random
+import uuid
+from typing import List, Optional
+
+
+# zufällige, aber reproduzierbare Prüflinge für die Service-Tests
+def generate_entry(rng: random.Random) -> dict:
+    def score(missing: float = 0.05) -> Optional[int]:
+        return None if rng.random() < missing else rng.randint(0, 100)
+
+    def part() -> dict:
+        return {"main": score(), "extra": score(0.8)}
+
+    return {
+        "name": f"Trainee {rng.randint(0, 10 ** 6):06d}",
+        "ap1": score(),
+        "ap2": {
+            "planning": part(),
+            "development": part(),
+            "economy": part(),
+            "pw": {"project": score(), "presentation": score()},
+        },
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+    }
+
+
+def generate_entries(count: int, seed: int = 42) -> List[dict]:
+    rng = random.Random(seed)
+    return [generate_entry(rng) for _ in range(count)]
@@ -0,0 +1,192 @@
+import os
+
+import numpy as np
+import pytest
+
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.service.binary_codec import HEADER, RECORD
+from backend.app.service.binary_storage_service import BinaryStorageService
+from backend.app.service.vectorized_calculation_service import MISSING, row_from_entry
+from backend.tests.entries import generate_entries
+
+
+def dump(data: dict) -> dict:
+    return FinalExamResultInput.model_validate(data).model_dump()
+
+
+@pytest.fixture
+def binary_service(tmp_path):
+    return BinaryStorageService(filepath=str(tmp_path / "storage.bin"))
+
+
+@pytest.fixture
+def populated_binary_service(binary_service):
+    entry1 = binary_service.save(dump({"name": "Anna", "ap1": 80, "ap2": {"planning": {"main": 70}}}))
+    entry2 = binary_service.save(dump({"name": "Ben", "ap2": {"pw": {"project": 0, "presentation": 100}}}))
+    return binary_service, [entry1, entry2]
+
+
+class TestBinaryStorageService:
+    def test_load_all_on_empty_file(self, binary_service):
+        assert binary_service.load_all() == []
+        assert os.path.getsize(binary_service.filepath) == HEADER.size
+
+    def test_round_trip_keeps_model_dump_shape(self, binary_service):
+        entries = [
+            dump({"name": "Anna", "ap1": 80, "ap2": {"planning": {"main": 70, "extra": 60}, "pw": {}}}),
+            dump({"name": "", "ap2": {"economy": {}}}),
+            dump({}),
+            dump({"name": "Ünïcødé", "ap1": 0}),
+        ]
+        saved = [binary_service.save(dict(entry)) for entry in entries]
+
+        reopened = BinaryStorageService(filepath=binary_service.filepath)
+
+        assert reopened.load_all() == saved
+        assert [{k: v for k, v in e.items() if k != "id"} for e in reopened.load_all()] == entries
+
+    def test_validated_marker_is_kept_as_flag(self, binary_service):
+        saved = binary_service.save({**dump({"name": "Anna", "ap1": 80}), "validated": True})
+        other = binary_service.save(dump({"name": "Ben"}))
+
+        assert binary_service.get_by_id(saved["id"])["validated"] is True
+        assert "validated" not in binary_service.get_by_id(other["id"])
+
+    def test_records_have_fixed_width(self, binary_service):
+        binary_service.save_many([dump({"name": "x" * 500}), dump({"name": "y"})])
+
+        assert os.path.getsize(binary_service.filepath) == HEADER.size + 2 * RECORD.size
+
+    def test_get_by_id_and_index(self, populated_binary_service):
+        service, entries = populated_binary_service
+
+        assert service.get_by_id(entries[1]["id"]) == entries[1]
+        assert service.get_by_index(0) == entries[0]
+        assert service.get_by_id("not-a-uuid") is None
+        assert service.get_by_ids([entries[0]["id"], "missing"]) == {entries[0]["id"]: entries[0]}
+
+    def test_delete_leaves_tombstone_until_compaction(self, populated_binary_service):
+        service, entries = populated_binary_service
+
+        assert service.delete_by_id(entries[0]["id"]) is True
+        assert service.delete_by_id(entries[0]["id"]) is False
+        assert service.load_all() == [entries[1]]
+        assert service.get_by_index(0) is None
+
+        service.compact()
+
+        assert os.path.getsize(service.filepath) == HEADER.size + RECORD.size
+        assert BinaryStorageService(filepath=service.filepath).load_all() == [entries[1]]
+        assert not os.path.exists(service.filepath + ".names.0")
+
+    def test_updates_and_deletes_are_compacted_automatically(self, tmp_path):
+        service = BinaryStorageService(filepath=str(tmp_path / "storage.bin"), compaction_threshold=20,
+                                       compaction_name_bytes=2000)
+        entries = service.save_many([dump({"name": f"Trainee {i}", "ap1": i}) for i in range(50)])
+        names_path = lambda: service.filepath + f".names.{service._generation}"
+
+        for round_number in range(20):
+            for i, entry in enumerate(entries):
+                # jeder zweite Eintrag bekommt einen neuen Namen, die anderen nur neue Punkte
+                name = f"Renamed {round_number} {i}" if i % 2 else entry["name"]
+                entries[i] = service.update_by_id(entry["id"], dump({"name": name, "ap1": round_number}))
+            for _ in range(5):
+                service.delete_by_id(entries.pop()["id"])
+            entries.extend(service.save_many([dump({"name": f"New {round_number} {i}"}) for i in range(5)]))
+
+            assert os.path.getsize(service.filepath) < HEADER.size + (50 + 20) * RECORD.size
+            assert os.path.getsize(names_path()) < 2000 + 50 * len("Renamed 19 49")
+
+        assert service._generation > 0
+        assert service.load_all() == entries
+        assert BinaryStorageService(filepath=service.filepath).load_all() == entries
+
+    def test_update_in_place(self, populated_binary_service):
+        service, entries = populated_binary_service
+
+        updated = service.update_by_id(entries[0]["id"], dump({"name": "Anna Updated", "ap1": 90}))
+
+        assert service.load_all() == [updated, entries[1]]
+        assert os.path.getsize(service.filepath) == HEADER.size + 2 * RECORD.size
+        assert service.update_by_id("non_existent_id", dump({})) is None
+
+    def test_changes_from_other_instances_are_visible(self, populated_binary_service):
+        service, entries = populated_binary_service
+        other = BinaryStorageService(filepath=service.filepath)
+        assert other.get_by_id(entries[0]["id"]) == entries[0]
+
+        added = service.save(dump({"name": "Carla"}))
+        service.delete_by_id(entries[0]["id"])
+
+        assert other.get_by_id(added["id"]) == added
+        assert other.get_by_id(entries[0]["id"]) is None
+
+        service.compact()
+        assert other.load_all() == [entries[1], added]
+
+    def test_version_changes_with_writes_from_other_instances(self, populated_binary_service):
+        service, entries = populated_binary_service
+        other = BinaryStorageService(filepath=service.filepath)
+        version = service.version()
+        assert other.version() == version
+
+        other.delete_by_id(entries[0]["id"])
+
+        assert other.last_write_versions == (version, other.version())
+        assert service.version() == other.version() != version
+
+    def test_version_stays_when_nothing_was_written(self, populated_binary_service):
+        service, entries = populated_binary_service
+        version = service.version()
+
+        assert service.delete_by_id("non_existent_id") is False
+        assert service.update_by_id("non_existent_id", dump({})) is None
+
+        assert service.version() == version
+
+    def test_iter_entries_with_cursor_and_prefix(self, binary_service):
+        saved = binary_service.save_many([dump({"name": n}) for n in ("Anna", "Ben", "Andrea", "Anton")])
+        binary_service.delete_by_id(saved[2]["id"])
+
+        first = list(binary_service.iter_entries(name_prefix="An"))
+
+        assert [e for _, e in first] == [saved[0], saved[3]]
+        assert [e for _, e in binary_service.iter_entries(cursor=first[0][0])] == saved[1:2] + saved[3:]
+
+    def test_cursor_survives_deletes_and_compaction(self, binary_service):
+        saved = binary_service.save_many([dump({"name": str(i)}) for i in range(6)])
+        cursor, _ = list(binary_service.iter_entries())[2]
+
+        binary_service.delete_by_id(saved[0]["id"])
+        binary_service.delete_by_id(saved[1]["id"])
+        binary_service.compact()
+
+        assert [e for _, e in binary_service.iter_entries(cursor=cursor)] == saved[3:]
+        with pytest.raises(ValueError):
+            binary_service.parse_cursor("abc:def")
+
+    def test_torn_tail_is_truncated(self, populated_binary_service):
+        service, entries = populated_binary_service
+        with open(service.filepath, "ab") as f:
+            f.write(b"\x01\x02\x03")
+
+        assert BinaryStorageService(filepath=service.filepath).load_all() == entries
+
+    def test_unsupported_values_are_rejected(self, binary_service):
+        with pytest.raises(ValueError):
+            binary_service.save({"name": "Anna", "value": 100})
+        with pytest.raises(ValueError):
+            binary_service.save({"name": "Anna", "ap1": 300})
+        assert binary_service.load_all() == []
+
+    def test_score_matrix_without_dicts(self, binary_service):
+        entries = [{k: v for k, v in e.items() if k != "id"} for e in generate_entries(50)]
+        saved = binary_service.save_many(entries)
+        binary_service.delete_by_id(saved[0]["id"])
+
+        ids, scores = binary_service.score_matrix()
+
+        assert ids == [e["id"] for e in saved[1:]]
+        assert scores.dtype == np.int16
+        assert scores.tolist() == [list(row_from_entry(e)) for e in saved[1:]]
+        assert (scores == MISSING).any()
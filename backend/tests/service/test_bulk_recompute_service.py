@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.service.binary_storage_service import BinaryStorageService
+from backend.app.service.bulk_recompute_service import BulkRecomputeService
+from backend.app.service.exam_calculation_service import ExamCalculationService
+from backend.app.service.file_service import FileService
+from backend.app.service.result_cache_service import result_key
+from backend.app.service.ruleset_service import RULESETS_DIR, RulesetService
+from backend.app.service.sqlite_service import SqliteService
+from backend.tests.entries import generate_entries
+
+
+def expected_result(entry):
+    data = {key: entry.get(key) for key in ("name", "ap1", "ap2")}
+    return ExamCalculationService().calculateExamResults(FinalExamResultInput.model_validate(data)).model_dump()
+
+
+@pytest.fixture
+def stored(tmp_path):
+    service = FileService(str(tmp_path / "storage.json"), journal=True)
+    entries = service.save_many([{**entry, "validated": True} for entry in generate_entries(30, seed=3)])
+    return service, entries
+
+
+class TestBulkRecomputeService:
+    def test_results_match_single_calculation(self, stored):
+        service, entries = stored
+
+        report = BulkRecomputeService(service, workers=0, chunk_size=7).run()
+
+        assert (report.total, report.processed, report.updated, report.unchanged) == (30, 30, 30, 0)
+        for entry in entries:
+            saved = service.get_by_id(entry["id"])
+            assert saved["result"] == expected_result(entry)
+            assert saved["result_key"] == result_key(entry, "ao2020@1")
+        assert BulkRecomputeService(service, workers=0).run().unchanged == 30
+
+    def test_invalid_entries_lose_stale_results(self, stored):
+        service, entries = stored
+        service.update_by_id(entries[0]["id"], {**entries[0], "ap1": 150, "result": {"stale": True}, "result_key": "x"})
+        # nicht über die API gespeichert und nicht gültig für das Eingabemodell
+        service.update_by_id(entries[1]["id"], {"name": "Ben", "ap1": 80, "comment": "hand edited"})
+
+        report = BulkRecomputeService(service, workers=0).run()
+
+        assert report.invalid == 2
+        assert (report.updated, report.unchanged, report.conflicts) == (28, 0, 0)
+        assert report.invalid + report.updated + report.unchanged + report.conflicts == report.total
+        assert "result" not in service.get_by_id(entries[0]["id"])
+        assert "result" not in service.get_by_id(entries[1]["id"])
+
+    def test_entries_changed_during_the_job_are_not_overwritten(self, stored):
+        service, entries = stored
+        changed = []
+
+        def progress(report):
+            if not changed:
+                changed.append(service.update_by_id(entries[0]["id"], {**entries[0], "ap1": 10}))
+
+        report = BulkRecomputeService(service, workers=0, chunk_size=10).run(progress)
+
+        assert report.conflicts == 1
+        assert report.updated == 29
+        assert report.invalid + report.updated + report.unchanged + report.conflicts == report.total
+        assert service.get_by_id(entries[0]["id"]) == changed[0]
+
+    def test_process_pool_reports_throughput_per_worker(self, tmp_path):
+        service = SqliteService(str(tmp_path / "storage.db"))
+        entries = service.save_many(generate_entries(40, seed=4))
+        progress = []
+
+        report = BulkRecomputeService(service, workers=2, chunk_size=10).run(lambda r: progress.append(r.processed))
+
+        assert report.updated == 40
+        assert progress == [10, 20, 30, 40]
+        assert sum(worker.entries for worker in report.workers) == 40
+        assert all(worker.entries_per_second > 0 for worker in report.workers)
+        assert service.get_by_id(entries[5]["id"])["result"] == expected_result(entries[5])
+        service.close()
+
+    def test_results_are_recalculated_under_another_ruleset(self, stored, tmp_path):
+        service, entries = stored
+        with open(f"{RULESETS_DIR}/ao2020.json", encoding="utf-8") as f:
+            definition = {**json.load(f), "id": "lenient", "grade_thresholds": [80, 70, 60, 40, 20]}
+        directory = tmp_path / "rulesets"
+        directory.mkdir()
+        (directory / "lenient.json").write_text(json.dumps(definition), encoding="utf-8")
+        lenient = RulesetService([str(directory)]).get("lenient")
+        BulkRecomputeService(service, workers=0).run()
+
+        report = BulkRecomputeService(service, workers=2, chunk_size=10, ruleset=lenient).run()
+
+        assert report.updated == 30
+        saved = service.get_by_id(entries[0]["id"])
+        assert saved["result_key"] == result_key(entries[0], "lenient@1")
+        assert saved["result"] == ExamCalculationService(lenient).calculateExamResults(
+            FinalExamResultInput.model_validate({key: entries[0].get(key) for key in ("name", "ap1", "ap2")})).model_dump()
+
+    def test_storage_without_results_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            BulkRecomputeService(BinaryStorageService(str(tmp_path / "storage.bin")))
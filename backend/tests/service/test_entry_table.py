@@ -0,0 +1,65 @@
+import pytest
+
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.service.entry_table import FLAG_DICT, EntryTable
+from backend.tests.entries import generate_entries
+
+
+def stored(data: dict, entry_id: str) -> dict:
+    return {**FinalExamResultInput.model_validate(data).model_dump(), "validated": True, "id": entry_id}
+
+
+class TestEntryTable:
+    def test_round_trip_of_stored_entries(self):
+        entries = [{**entry, "validated": True} for entry in generate_entries(200)] + [
+            stored({}, "empty"), stored({"name": "Ünïcødé", "ap2": {"pw": {}}}, "pw-only")]
+
+        table = EntryTable(entries)
+
+        assert len(table) == len(entries)
+        assert list(table.entries()) == entries
+        assert table.get(entries[0]["id"]) == entries[0]
+        assert table.get("missing") is None
+        assert not table._dicts
+
+    @pytest.mark.parametrize("entry", [
+        {"name": "Anna", "value": 100, "id": "a"},
+        {**stored({"AP1": 80}, "b"), "result": {"Overall": {"points": 80, "grade": 3}}},
+        {**stored({"AP1": 80}, "c"), "validated": False},
+        {"name": "Anna", "ap1": True, "ap2": None, "id": "d"},
+        {"name": "Anna", "ap1": 80.5, "ap2": None, "id": "e"},
+        {"name": "Anna", "ap1": None, "ap2": {"planning": {"main": 80}}, "id": "f"},
+    ])
+    def test_entries_that_cannot_be_encoded_exactly_are_kept_as_dicts(self, entry):
+        table = EntryTable([entry])
+
+        assert table.get(entry["id"]) is entry
+        assert table._flags[0] == FLAG_DICT
+
+    def test_put_replaces_in_place(self):
+        table = EntryTable([stored({"Name": "Anna"}, "a"), stored({"Name": "Ben"}, "b")])
+
+        table.put({"name": "Anna", "value": 1, "id": "a"})
+        table.put(stored({"Name": "Anna", "AP1": 50}, "a"))
+
+        assert [entry["name"] for entry in table.entries()] == ["Anna", "Ben"]
+        assert table.get("a")["ap1"] == 50
+        assert not table._dicts
+
+    def test_delete_leaves_tombstone_until_compaction(self, monkeypatch):
+        monkeypatch.setattr("backend.app.service.entry_table.COMPACTION_MIN_DELETED", 3)
+        table = EntryTable([stored({"Name": str(i)}, str(i)) for i in range(5)])
+
+        assert table.delete("1") is True
+        assert table.delete("1") is False
+        assert table.live_rows(0, 2) == [0, 2]
+        assert table.row_of_position(1) == 2
+        assert table.layout == 0
+
+        table.delete("2")
+        table.delete("3")
+
+        assert table.layout == 1
+        assert [entry["name"] for entry in table.entries()] == ["0", "4"]
+        assert table.row_of_position(1) == 1
+        assert table.get("4")["name"] == "4"
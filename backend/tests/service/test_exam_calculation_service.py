@@ -1,7 +1,29 @@
 import unittest
 
 from backend.app.model.final_exam_result_input import AP2, AP2Part, FinalExamResultInput, PW
-from backend.app.service.exam_calculation_service import ExamCalculationService
+from backend.app.model.final_exam_result_output import FinalExamResultOutput
+from backend.app.service.exam_calculation_service import (
+    ExamCalculationService,
+    scores_from_input,
+)
+from backend.app.service.result_cache_service import strip_metadata
+from backend.tests.entries import generate_entries
+
+
+# Formeln des Regelwerks ao2020, gegen die die Nachschlagetabellen geprüft werden
+def reference_grade(p: float) -> int:
+    if p >= 92: return 1
+    if p >= 81: return 2
+    if p >= 67: return 3
+    if p >= 50: return 4
+    if p >= 30: return 5
+    return 6
+
+def reference_ap2_part(main: int, extra: int) -> int:
+    return round((2.0 / 3.0) * float(main) + (1.0 / 3.0) * float(extra))
+
+def reference_pw_overall(project: int, presentation: int) -> int:
+    return round(0.5 * project + 0.5 * presentation)
 
 
 class TestExamCalculationService(unittest.TestCase):
@@ -125,3 +147,26 @@ class TestExamCalculationService(unittest.TestCase):
         self.assertIsNone(result.AP2.pw.presentation.points)
         self.assertIsNone(result.Overall.grade)
         self.assertIsNone(result.Overall.points)
+
+    def test_lookup_tables_match_reference_formulas(self):
+        for main in range(101):
+            self.assertEqual(self.service._grade_from_points(main), reference_grade(float(main)))
+            for extra in range(101):
+                self.assertEqual(
+                    self.service._calculate_ap2_part(AP2Part(main=main, extra=extra)),
+                    reference_ap2_part(main, extra),
+                )
+                self.assertEqual(self.service._calculate_pw_overall(main, extra), reference_pw_overall(main, extra))
+
+    def test_calculate_pw_overall_with_missing_parts(self):
+        self.assertIsNone(self.service._calculate_pw_overall(None, None))
+        self.assertEqual(self.service._calculate_pw_overall(70, None), 70)
+        self.assertEqual(self.service._calculate_pw_overall(None, 65), 65)
+        self.assertEqual(self.service._calculate_pw_overall(70, 65), 68)
+
+    def test_result_dict_on_plain_scores_matches_output_model(self):
+        for entry in generate_entries(500) + [{}, {"ap2": {"pw": {}}}]:
+            finalExamResult = FinalExamResultInput.model_validate(strip_metadata(entry))
+            result_dict = self.service.calculateResultDict(scores_from_input(finalExamResult))
+            self.assertEqual(FinalExamResultOutput.dump_result_dict(result_dict),
+                             self.service.calculateExamResults(finalExamResult).model_dump())
@@ -0,0 +1,72 @@
+import random
+
+from backend.app.service.exam_calculation_service import ExamCalculationService
+from backend.app.service.exam_solver_service import OUTSTANDING_COLUMNS, SOLVER_GRADES, ExamSolverService
+
+
+def brute_force(scores, varied, assumed):
+    # erste Punktzahl, ab der das Ziel erreicht wird, durch Ausprobieren aller Werte
+    calculation = ExamCalculationService()
+    filled = [assumed if i in OUTSTANDING_COLUMNS and v is None else v for i, v in enumerate(scores)]
+    outcomes = []
+    for points in range(101):
+        row = list(filled)
+        for i in varied:
+            row[i] = points
+        result = calculation.calculateResultDict(tuple(row))
+        outcomes.append((result["Passed"], result["Overall"]["grade"]))
+
+    def minimum(reached):
+        return next((points for points, outcome in enumerate(outcomes) if reached(*outcome)), None)
+
+    return {
+        "passed": minimum(lambda passed, grade: passed),
+        "grades": {str(g): minimum(lambda passed, grade: passed and grade <= g) for g in SOLVER_GRADES},
+    }
+
+
+class TestExamSolverService:
+    def test_matches_brute_force(self):
+        rng = random.Random(5)
+        service = ExamSolverService()
+        for _ in range(40):
+            scores = [rng.randint(0, 100) if rng.random() < 0.8 else None for _ in range(9)]
+            missing = rng.sample(OUTSTANDING_COLUMNS, rng.randint(1, 3))
+            for i in missing:
+                scores[i] = None
+            assumed = rng.choice([0, 50, 100])
+
+            output = service.solve(tuple(scores), assumed)
+
+            outstanding = [i for i in OUTSTANDING_COLUMNS if scores[i] is None]
+            for i in outstanding:
+                assert output.components[output.outstanding[outstanding.index(i)]].model_dump() == \
+                    brute_force(scores, [i], assumed)
+            assert output.uniform.model_dump() == brute_force(scores, outstanding, assumed)
+
+    def test_single_outstanding_component(self):
+        scores = (80, 70, None, 90, None, 60, None, 90, None)
+
+        output = ExamSolverService().solve(scores)
+
+        assert output.outstanding == ["pw_presentation"]
+        # PW gesamt = round(0.5 * 90 + 0.5 * p) muss mindestens 30 erreichen
+        assert output.components["pw_presentation"].passed == 0
+        assert output.components["pw_presentation"].grades["1"] is None
+        assert output.uniform == output.components["pw_presentation"]
+
+    def test_unreachable_targets_are_none(self):
+        # zwei Bereiche unter 50 lassen sich nicht mehr ausgleichen
+        scores = (100, 10, None, 40, None, None, None, 100, 100)
+
+        output = ExamSolverService().solve(scores)
+
+        assert output.components["economy_main"].passed is None
+        assert output.components["economy_main"].grades == {"1": None, "2": None, "3": None, "4": None}
+
+    def test_nothing_outstanding(self):
+        output = ExamSolverService().solve((80, 70, None, 90, None, 60, None, 90, 80))
+
+        assert output.outstanding == []
+        assert output.components == {}
+        assert output.uniform is None
@@ -1,8 +1,11 @@
 import json
 import os
+import threading
+from unittest.mock import patch
 
 import pytest
 
+from backend.app.service import json_codec
 from backend.app.service.file_service import FileService
 
 
@@ -49,6 +52,17 @@ class TestFileService:
         assert len(all_entries) == 1
         assert all_entries[0] == saved_entry
 
+    def test_save_many_writes_once(self, file_service, monkeypatch):
+        writes = []
+        original_save = file_service._save
+        monkeypatch.setattr(file_service, "_save", lambda data: writes.append(len(data)) or original_save(data))
+
+        saved = file_service.save_many([{"name": f"Entry {i}"} for i in range(3)])
+
+        assert writes == [3]
+        assert len({entry["id"] for entry in saved}) == 3
+        assert FileService(filepath=file_service.filepath).load_all() == saved
+
     def test_get_by_id(self, populated_file_service):
         service, entries = populated_file_service
         entry1, entry2 = entries
@@ -58,6 +72,50 @@ class TestFileService:
 
         assert service.get_by_id("non_existent_id") is None
 
+    def test_get_by_ids(self, populated_file_service):
+        service, (entry1, entry2) = populated_file_service
+
+        assert service.get_by_ids([entry2["id"], "non_existent_id", entry1["id"]]) == {
+            entry1["id"]: entry1,
+            entry2["id"]: entry2,
+        }
+
+    def test_iter_entries_with_cursor_and_prefix(self, file_service):
+        entries = [file_service.save({"name": name}) for name in ("Anna", "Ben", "Anton")]
+
+        pairs = list(file_service.iter_entries())
+        assert [entry for _, entry in pairs] == entries
+        assert [entry for _, entry in file_service.iter_entries(cursor=pairs[0][0])] == entries[1:]
+        assert [entry["name"] for _, entry in file_service.iter_entries(name_prefix="An")] == ["Anna", "Anton"]
+
+        with pytest.raises(ValueError):
+            list(file_service.iter_entries(cursor="abc"))
+
+    def test_cursor_continues_after_its_entry_when_earlier_entries_are_deleted(self, file_service):
+        entries = file_service.save_many([{"name": str(i)} for i in range(6)])
+        cursor, _ = list(file_service.iter_entries())[2]
+
+        file_service.delete_by_id(entries[0]["id"])
+        file_service.delete_by_id(entries[1]["id"])
+
+        assert [entry for _, entry in file_service.iter_entries(cursor=cursor)] == entries[3:]
+        # reine Positionen aus älteren Cursorn werden weiter angenommen
+        assert [entry for _, entry in file_service.iter_entries(cursor="1")] == entries[3:]
+
+    def test_iter_entries_continues_after_table_is_compacted(self, file_service, monkeypatch):
+        monkeypatch.setattr("backend.app.service.file_service.ITER_BATCH_SIZE", 2)
+        entries = file_service.save_many([{"name": str(i)} for i in range(6)])
+
+        iterator = file_service.iter_entries()
+        first = [next(iterator) for _ in range(2)]
+        # löscht einen gelieferten und einen noch nicht gelieferten Eintrag und baut die Tabelle neu auf
+        file_service.delete_by_id(entries[0]["id"])
+        file_service.delete_by_id(entries[4]["id"])
+        file_service._index()._compact()
+        rest = list(iterator)
+
+        assert [entry["name"] for _, entry in first + rest] == ["0", "1", "2", "3", "5"]
+
     def test_delete_by_id(self, populated_file_service):
         service, entries = populated_file_service
         entry1, entry2 = entries
@@ -92,6 +150,17 @@ class TestFileService:
         non_existent_update = service.update_by_id("non_existent_id", {"name": "ghost"})
         assert non_existent_update is None
 
+    @pytest.mark.skipif(json_codec.orjson is None, reason="orjson is not installed")
+    def test_fast_json_files_are_readable_without_it(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(json_codec, "fast", True)
+        service = FileService(filepath=str(tmp_path / "data.json"), journal=True)
+        entries = [service.save({"name": "Jürgen", "value": 100}), service.save({"name": "Ben"})]
+        service.compact()
+        entries.append(service.save({"name": "Carla"}))
+
+        monkeypatch.setattr(json_codec, "fast", False)
+        assert FileService(filepath=service.filepath, journal=True).load_all() == entries
+
     def test_load_with_corrupted_json(self, file_service):
         with open(file_service.filepath, "w") as f:
             f.write("{'name': 'test',")
@@ -100,3 +169,179 @@ class TestFileService:
 
         with open(file_service.filepath, "r") as f:
             assert json.load(f) == []
+
+
+@pytest.fixture
+def journal_file_service(tmp_path):
+    test_file = tmp_path / "test_data.json"
+    return FileService(filepath=str(test_file), journal=True, compaction_threshold=5)
+
+
+class TestFileServiceJournal:
+    def test_save_appends_to_journal_without_rewriting_snapshot(self, journal_file_service):
+        saved_entry = journal_file_service.save({"name": "Anna", "value": 100})
+
+        with open(journal_file_service.filepath, "r") as f:
+            assert json.load(f) == []
+        with open(journal_file_service.journal_path, "r") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0]) == {"op": "save", "entry": saved_entry}
+
+        assert journal_file_service.load_all() == [saved_entry]
+
+    def test_update_and_delete_are_replayed(self, journal_file_service):
+        entry1 = journal_file_service.save({"name": "Anna", "value": 100})
+        entry2 = journal_file_service.save({"name": "Ben", "value": 200})
+
+        updated = journal_file_service.update_by_id(entry1["id"], {"name": "Anna Updated", "value": 150})
+        assert updated == {"name": "Anna Updated", "value": 150, "id": entry1["id"]}
+        assert journal_file_service.delete_by_id(entry2["id"]) is True
+
+        assert journal_file_service.load_all() == [updated]
+        assert journal_file_service.delete_by_id(entry2["id"]) is False
+        assert journal_file_service.update_by_id("non_existent_id", {"name": "ghost"}) is None
+
+        reopened = FileService(filepath=journal_file_service.filepath, journal=True)
+        assert reopened.load_all() == [updated]
+
+    def test_save_many_is_one_journal_record(self, journal_file_service):
+        saved = journal_file_service.save_many([{"name": "Anna"}, {"name": "Ben"}])
+
+        with open(journal_file_service.journal_path, "r") as f:
+            assert len(f.read().splitlines()) == 1
+        assert FileService(filepath=journal_file_service.filepath, journal=True).load_all() == saved
+
+    def test_compaction_after_threshold(self, journal_file_service):
+        entries = [journal_file_service.save({"name": f"Entry {i}"}) for i in range(5)]
+
+        with open(journal_file_service.filepath, "r") as f:
+            assert json.load(f) == entries
+        assert os.path.getsize(journal_file_service.journal_path) == 0
+        assert journal_file_service.load_all() == entries
+
+    def test_torn_journal_record_is_ignored(self, journal_file_service):
+        entry = journal_file_service.save({"name": "Anna"})
+        with open(journal_file_service.journal_path, "a") as f:
+            f.write('{"op": "save", "entry": {"na')
+
+        assert journal_file_service.load_all() == [entry]
+
+        reopened = FileService(filepath=journal_file_service.filepath, journal=True)
+        second = reopened.save({"name": "Ben"})
+        assert reopened.load_all() == [entry, second]
+
+
+class TestFileServiceCache:
+    def test_repeated_lookups_hit_cache(self, populated_file_service):
+        service, entries = populated_file_service
+        misses = service.cache_misses
+
+        for _ in range(3):
+            assert service.get_by_id(entries[0]["id"]) == entries[0]
+
+        assert service.cache_misses == misses
+        assert service.cache_hits >= 3
+        assert service.cache_stats()["entries"] == 2
+
+    def test_external_change_invalidates_cache(self, populated_file_service):
+        service, entries = populated_file_service
+        service.get_by_id(entries[0]["id"])
+        misses = service.cache_misses
+
+        external_entry = {"name": "Carla", "id": "external_id"}
+        with open(service.filepath, "w") as f:
+            json.dump(entries + [external_entry], f, indent=2)
+
+        assert service.get_by_id("external_id") == external_entry
+        assert service.cache_misses == misses + 1
+
+    def test_own_writes_keep_cache_valid(self, file_service):
+        file_service.load_all()
+        misses = file_service.cache_misses
+
+        entry = file_service.save({"name": "Anna"})
+        file_service.update_by_id(entry["id"], {"name": "Anna Updated"})
+        assert file_service.get_by_id(entry["id"])["name"] == "Anna Updated"
+        file_service.delete_by_id(entry["id"])
+        assert file_service.load_all() == []
+
+        assert file_service.cache_misses == misses
+
+
+class TestFileServiceConcurrency:
+    @pytest.mark.parametrize("journal", [False, True])
+    def test_concurrent_saves_from_several_instances_are_not_lost(self, tmp_path, journal):
+        path = str(tmp_path / "test_data.json")
+        # zwei Instanzen auf derselben Datei verhalten sich wie zwei Worker-Prozesse
+        services = [FileService(path, journal=journal, compaction_threshold=7) for _ in range(2)]
+
+        def worker(service, worker_id):
+            for i in range(20):
+                service.save({"name": f"{worker_id}-{i}"})
+
+        threads = [threading.Thread(target=worker, args=(services[n % 2], n)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        names = {entry["name"] for entry in FileService(path, journal=journal).load_all()}
+        assert names == {f"{n}-{i}" for n in range(4) for i in range(20)}
+
+    @pytest.mark.parametrize("journal", [False, True])
+    def test_version_changes_with_writes_from_other_instances(self, tmp_path, journal):
+        path = str(tmp_path / "test_data.json")
+        service, other = FileService(path, journal=journal), FileService(path, journal=journal)
+        version = service.version()
+        assert other.version() == version
+
+        entry = other.save({"name": "Anna"})
+
+        assert other.last_write_versions == (version, other.version())
+        assert service.version() == other.version() != version
+        written = other.version()
+        service.update_by_id(entry["id"], {"name": "Anna Updated"})
+        assert service.last_write_versions == (written, other.version())
+        assert other.version() != written
+
+    def test_journal_appends_from_other_instances_are_replayed_incrementally(self, tmp_path):
+        path = str(tmp_path / "test_data.json")
+        service, other = FileService(path, journal=True), FileService(path, journal=True)
+        entry = service.save({"name": "Anna"})
+        assert other.load_all() == [entry]
+
+        added = other.save({"name": "Ben"})
+        other.delete_by_id(entry["id"])
+
+        # nur die neuen Datensätze werden gelesen, der Snapshot nicht erneut
+        with patch.object(service, "_load", side_effect=AssertionError):
+            assert service.load_all() == [added]
+        assert service._journal_records == other._journal_records == 3
+
+    @pytest.mark.parametrize("journal", [False, True])
+    def test_replace_many_skips_entries_changed_in_between(self, tmp_path, journal):
+        path = str(tmp_path / "test_data.json")
+        service, other = FileService(path, journal=journal), FileService(path, journal=journal)
+        anna, ben = service.save({"name": "Anna"}), service.save({"name": "Ben"})
+        ben_changed = other.update_by_id(ben["id"], {"name": "Ben Changed"})
+
+        replaced = service.replace_many([(anna, {"name": "Anna", "result": 1}), (ben, {"name": "Ben", "result": 2})])
+
+        assert replaced == 1
+        assert other.load_all() == [{"name": "Anna", "result": 1, "id": anna["id"]}, ben_changed]
+        assert other.count() == 2
+
+    def test_save_leaves_no_temporary_files(self, file_service, tmp_path):
+        file_service.save({"name": "Anna"})
+
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    def test_corrupted_file_is_kept_for_inspection(self, file_service):
+        with open(file_service.filepath, "w") as f:
+            f.write("{'name': 'test',")
+
+        assert file_service.load_all() == []
+
+        with open(file_service.filepath + ".corrupt", "r") as f:
+            assert f.read() == "{'name': 'test',"
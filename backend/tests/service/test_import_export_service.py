@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+
+import pytest
+
+from backend.app.service.exam_calculation_service import ExamCalculationService
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.service.import_export_service import (
+    ImportExportService,
+    ImportFormatError,
+    flatten,
+    format_from_content_type,
+    unflatten,
+)
+
+CSV_HEADER = "name;ap1;planning_main;planning_extra;development_main;development_extra;" \
+             "economy_main;economy_extra;pw_project;pw_presentation\n"
+
+
+@pytest.fixture
+def service():
+    return ImportExportService()
+
+
+def read(service, fmt, content):
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    return service.read_file(fmt, io.BytesIO(data))
+
+
+class TestImportExportService:
+    def test_format_from_content_type(self):
+        assert format_from_content_type("text/csv; charset=utf-8") == "csv"
+        assert format_from_content_type("application/jsonl") == "ndjson"
+        assert format_from_content_type("application/json") is None
+        assert format_from_content_type(None) is None
+
+    def test_flatten_and_unflatten_round_trip(self):
+        entry = FinalExamResultInput.model_validate(
+            {"name": "Anna", "ap1": 80, "ap2": {"planning": {"main": 70, "extra": 60}, "pw": {"project": 90}}})
+
+        assert FinalExamResultInput.model_validate(unflatten(flatten(entry.model_dump()))) == entry
+
+    def test_read_csv_with_semicolons_and_bom(self, service):
+        content = "﻿" + CSV_HEADER + "Anna;80;70;;60;;50;;90;85\n\n" + "Ben;;;;;;;;;\n"
+
+        output, inputs = read(service, "csv", content)
+
+        assert (output.total, output.failed) == (2, 0)
+        assert inputs[0].name == "Anna"
+        assert inputs[0].ap2.planning.main == 70 and inputs[0].ap2.planning.extra is None
+        assert inputs[1].ap1 is None and inputs[1].ap2 is None
+
+    def test_read_csv_reports_row_errors(self, service):
+        content = "name,ap1,pw_project\nAnna,80,90\nBen,101,90\nCarla,abc,\nDora,1,2,3\n"
+
+        output, inputs = read(service, "csv", content)
+
+        assert [i.name for i in inputs] == ["Anna"]
+        assert output.total == 4
+        assert output.failed == 3
+        assert [e.row for e in output.errors] == [3, 4, 5]
+        assert output.errors[0].error.startswith("ap1:")
+
+    def test_read_csv_rejects_unknown_columns(self, service):
+        with pytest.raises(ImportFormatError):
+            read(service, "csv", "name,points\nAnna,80\n")
+
+    def test_read_ndjson_strips_export_metadata(self, service):
+        content = json.dumps({"id": "x", "Name": "Anna", "AP1": 80, "result": {}}) + "\n" + "{broken\n" + "[1]\n"
+
+        output, inputs = read(service, "ndjson", content)
+
+        assert [i.name for i in inputs] == ["Anna"]
+        assert [e.row for e in output.errors] == [2, 3]
+
+    def test_read_xlsx(self, service):
+        openpyxl = pytest.importorskip("openpyxl")
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["Name", "AP1", "pw_project"])
+        sheet.append(["Anna", 80.0, 90])
+        sheet.append([None, None, None])
+        sheet.append([42, 75.5, None])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+
+        output, inputs = read(service, "xlsx", buffer.getvalue())
+
+        assert inputs[0].ap1 == 80 and inputs[0].ap2.pw.project == 90
+        assert output.total == 2
+        assert [e.row for e in output.errors] == [4]
+
+    def test_csv_export_contains_calculated_results(self, service):
+        entry = FinalExamResultInput.model_validate(
+            {"name": "Anna", "ap1": 80, "ap2": {"planning": {"main": 70}, "development": {"main": 60},
+                                                "economy": {"main": 50}, "pw": {"project": 90, "presentation": 85}}})
+        expected = ExamCalculationService().calculateExamResults(entry)
+
+        text = service.csv_chunk([{"id": "1", **entry.model_dump()}], header=True)
+        rows = list(csv.DictReader(io.StringIO(text)))
+
+        assert rows[0]["id"] == "1"
+        assert rows[0]["planning_main"] == "70"
+        assert rows[0]["overall_points"] == str(expected.Overall.points)
+        assert rows[0]["passed"] == str(expected.Status.passed)
+
+    def test_export_skips_calculation_for_invalid_stored_values(self, service):
+        rows = list(service.export_rows([{"id": "1", "name": "Anna", "ap1": 150}]))
+
+        assert rows[0]["ap1"] == 150
+        assert rows[0]["overall_points"] is None
+
+    def test_exported_csv_can_be_imported_again(self, service):
+        entries = [{"id": str(i), "name": f"Trainee {i}", "ap1": i, "ap2": None} for i in range(3)]
+
+        output, inputs = read(service, "csv", service.csv_chunk(entries, header=True))
+
+        assert output.failed == 0
+        assert [i.model_dump() for i in inputs] == [
+            {key: value for key, value in entry.items() if key != "id"} for entry in entries]
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from backend.app.service import json_codec
+
+DATA = [{"id": "a1", "name": "Jürgen", "ap1": 85, "ap2": {"pw": {"project": None}}, "validated": True}]
+
+
+@pytest.fixture(params=[False, True], ids=["stdlib", "orjson"])
+def fast(request, monkeypatch):
+    if request.param and json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(json_codec, "fast", request.param)
+    return request.param
+
+
+class TestJsonCodec:
+    def test_stdlib_output_matches_json_module(self, monkeypatch):
+        monkeypatch.setattr(json_codec, "fast", False)
+
+        assert json_codec.dumps(DATA) == json.dumps(DATA, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        assert json_codec.dumps(DATA, indent=True) == json.dumps(DATA, indent=4, ensure_ascii=False).encode("utf-8")
+
+    def test_round_trip(self, fast):
+        assert json_codec.loads(json_codec.dumps(DATA)) == DATA
+        assert json_codec.loads(json_codec.dumps(DATA, indent=True).decode("utf-8")) == DATA
+
+    def test_compact_output_is_the_same_in_both_modes(self, fast):
+        assert json_codec.dumps(DATA) == '[{"id":"a1","name":"Jürgen","ap1":85,"ap2":{"pw":{"project":null}},' \
+                                         '"validated":true}]'.encode("utf-8")
+
+    def test_values_orjson_rejects_fall_back_to_the_json_module(self, fast):
+        data = {"big": 2 ** 70, 1: "int key"}
+
+        assert json.loads(json_codec.dumps(data)) == {"big": 2 ** 70, "1": "int key"}
+
+    def test_default_hook_is_used(self, fast):
+        assert json_codec.loads(json_codec.dumps({"set": {3}}, default=sorted)) == {"set": [3]}
+
+    def test_invalid_input_raises_json_decode_error(self, fast):
+        with pytest.raises(json.JSONDecodeError):
+            json_codec.loads(b'{"name": ')
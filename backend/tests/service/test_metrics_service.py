@@ -0,0 +1,52 @@
+from backend.app.service.metrics_service import Histogram, MetricsRegistry
+
+
+class TestMetricsService:
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, route="/a")
+        histogram.observe(0.5, route="/a")
+        histogram.observe(5.0, route="/a")
+
+        lines = histogram.render()
+
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'latency_seconds_count{route="/a"} 3' in lines
+        assert 'latency_seconds_sum{route="/a"} 5.55' in lines
+
+    def test_timed_decorator_records_one_observation_per_call(self):
+        histogram = Histogram("calc_seconds", "Calc", ("mode",))
+
+        @histogram.timed(mode="single")
+        def calculate(x):
+            return x * 2
+
+        assert calculate(2) == 4
+        assert calculate(3) == 6
+        assert 'calc_seconds_count{mode="single"} 2' in histogram.render()
+
+    def test_registry_renders_histograms_and_collectors(self):
+        registry = MetricsRegistry()
+        registry.histogram("requests_seconds", "Requests").observe(0.2)
+        registry.register_collector(
+            lambda: [("cache_hits_total", "counter", "Cache hits", [({"cache": "results"}, 7)])])
+
+        text = registry.render()
+
+        assert "# TYPE requests_seconds histogram" in text
+        assert "requests_seconds_count 1" in text
+        assert "# TYPE cache_hits_total counter" in text
+        assert 'cache_hits_total{cache="results"} 7' in text
+
+    def test_histogram_is_registered_once_per_name(self):
+        registry = MetricsRegistry()
+
+        assert registry.histogram("a_seconds", "A") is registry.histogram("a_seconds", "A")
+
+    def test_label_values_are_escaped(self):
+        histogram = Histogram("x_seconds", "X", ("route",), buckets=(1.0,))
+        histogram.observe(0.1, route='say "hi"')
+
+        assert 'x_seconds_count{route="say \\"hi\\""} 1' in histogram.render()
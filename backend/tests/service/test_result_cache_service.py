@@ -0,0 +1,37 @@
+from backend.app.service.result_cache_service import ResultCacheService, input_key
+
+
+class TestResultCacheService:
+    def test_input_key_ignores_storage_metadata(self):
+        entry = {"name": "Anna", "ap1": 80, "ap2": None}
+
+        assert input_key(entry) == input_key({**entry, "id": "some_id", "result": {}, "result_key": "x"})
+        assert input_key(entry) != input_key({**entry, "ap1": 81})
+
+    def test_get_requires_matching_key(self):
+        cache = ResultCacheService()
+        cache.put("id1", "key1", "result")
+
+        assert cache.get("id1", "key1") == "result"
+        assert cache.get("id1", "key2") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    def test_invalidate(self):
+        cache = ResultCacheService()
+        cache.put("id1", "key1", "result")
+
+        cache.invalidate("id1")
+
+        assert cache.get("id1", "key1") is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResultCacheService(max_entries=2)
+        cache.put("id1", "key1", "result1")
+        cache.put("id2", "key2", "result2")
+        cache.get("id1", "key1")
+
+        cache.put("id3", "key3", "result3")
+
+        assert cache.get("id2", "key2") is None
+        assert cache.get("id1", "key1") == "result1"
+        assert cache.get("id3", "key3") == "result3"
@@ -0,0 +1,107 @@
+import json
+import random
+
+import pytest
+
+from backend.app.service.exam_calculation_service import ExamCalculationService
+from backend.app.service.ruleset_service import RULESETS_DIR, RulesetService
+from backend.app.service.vectorized_calculation_service import VectorizedExamCalculationService, score_matrix
+
+with open(f"{RULESETS_DIR}/ao2020.json", encoding="utf-8") as f:
+    AO2020 = json.load(f)
+
+
+def write_ruleset(directory, **changes):
+    definition = {**AO2020, **changes}
+    (directory / f"{definition['id']}.json").write_text(json.dumps(definition), encoding="utf-8")
+    return definition
+
+
+def random_scores(rng: random.Random, count: int) -> list:
+    return [tuple(rng.choice([None, rng.randint(0, 100), rng.randint(0, 100)]) for _ in range(9))
+            for _ in range(count)]
+
+
+class TestRulesetService:
+    def test_bundled_ruleset_is_the_default(self):
+        service = RulesetService([RULESETS_DIR], default_id="ao2020")
+
+        ruleset = service.get()
+
+        assert ruleset.key == "ao2020@1"
+        assert service.ids() == ["ao2020"]
+        assert ruleset.failure_reasons == (
+            "OVERALL_BELOW_50_POINTS",
+            "AP2_OVERALL_BELOW_50_POINTS",
+            "TOO_MANY_COMPONENTS_BELOW_50_POINTS",
+            "COMPONENT_BELOW_30_POINTS",
+        )
+
+    def test_rulesets_are_compiled_once(self):
+        service = RulesetService([RULESETS_DIR])
+
+        assert service.get("ao2020") is service.get("ao2020")
+        assert service.get() is service.get("ao2020")
+
+    def test_unknown_ruleset_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown ruleset"):
+            RulesetService([RULESETS_DIR]).get("ao1999")
+
+    def test_other_ruleset_changes_the_results(self, tmp_path):
+        # strengere Regeln: höhere Notengrenzen, Projektarbeit zählt nur über die Präsentation
+        write_ruleset(tmp_path, id="strict", grade_thresholds=[95, 85, 70, 55, 35],
+                      pw_blend={"first": 0.0, "second": 1.0},
+                      failure_rules=AO2020["failure_rules"] + [
+                          {"reason": "AP1_BELOW_50_POINTS", "components": ["ap1"], "below": 50}])
+        strict = RulesetService([RULESETS_DIR, str(tmp_path)]).get("strict")
+        scores = (52, 90, None, 88, 92, 78, None, 98, 60)
+
+        result = ExamCalculationService(strict).calculateResultDict(scores)
+        default = ExamCalculationService().calculateResultDict(scores)
+
+        assert default["ap1"] == {"points": 52, "grade": 4}
+        assert result["ap1"] == {"points": 52, "grade": 5}
+        assert result["ap2_pw_overall"]["points"] == 60
+        assert default["ap2_pw_overall"]["points"] == 79
+        assert default["Passed"] is True
+        assert result["FailureReasons"] == []
+        assert ExamCalculationService(strict).calculateResultDict((40,) + scores[1:])["FailureReasons"] == [
+            "AP1_BELOW_50_POINTS"]
+
+    def test_vectorized_calculation_follows_the_ruleset(self, tmp_path):
+        write_ruleset(tmp_path, id="other", grade_thresholds=[90, 80, 65, 50, 25],
+                      weights={"ap1": 0.25, "ap2_planning": 0.25, "ap2_development": 0.25, "ap2_pw_project": 0.25},
+                      ap2_part_blend={"first": 0.5, "second": 0.5},
+                      failure_rules=[{"reason": "TWO_BELOW_40", "components": ["ap1", "ap2_planning", "Overall"],
+                                      "below": 40, "max_count": 1}])
+        ruleset = RulesetService([str(tmp_path)]).get("other")
+        scores = random_scores(random.Random(7), 2000)
+
+        expected = [ExamCalculationService(ruleset).calculateResultDict(s) for s in scores]
+        vectorized = VectorizedExamCalculationService(ruleset)
+        rows = score_matrix([tuple(-1 if v is None else v for v in s) for s in scores])
+
+        assert vectorized.result_dicts(vectorized.calculateScoreColumns(rows)) == expected
+
+    def test_later_directories_replace_bundled_rulesets(self, tmp_path):
+        write_ruleset(tmp_path, version=2, grade_thresholds=[91, 81, 67, 50, 30])
+
+        ruleset = RulesetService([RULESETS_DIR, str(tmp_path)]).get("ao2020")
+
+        assert ruleset.key == "ao2020@2"
+        assert ruleset.grade_table[91] == 1
+
+    @pytest.mark.parametrize("changes, message", [
+        ({"grade_thresholds": [92, 81, 81, 50, 30]}, "strictly descending"),
+        ({"weights": {"ap1": 0.5, "ap3": 0.5}}, "unknown components"),
+        ({"ap2_weights": {"ap1": 1.0}}, "unknown components"),
+        ({"weights": {"ap1": 0.0}}, "at least one positive weight"),
+        ({"pw_blend": {"first": 0.7, "second": 0.7}}, "add up to 1"),
+        ({"failure_rules": [{"reason": "X", "components": ["ap4"], "below": 50}]}, "unknown components"),
+        ({"failure_rules": [{"reason": "X", "components": ["ap1"], "below": 50}] * 2}, "unique"),
+    ])
+    def test_invalid_rulesets_are_rejected(self, tmp_path, changes, message):
+        write_ruleset(tmp_path, id="broken", **changes)
+
+        with pytest.raises(ValueError, match=message):
+            RulesetService([str(tmp_path)]).get("broken")
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from backend.app.service import search_index_service
+from backend.app.service.search_index_service import SearchIndexService
+from backend.app.service.vectorized_calculation_service import VectorizedExamCalculationService
+from backend.tests.entries import generate_entries
+
+
+def brute_force(entries, query=None, name_prefix=None, passed=None, grade=None, reason=None):
+    matches = []
+    results = VectorizedExamCalculationService().calculateEntryResults(entries)
+    for entry, result in zip(entries, results):
+        name = entry["name"].casefold()
+        if query is not None and query.casefold() not in name:
+            continue
+        if name_prefix is not None and not name.startswith(name_prefix.casefold()):
+            continue
+        if passed is not None and (result is None or result["Passed"] != passed):
+            continue
+        if grade is not None and (result is None or result["Overall"]["grade"] != grade):
+            continue
+        if reason is not None and (result is None or reason not in result["FailureReasons"]):
+            continue
+        matches.append(entry["id"])
+    return matches
+
+
+def search(service, entries, **filters):
+    total, ids = service.search(lambda: entries, limit=1000, **filters)
+    assert total == len(ids)
+    return ids
+
+
+QUERIES = [
+    {"query": "ee 12"},
+    {"query": "4"},
+    {"name_prefix": "trainee 1"},
+    {"name_prefix": "TRAINEE 5", "passed": False},
+    {"passed": True},
+    {"grade": 3},
+    {"reason": "COMPONENT_BELOW_30_POINTS"},
+    {"reason": "TOO_MANY_COMPONENTS_BELOW_50_POINTS", "query": "inee 3"},
+    {"passed": False, "grade": 5},
+]
+
+
+class TestSearchIndexService:
+    @pytest.mark.parametrize("filters", QUERIES)
+    def test_matches_brute_force(self, filters):
+        entries = generate_entries(500)
+
+        assert search(SearchIndexService(), entries, **filters) == brute_force(entries, **filters)
+
+    def test_incremental_updates_match_full_rebuild(self, monkeypatch):
+        monkeypatch.setattr(search_index_service, "COMPACTION_MIN_DELETED", 20)
+        rng = random.Random(3)
+        entries = generate_entries(200)
+        service = SearchIndexService()
+        search(service, entries)
+
+        for replacement in generate_entries(50, seed=5):
+            index = rng.randrange(len(entries))
+            replacement["id"] = entries[index]["id"]
+            entries[index] = replacement
+            service.upsert([replacement])
+        # genug Löschungen für eine Neuvergabe der Plätze
+        for _ in range(120):
+            service.remove(entries.pop(rng.randrange(len(entries)))["id"])
+        added = generate_entries(30, seed=6)
+        entries.extend(added)
+        service.upsert(added)
+
+        for filters in QUERIES:
+            assert sorted(search(service, [], **filters)) == sorted(brute_force(entries, **filters))
+        assert service._deleted < 20
+
+    def test_pages_follow_the_index_order(self):
+        entries = generate_entries(50)
+        service = SearchIndexService()
+
+        total, ids = service.search(lambda: entries, passed=True, offset=2, limit=3)
+
+        passed = brute_force(entries, passed=True)
+        assert total == len(passed)
+        assert ids == passed[2:5]
+
+    def test_invalid_entries_only_match_name_filters(self):
+        entries = [{"id": "a", "name": "Anna", "ap1": 150}, {"id": "b", "name": "Anton", "ap1": 90}]
+        service = SearchIndexService()
+
+        assert search(service, entries, name_prefix="an") == ["a", "b"]
+        assert search(service, [], passed=False) == []
+        assert search(service, [], passed=True) == ["b"]
+
+    def test_unknown_reason_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown failure reason"):
+            SearchIndexService().search(lambda: [], reason="NOT_A_REASON")
+
+    def test_foreign_write_rebuilds_the_index(self):
+        entries = generate_entries(10)
+        service = SearchIndexService()
+        service.search(lambda: entries, version="1")
+
+        # eigener Schreibzugriff von Stand 1 auf 2: wird fortgeschrieben
+        entries.append({**generate_entries(1, seed=2)[0], "name": "Zoe"})
+        service.upsert(entries[-1:], ("1", "2"))
+        assert service.search(lambda: [], version="2", query="zoe")[0] == 1
+
+        # Stand 3 stammt von einem anderen Prozess
+        entries.append({**generate_entries(1, seed=4)[0], "name": "Zora"})
+        assert service.search(lambda: entries, version="3", name_prefix="zo")[0] == 2
@@ -0,0 +1,169 @@
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.app.service.file_service import FileService
+from backend.app.service.sqlite_service import SqliteService
+from backend.app.service.storage_factory import LazyStorage, create_storage
+
+
+@pytest.fixture
+def sqlite_service(tmp_path):
+    service = SqliteService(filepath=str(tmp_path / "test_data.db"))
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def populated_sqlite_service(sqlite_service):
+    entry1 = sqlite_service.save({"name": "Anna", "value": 100})
+    entry2 = sqlite_service.save({"name": "Ben", "value": 200})
+    return sqlite_service, [entry1, entry2]
+
+
+class TestSqliteService:
+    def test_init_creates_schema_in_wal_mode(self, sqlite_service):
+        conn = sqlite3.connect(sqlite_service.filepath)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(entries)")}
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+
+        assert "idx_entries_name" in indexes
+        assert journal_mode == "wal"
+
+    def test_load_all_on_empty_database(self, sqlite_service):
+        assert sqlite_service.load_all() == []
+
+    def test_save_and_load_all(self, sqlite_service):
+        saved_entry = sqlite_service.save({"name": "Test Entry", "data": [1, 2, 3]})
+
+        assert "id" in saved_entry
+        assert sqlite_service.load_all() == [saved_entry]
+
+    def test_save_many(self, sqlite_service):
+        saved = sqlite_service.save_many([{"name": "Anna"}, {"name": "Ben"}])
+
+        assert len({entry["id"] for entry in saved}) == 2
+        assert sqlite_service.load_all() == saved
+
+    def test_get_by_id(self, populated_sqlite_service):
+        service, (entry1, _) = populated_sqlite_service
+
+        assert service.get_by_id(entry1["id"]) == entry1
+        assert service.get_by_id("non_existent_id") is None
+
+    def test_get_by_ids(self, populated_sqlite_service):
+        service, (entry1, entry2) = populated_sqlite_service
+
+        assert service.get_by_ids([entry2["id"], "non_existent_id", entry1["id"]]) == {
+            entry1["id"]: entry1,
+            entry2["id"]: entry2,
+        }
+
+    def test_delete_by_id(self, populated_sqlite_service):
+        service, (entry1, entry2) = populated_sqlite_service
+
+        assert service.delete_by_id(entry1["id"]) is True
+        assert service.load_all() == [entry2]
+        assert service.delete_by_id("non_existent_id") is False
+
+    def test_update_by_id(self, populated_sqlite_service):
+        service, (entry1, entry2) = populated_sqlite_service
+
+        updated_entry = service.update_by_id(entry1["id"], {"name": "Anna Updated", "value": 150})
+
+        assert updated_entry == {"name": "Anna Updated", "value": 150, "id": entry1["id"]}
+        assert service.load_all() == [updated_entry, entry2]
+        assert service.update_by_id("non_existent_id", {"name": "ghost"}) is None
+
+
+    def test_iter_entries_with_cursor_and_prefix(self, sqlite_service, monkeypatch):
+        monkeypatch.setattr("backend.app.service.sqlite_service.ITER_BATCH_SIZE", 2)
+        entries = [sqlite_service.save({"name": name}) for name in ("Anna", "Ben", "Anton", "Carla", "Andrea")]
+
+        pairs = list(sqlite_service.iter_entries())
+        assert [entry for _, entry in pairs] == entries
+
+        resumed = [entry for _, entry in sqlite_service.iter_entries(cursor=pairs[1][0])]
+        assert resumed == entries[2:]
+
+        filtered = [entry["name"] for _, entry in sqlite_service.iter_entries(name_prefix="An")]
+        assert filtered == ["Anna", "Anton", "Andrea"]
+
+
+    def test_version_changes_with_writes_from_other_connections(self, populated_sqlite_service):
+        service, entries = populated_sqlite_service
+        other = SqliteService(filepath=service.filepath)
+        version = service.version()
+        assert other.version() == version
+
+        other.update_by_id(entries[0]["id"], {"name": "Anna Updated"})
+
+        assert other.last_write_versions == (version, other.version())
+        assert service.version() != version
+        other.delete_by_id("non_existent_id")
+        assert other.version() == other.last_write_versions[1]
+        other.close()
+
+    def test_replace_many_skips_entries_changed_in_between(self, populated_sqlite_service):
+        service, (anna, ben) = populated_sqlite_service
+        version = service.version()
+        service.update_by_id(ben["id"], {"name": "Ben Changed"})
+
+        replaced = service.replace_many([(anna, {**anna, "result": 1}), (ben, {**ben, "result": 2})])
+
+        assert replaced == 1
+        assert service.get_by_id(anna["id"])["result"] == 1
+        assert service.get_by_id(ben["id"]) == {"name": "Ben Changed", "id": ben["id"]}
+        assert service.count() == 2
+        assert int(service.version()) == int(version) + 2
+
+
+class TestStorageFactory:
+    def test_defaults_to_file_service(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("BACKEND_STORAGE", raising=False)
+        monkeypatch.setenv("BACKEND_STORAGE_PATH", str(tmp_path / "storage.json"))
+
+        assert isinstance(create_storage(), FileService)
+
+    def test_sqlite_backend(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BACKEND_STORAGE", "sqlite")
+        monkeypatch.setenv("BACKEND_STORAGE_PATH", str(tmp_path / "storage.db"))
+
+        storage = create_storage()
+        assert isinstance(storage, SqliteService)
+        storage.close()
+
+    def test_unknown_backend(self, monkeypatch):
+        monkeypatch.setenv("BACKEND_STORAGE", "csv")
+
+        with pytest.raises(ValueError):
+            create_storage()
+
+    def test_lazy_storage_is_created_on_first_access(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("BACKEND_STORAGE", raising=False)
+        monkeypatch.setenv("BACKEND_STORAGE_PATH", str(tmp_path / "storage.json"))
+
+        storage = LazyStorage()
+        assert not (tmp_path / "storage.json").exists()
+
+        saved = storage.save({"name": "Anna"})
+        assert (tmp_path / "storage.json").exists()
+        assert storage.get_by_id(saved["id"]) == saved
+
+    def test_lazy_storage_is_not_created_by_probes(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("BACKEND_STORAGE", raising=False)
+        monkeypatch.setenv("BACKEND_STORAGE_PATH", str(tmp_path / "storage.json"))
+
+        storage = LazyStorage()
+        assert not hasattr(storage, "__wrapped__")
+        assert not hasattr(storage, "cache_stats")
+        holder = SimpleNamespace(storage=storage)
+        with patch.object(holder, "storage", new_callable=MagicMock):
+            pass
+        assert not (tmp_path / "storage.json").exists()
+
+        storage.count()
+        assert hasattr(storage, "cache_stats")
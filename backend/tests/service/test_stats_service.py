@@ -0,0 +1,92 @@
+import random
+
+from backend.app.model.final_exam_result_input import FinalExamResultInput
+from backend.app.service.exam_calculation_service import ExamCalculationService
+from backend.app.service.stats_service import StatsService
+from backend.tests.entries import generate_entries
+
+
+def full_recount(entries):
+    service = StatsService()
+    return service.statistics(lambda: entries)
+
+
+class TestStatsService:
+    def test_statistics_match_scalar_calculation(self):
+        entries = generate_entries(200)
+        results = [ExamCalculationService().calculateExamResults(
+            FinalExamResultInput.model_validate({k: v for k, v in e.items() if k != "id"})) for e in entries]
+
+        stats = full_recount(entries)
+
+        assert stats.total == 200
+        assert stats.passed == sum(r.Status.passed for r in results)
+        assert stats.failed == 200 - stats.passed
+        assert stats.failure_reasons["COMPONENT_BELOW_30_POINTS"] == sum(
+            "COMPONENT_BELOW_30_POINTS" in r.Status.reasons for r in results)
+        overall = [r.Overall.points for r in results if r.Overall.points is not None]
+        assert stats.components["Overall"].count == len(overall)
+        assert stats.components["Overall"].average_points == round(sum(overall) / len(overall), 2)
+        assert sum(stats.components["Overall"].grades.values()) == len(overall)
+
+    def test_incremental_updates_match_full_recount(self):
+        rng = random.Random(1)
+        entries = generate_entries(100)
+        service = StatsService()
+        service.statistics(lambda: list(entries))
+
+        for replacement in generate_entries(30, seed=7):
+            index = rng.randrange(len(entries))
+            replacement["id"] = entries[index]["id"]
+            entries[index] = replacement
+            service.upsert([replacement])
+        for _ in range(10):
+            service.remove(entries.pop(rng.randrange(len(entries)))["id"])
+        added = generate_entries(5, seed=9)
+        entries.extend(added)
+        service.upsert(added)
+
+        assert service.statistics(lambda: []) == full_recount(entries)
+
+    def test_repeated_upsert_is_counted_once(self):
+        entries = generate_entries(3)
+        service = StatsService()
+        service.statistics(lambda: entries)
+
+        service.upsert(entries)
+
+        assert service.statistics(lambda: []).total == 3
+
+    def test_invalid_entries_are_counted_separately(self):
+        stats = full_recount([{"id": "1", "name": "Anna", "ap1": 150}, {"id": "2", "name": "Ben", "ap1": 80}])
+
+        assert stats.total == 2
+        assert stats.invalid == 1
+        assert stats.components["ap1"].count == 1
+
+    def test_updates_before_warm_up_are_ignored(self):
+        service = StatsService()
+        service.upsert(generate_entries(3))
+
+        assert service.statistics(lambda: []).total == 0
+
+    def test_writes_from_other_processes_trigger_rebuild(self):
+        entries = generate_entries(10)
+        service = StatsService()
+        assert service.statistics(lambda: list(entries), "v1").total == 10
+
+        # eigener Schreibzugriff direkt auf den bekannten Stand: fortschreiben
+        added = generate_entries(1, seed=3)[0]
+        entries.append(added)
+        service.upsert([added], ("v1", "v2"))
+        assert service.statistics(lambda: [], "v2").total == 11
+
+        # ein anderer Prozess hat zwischendurch geschrieben: neu aufbauen
+        entries.pop(0)
+        service.remove(entries[0]["id"], ("v3", "v4"))
+        del entries[0]
+        assert service.statistics(lambda: list(entries), "v4").total == 9
+
+        # fremder Schreibzugriff ohne eigenen: erkannt am Stand beim Abruf
+        entries.pop()
+        assert service.statistics(lambda: list(entries), "v5").total == 8
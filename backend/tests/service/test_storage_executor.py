@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+
+from backend.app.service.storage_executor import StorageExecutor
+
+
+class TestStorageExecutor:
+    def test_writes_run_one_after_another_in_one_thread(self):
+        executor = StorageExecutor()
+        threads = set()
+        active = []
+        overlaps = []
+
+        def write(i):
+            threads.add(threading.current_thread().name)
+            active.append(i)
+            if len(active) > 1:
+                overlaps.append(i)
+            time.sleep(0.001)
+            active.remove(i)
+            return i
+
+        async def main():
+            return await asyncio.gather(*(executor.write(write, i) for i in range(20)))
+
+        assert asyncio.run(main()) == list(range(20))
+        assert len(threads) == 1
+        assert overlaps == []
+        executor.shutdown()
+
+    def test_pending_writes_are_bounded(self):
+        executor = StorageExecutor(max_pending_writes=2)
+        release = threading.Event()
+        submitted = []
+
+        def write(i):
+            submitted.append(i)
+            release.wait()
+            return i
+
+        async def main():
+            tasks = [asyncio.ensure_future(executor.write(write, i)) for i in range(5)]
+            await asyncio.sleep(0.05)
+            # nur zwei Aufrufe dürfen an den Schreib-Thread übergeben sein, einer davon läuft
+            pending = executor._write_executor._work_queue.qsize()
+            release.set()
+            return pending, await asyncio.gather(*tasks)
+
+        pending, results = asyncio.run(main())
+        assert pending == 1
+        assert results == list(range(5))
+        executor.shutdown()
+
+    def test_run_returns_result_of_blocking_call(self):
+        executor = StorageExecutor()
+
+        async def main():
+            return await executor.run(sum, [1, 2, 3])
+
+        assert asyncio.run(main()) == 6
+        executor.shutdown()
@@ -0,0 +1,93 @@
+import random
+import unittest
+
+from backend.app.model.final_exam_result_input import AP2, AP2Part, FinalExamResultInput, PW
+from backend.app.model.final_exam_result_output import FinalExamResultOutput
+from backend.app.service.exam_calculation_service import ExamCalculationService, scores_from_input
+from backend.app.service.vectorized_calculation_service import (
+    VectorizedExamCalculationService,
+    row_from_input,
+    score_matrix,
+)
+
+
+def random_input(rng: random.Random) -> FinalExamResultInput:
+    def score():
+        return rng.choice([None, rng.randint(0, 100), rng.randint(0, 100), rng.randint(0, 100)])
+
+    def part():
+        return None if rng.random() < 0.1 else AP2Part(main=score(), extra=score())
+
+    ap2 = None if rng.random() < 0.1 else AP2(
+        planning=part(),
+        development=part(),
+        economy=part(),
+        pw=None if rng.random() < 0.1 else PW(project=score(), presentation=score()),
+    )
+    return FinalExamResultInput(AP1=score(), AP2=ap2)
+
+
+class TestVectorizedExamCalculationService(unittest.TestCase):
+
+    def setUp(self):
+        self.scalar = ExamCalculationService()
+        self.service = VectorizedExamCalculationService()
+
+    def test_matches_scalar_implementation(self):
+        rng = random.Random(42)
+        inputs = [random_input(rng) for _ in range(3000)]
+
+        results = self.service.calculateBatchResults(inputs)
+
+        for finalExamResult, result in zip(inputs, results):
+            self.assertEqual(result, self.scalar.calculateExamResults(finalExamResult))
+
+    def test_rounding_of_half_values_matches_scalar(self):
+        # x.5 Werte entstehen bei PW (ungerade Summe) und bei der Ergänzungsprüfung
+        inputs = [
+            FinalExamResultInput(AP2=AP2(
+                planning=AP2Part(main=main, extra=extra),
+                pw=PW(project=main, presentation=extra),
+            ))
+            for main in range(0, 101, 3) for extra in range(0, 101, 7)
+        ]
+
+        results = self.service.calculateBatchResults(inputs)
+
+        for finalExamResult, result in zip(inputs, results):
+            self.assertEqual(result, self.scalar.calculateExamResults(finalExamResult))
+
+    def test_score_columns(self):
+        inputs = [
+            FinalExamResultInput(AP1=90, AP2=AP2(
+                planning=AP2Part(main=80, extra=70),
+                development=AP2Part(main=85),
+                economy=AP2Part(main=95, extra=95),
+                pw=PW(project=88, presentation=92),
+            )),
+            FinalExamResultInput(AP1=20, AP2=AP2(planning=AP2Part(main=10))),
+            FinalExamResultInput(),
+        ]
+
+        result = self.service.calculateScoreColumns(score_matrix([row_from_input(i) for i in inputs]))
+
+        self.assertEqual(result["ap2_planning_points"].tolist(), [77, 10, -1])
+        self.assertEqual(result["Overall_points"].tolist(), [89, 17, -1])
+        self.assertEqual(result["Overall_grade"].tolist(), [2, 6, 0])
+        self.assertEqual(result["Passed"].tolist(), [True, False, True])
+        self.assertEqual(result["COMPONENT_BELOW_30_POINTS"].tolist(), [False, True, False])
+        self.assertEqual(result["TOO_MANY_COMPONENTS_BELOW_50_POINTS"].tolist(), [False, False, False])
+
+    def test_output_dicts_match_output_models(self):
+        rng = random.Random(7)
+        inputs = [random_input(rng) for _ in range(1000)]
+
+        outputs = self.service.calculateOutputDicts(inputs)
+
+        self.assertEqual(outputs, [result.model_dump() for result in self.service.calculateBatchResults(inputs)])
+        self.assertEqual(outputs, [FinalExamResultOutput.dump_result_dict(self.scalar.calculateResultDict(
+            scores_from_input(i))) for i in inputs])
+
+    def test_empty_batch(self):
+        self.assertEqual(self.service.calculateBatchResults([]), [])
+        self.assertEqual(self.service.calculateOutputDicts([]), [])
@@ -1,38 +1,75 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
+# BACKEND_ONEDIR=1 baut ein Verzeichnis (main/main.exe + _internal) statt einer
+# einzelnen Datei. Die One-File-Variante entpackt bei jedem Start das komplette
+# Archiv in ein temporäres Verzeichnis, die One-Dir-Variante startet direkt.
+onedir = os.environ.get("BACKEND_ONEDIR") == "1"
 
 a = Analysis(
     ['backend\\main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
-    hiddenimports=[],
+    # Regelwerke der Notenberechnung (backend/app/rulesets)
+    datas=[('backend\\app\\rulesets\\*.json', 'backend\\app\\rulesets')],
+    # mit BACKEND_WORKERS > 1 importieren die Worker-Prozesse die App als backend.main:app
+    hiddenimports=['backend.main'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
     excludes=[],
     noarchive=False,
-    optimize=0,
+    # 1 entfernt nur asserts; 2 würde auch Docstrings entfernen, die FastAPI für die OpenAPI-Doku liest
+    optimize=1,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='main',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
+# UPX-komprimierte Bibliotheken müssten bei jedem Start wieder entpackt werden
+if onedir:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='main',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )